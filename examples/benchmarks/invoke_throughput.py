@@ -0,0 +1,102 @@
+"""
+Invocation throughput benchmark of the thread-based and the asyncio
+FaaS invokers.
+
+It starts a local HTTP server that mimics the OpenWhisk invoke API
+(it answers every POST with a 202 and an activation ID after a fixed
+latency), and then it performs the same number of invocations with:
+  - a ThreadPoolExecutor doing one blocking HTTP request per invocation,
+    as the thread-based invoker does
+  - the AsyncInvokeLoop of the asyncio invoker, sharing a pool of
+    keep-alive connections
+
+Usage: python invoke_throughput.py [--invocations N] [--concurrency C] [--latency S]
+"""
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import threading
+import http.client
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from lithops.invokers import AsyncInvokeLoop
+
+LATENCY = 0.05
+
+
+class InvokeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        time.sleep(LATENCY)
+        body = json.dumps({'activationId': uuid.uuid4().hex}).encode()
+        self.send_response(202)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def invoke_sync(host, port, payload):
+    conn = http.client.HTTPConnection(host, port)
+    conn.request('POST', '/invoke', body=json.dumps(payload), headers={'Content-Type': 'application/json'})
+    resp = conn.getresponse()
+    data = json.loads(resp.read())
+    conn.close()
+    return data['activationId']
+
+
+async def invoke_async(url, payload, session):
+    async with session.post(url, data=json.dumps(payload),
+                            headers={'Content-Type': 'application/json'}) as resp:
+        data = await resp.json()
+    return data['activationId']
+
+
+def run_threads(host, port, invocations, concurrency, payload):
+    start = time.time()
+    with ThreadPoolExecutor(concurrency) as executor:
+        futures = [executor.submit(invoke_sync, host, port, payload) for _ in range(invocations)]
+        wait(futures)
+    return time.time() - start
+
+
+def run_async(host, port, invocations, concurrency, payload):
+    url = f'http://{host}:{port}/invoke'
+    async_loop = AsyncInvokeLoop(concurrency)
+    start = time.time()
+    futures = [async_loop.submit(invoke_async, url, payload) for _ in range(invocations)]
+    wait(futures)
+    elapsed = time.time() - start
+    async_loop.stop()
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--invocations', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=LATENCY)
+    args = parser.parse_args()
+    LATENCY = args.latency
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), InvokeHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+
+    payload = {'executor_id': 'bench', 'job_id': 'M000', 'call_ids': ['00000'], 'data': 'x' * 1024}
+
+    for name, runner in [('threads', run_threads), ('asyncio', run_async)]:
+        elapsed = runner(host, port, args.invocations, args.concurrency, payload)
+        print(f'{name:>8}: {args.invocations} invocations in {elapsed:.2f}s '
+              f'- {args.invocations / elapsed:.0f} invokes/s')
+
+    server.shutdown()
@@ -42,8 +42,14 @@ JOBS_PREFIX = "lithops.jobs"
 TEMP_PREFIX = "lithops.jobs/tmp"
 LOGS_PREFIX = "lithops.logs"
 RUNTIMES_PREFIX = "lithops.runtimes"
+FUNCTIONS_PREFIX = "lithops.functions"
+RESULTS_PREFIX = "lithops.results"
 
 MAX_AGG_DATA_SIZE = 4  # 4MiB
+DATA_SPOOL_SIZE = 64  # 64MiB
+MODULE_DATA_CACHE_SIZE = 64  # 64MiB
+ITERDATA_WINDOW_SIZE = 1000
+SHARED_ARG_MIN_SIZE = 1  # 1MiB
 
 WORKER_PROCESSES_DEFAULT = 1
 
@@ -53,6 +59,8 @@ LITHOPS_TEMP_DIR = os.path.join(TEMP_DIR, USER_TEMP_DIR)
 JOBS_DIR = os.path.join(LITHOPS_TEMP_DIR, 'jobs')
 LOGS_DIR = os.path.join(LITHOPS_TEMP_DIR, 'logs')
 MODULES_DIR = os.path.join(LITHOPS_TEMP_DIR, 'modules')
+SHARED_ARGS_DIR = os.path.join(LITHOPS_TEMP_DIR, 'shared-args')
+PREFETCH_DIR = os.path.join(LITHOPS_TEMP_DIR, 'prefetch')
 CUSTOM_RUNTIME_DIR = os.path.join(LITHOPS_TEMP_DIR, 'custom-runtime')
 
 RN_LOG_FILE = os.path.join(LITHOPS_TEMP_DIR, 'localhost-runner.log')
@@ -67,6 +75,18 @@ HOME_DIR = os.path.expanduser('~')
 CONFIG_DIR = os.path.join(HOME_DIR, '.lithops')
 CACHE_DIR = os.path.join(CONFIG_DIR, 'cache')
 CONFIG_FILE = os.path.join(CONFIG_DIR, 'config')
+FUNCTION_CACHE_DIR = os.path.join(CACHE_DIR, FUNCTIONS_PREFIX)
+FUNCTION_CACHE_TTL = 86400  # 1 day
+RESULT_CACHE_TTL = 604800  # 7 days
+RESULT_CACHE_MAX_SIZE = 1024  # 1GiB
+WORKER_FUNCTION_CACHE_SIZE = 256  # 256MiB
+JOBRUNNER_MAX_TASKS = 100
+PREFETCH_MAX_SIZE = 256  # 256MiB
+LOG_HEAD_SIZE = 64  # 64KiB
+LOG_TAIL_SIZE = 64  # 64KiB
+SAMPLING_INTERVAL = 0.5  # seconds
+SAMPLING_BUFFER_SIZE = 1200
+DEPENDENCY_CACHE_DIR = os.path.join(CACHE_DIR, 'dependencies')
 CONFIG_FILE_GLOBAL = os.path.join("/etc", "lithops", "config")
 
 LITHOPS_DEFAULT_CONFIG_KEYS = {
@@ -22,22 +22,22 @@ import atexit
 import pickle
 import tempfile
 import subprocess as sp
-from typing import Optional, List, Union, Tuple, Dict, Any
-from collections.abc import Callable
+from typing import Optional, List, Union, Tuple, Dict, Any, Generator
+from collections.abc import Callable, Iterator
 from datetime import datetime
 
 from lithops import constants
 from lithops.future import ResponseFuture
 from lithops.invokers import create_invoker
 from lithops.storage import InternalStorage
-from lithops.wait import wait, ALL_COMPLETED, THREADPOOL_SIZE, ALWAYS
+from lithops.wait import wait, as_completed, ALL_COMPLETED, THREADPOOL_SIZE, ALWAYS
 from lithops.job import create_map_job, create_reduce_job
 from lithops.config import default_config, \
     extract_localhost_config, extract_standalone_config, \
     extract_serverless_config, get_log_info, extract_storage_config
 from lithops.constants import LOCALHOST, CLEANER_DIR, \
-    SERVERLESS, STANDALONE
-from lithops.utils import setup_lithops_logger, \
+    SERVERLESS, STANDALONE, ITERDATA_WINDOW_SIZE
+from lithops.utils import setup_lithops_logger, iter_windows, \
     is_lithops_worker, create_executor_id, create_futures_list
 from lithops.localhost import LocalhostHandlerV1, LocalhostHandlerV2
 from lithops.standalone import StandaloneHandler
@@ -60,7 +60,7 @@ class FunctionExecutor:
     :param config_file: Path to the lithops config file
     :param backend: Compute backend to run the functions
     :param storage: Storage backend to store Lithops data
-    :param monitoring: Monitoring system implementation. One of: storage, rabbitmq
+    :param monitoring: Monitoring system implementation. One of: storage, rabbitmq, redis
     :param log_level: Log level printing (INFO, DEBUG, ...). Set it to None to hide all logs.
         If this is param is set, all logging params in config are disabled
     :param kwargs: Any parameter that can be set in the compute backend section of the config file, can be set here
@@ -175,7 +175,9 @@ class FunctionExecutor:
         runtime_memory: Optional[int] = None,
         timeout: Optional[int] = None,
         include_modules: Optional[List] = [],
-        exclude_modules: Optional[List] = []
+        exclude_modules: Optional[List] = [],
+        priority: Optional[int] = 0,
+        deadline: Optional[float] = None
     ) -> ResponseFuture:
         """
         For running one function execution asynchronously.
@@ -187,6 +189,10 @@ class FunctionExecutor:
         :param timeout: Time that the function has to complete its execution before raising a timeout.
         :param include_modules: Explicitly pickle these dependencies.
         :param exclude_modules: Explicitly keep these modules from pickled dependencies.
+        :param priority: Priority of the job in the invoker scheduler. A job gets 2 ** priority times the share of
+                invocations of a job with priority 0 while both have calls pending to invoke
+        :param deadline: Hint of the time (in seconds from now) by which the function should be invoked.
+                Jobs with a deadline are invoked before the rest, earliest deadline first
 
         :return: Response future.
         """
@@ -206,7 +212,9 @@ class FunctionExecutor:
                              extra_env=extra_env,
                              include_modules=include_modules,
                              exclude_modules=exclude_modules,
-                             execution_timeout=timeout)
+                             execution_timeout=timeout,
+                             priority=priority,
+                             deadline=deadline)
 
         futures = self.invoker.run_job(job)
         self.futures.extend(futures)
@@ -226,13 +234,20 @@ class FunctionExecutor:
         obj_newline: Optional[str] = '\n',
         timeout: Optional[int] = None,
         include_modules: Optional[List[str]] = [],
-        exclude_modules: Optional[List[str]] = []
+        exclude_modules: Optional[List[str]] = [],
+        priority: Optional[int] = 0,
+        deadline: Optional[float] = None,
+        result_cache: Optional[bool] = None
     ) -> FuturesList:
         """
         Spawn multiple function activations based on the items of an input list.
 
         :param map_function: The function to map over the data
-        :param map_iterdata: An iterable of input data (e.g python list).
+        :param map_iterdata: An iterable of input data (e.g python list). Iterators and generators are
+                consumed lazily, and each window of 'iterdata_window_size' elements is submitted as a separate job.
+                The functions of a window are invoked while the next windows are produced, but map() blocks
+                until the iterator is exhausted and returns the futures of all the windows, so the iterator
+                must be finite
         :param chunksize: Split map_iteradata in chunks of this size. Lithops spawns 1 worker per resulting chunk
         :param extra_args: Additional arguments to pass to each map_function activation
         :param extra_env: Additional environment variables for function environment
@@ -247,6 +262,12 @@ class FunctionExecutor:
         :param include_modules: Explicitly pickle these dependencies. All required dependencies are pickled if default empty list.
                 No one dependency is pickled if it is explicitly set to None
         :param exclude_modules: Explicitly keep these modules from pickled dependencies. It is not taken into account if you set include_modules.
+        :param priority: Priority of the job in the invoker scheduler. A job gets 2 ** priority times the share of
+                invocations of a job with priority 0 while both have calls pending to invoke
+        :param deadline: Hint of the time (in seconds from now) by which the functions should be invoked.
+                Jobs with a deadline are invoked before the rest, earliest deadline first
+        :param result_cache: Reuse the outputs of previous calls with the same function and arguments, and
+                store the outputs of the new calls in the result cache. Defaults to the 'result_cache' config key
 
         :return: A list with size `len(map_iterdata)` of futures for each job (Futures are also internally stored by Lithops).
         """
@@ -256,28 +277,49 @@ class FunctionExecutor:
 
         runtime_meta = self.invoker.select_runtime(job_id, runtime_memory)
 
-        job = create_map_job(
-            config=self.config,
-            internal_storage=self.internal_storage,
-            executor_id=self.executor_id,
-            job_id=job_id,
-            map_function=map_function,
-            iterdata=map_iterdata,
-            chunksize=chunksize,
-            runtime_meta=runtime_meta,
-            runtime_memory=runtime_memory,
-            extra_env=extra_env,
-            include_modules=include_modules,
-            exclude_modules=exclude_modules,
-            execution_timeout=timeout,
-            extra_args=extra_args,
-            obj_chunk_size=obj_chunk_size,
-            obj_chunk_number=obj_chunk_number,
-            obj_newline=obj_newline
-        )
-
-        futures = self.invoker.run_job(job)
-        self.futures.extend(futures)
+        def submit_job(job_id, iterdata):
+            job = create_map_job(
+                config=self.config,
+                internal_storage=self.internal_storage,
+                executor_id=self.executor_id,
+                job_id=job_id,
+                map_function=map_function,
+                iterdata=iterdata,
+                chunksize=chunksize,
+                runtime_meta=runtime_meta,
+                runtime_memory=runtime_memory,
+                extra_env=extra_env,
+                include_modules=include_modules,
+                exclude_modules=exclude_modules,
+                execution_timeout=timeout,
+                extra_args=extra_args,
+                obj_chunk_size=obj_chunk_size,
+                obj_chunk_number=obj_chunk_number,
+                obj_newline=obj_newline,
+                priority=priority,
+                deadline=deadline,
+                result_cache=result_cache
+            )
+
+            futures = self.invoker.run_job(job)
+            self.futures.extend(futures)
+
+            return futures
+
+        if isinstance(map_iterdata, Iterator):
+            # Consume the iterator in windows, so that the functions of the
+            # first windows are invoked while the rest of the data is produced
+            window_size = self.config['lithops'].get('iterdata_window_size', ITERDATA_WINDOW_SIZE)
+            if chunksize:
+                window_size = -(-window_size // chunksize) * chunksize
+            futures = []
+            for window in iter_windows(map_iterdata, window_size):
+                if futures:
+                    job_id = self._create_job_id('M')
+                futures.extend(submit_job(job_id, window))
+            return create_futures_list(futures, self)
+
+        futures = submit_job(job_id, map_iterdata)
 
         if isinstance(map_iterdata, FuturesList):
             for fut in map_iterdata:
@@ -303,13 +345,16 @@ class FunctionExecutor:
         obj_reduce_by_key: Optional[bool] = False,
         spawn_reducer: Optional[int] = 20,
         include_modules: Optional[List[str]] = [],
-        exclude_modules: Optional[List[str]] = []
+        exclude_modules: Optional[List[str]] = [],
+        priority: Optional[int] = 0,
+        deadline: Optional[float] = None
     ) -> FuturesList:
         """
         Map the map_function over the data and apply the reduce_function across all futures.
 
         :param map_function: The function to map over the data
-        :param map_iterdata: An iterable of input data
+        :param map_iterdata: An iterable of input data. Iterators and generators are not supported, since
+                the reduce function needs all the map futures
         :param reduce_function: The function to reduce over the futures
         :param chunksize: Split map_iteradata in chunks of this size. Lithops spawns 1 worker per resulting chunk. Default 1
         :param extra_args: Additional arguments to pass to function activation. Default None
@@ -326,9 +371,15 @@ class FunctionExecutor:
         :param spawn_reducer: Percentage of done map functions before spawning the reduce function
         :param include_modules: Explicitly pickle these dependencies.
         :param exclude_modules: Explicitly keep these modules from pickled dependencies.
+        :param priority: Priority of the map and reduce jobs in the invoker scheduler
+        :param deadline: Hint of the time (in seconds from now) by which the map functions should be invoked
 
         :return: A list with size `len(map_iterdata)` of futures.
         """
+        if isinstance(map_iterdata, Iterator):
+            raise ValueError('map_reduce() does not support iterators or generators as map_iterdata, '
+                             'use a list instead')
+
         self.last_call = 'map_reduce'
         map_job_id = self._create_job_id('M')
 
@@ -351,7 +402,9 @@ class FunctionExecutor:
             obj_newline=obj_newline,
             include_modules=include_modules,
             exclude_modules=exclude_modules,
-            execution_timeout=timeout
+            execution_timeout=timeout,
+            priority=priority,
+            deadline=deadline
         )
 
         map_futures = self.invoker.run_job(map_job)
@@ -384,7 +437,8 @@ class FunctionExecutor:
             obj_reduce_by_key=obj_reduce_by_key,
             extra_env=extra_env,
             include_modules=include_modules,
-            exclude_modules=exclude_modules
+            exclude_modules=exclude_modules,
+            priority=priority
         )
 
         reduce_futures = self.invoker.run_job(reduce_job)
@@ -523,6 +577,69 @@ class FunctionExecutor:
 
         return result
 
+    def as_completed(
+        self,
+        fs: Optional[Union[ResponseFuture, FuturesList, List[ResponseFuture]]] = None,
+        throw_except: Optional[bool] = True,
+        download_results: Optional[bool] = True,
+        max_in_flight: Optional[int] = THREADPOOL_SIZE,
+        max_in_flight_bytes: Optional[int] = None,
+        timeout: Optional[int] = None,
+        wait_dur_sec: Optional[int] = None
+    ) -> Generator[Tuple[ResponseFuture, Any], None, None]:
+        """
+        Generator that yields `(future, result)` tuples as the function activations
+        complete. The outputs are downloaded concurrently, up to `max_in_flight` outputs
+        and `max_in_flight_bytes` bytes, and released from their futures after they
+        are yielded, so the results of large jobs can be processed with bounded memory.
+
+        :param fs: Futures list. Default None
+        :param throw_except: Reraise exception if call raised. Default True.
+        :param download_results: Download results. Default True. If False, only the
+            statuses are downloaded, and None is yielded as the result
+        :param max_in_flight: Maximum number of outputs being downloaded. Default 64
+        :param max_in_flight_bytes: Maximum size of the outputs being downloaded. Default None
+        :param timeout: Timeout for waiting for results.
+        :param wait_dur_sec: Time interval between each check. Default 1 second
+
+        :return: `(future, result)` tuples
+        """
+        futures = fs or [f for f in self.futures if not f._read]
+
+        if type(futures) not in [list, FuturesList]:
+            futures = [futures]
+
+        try:
+            for f, result in as_completed(
+                fs=futures,
+                internal_storage=self.internal_storage,
+                job_monitor=self.job_monitor,
+                throw_except=throw_except,
+                download_results=download_results,
+                max_in_flight=max_in_flight,
+                max_in_flight_bytes=max_in_flight_bytes,
+                timeout=timeout,
+                wait_dur_sec=wait_dur_sec
+            ):
+                if not fs and download_results:
+                    f._read = True
+                yield f, result
+
+        except (KeyboardInterrupt, Exception) as e:
+            self.invoker.stop()
+            self.job_monitor.remove(futures)
+            [f._set_exception() for f in futures]
+            if self.data_cleaner:
+                present_jobs = {f.job_key for f in futures}
+                self.compute_handler.clear(present_jobs, exception=e)
+                self.clean(clean_cloudobjects=False, force=True)
+            raise e
+
+        if self.data_cleaner:
+            present_jobs = {f.job_key for f in futures}
+            self.compute_handler.clear(present_jobs)
+            self.clean(clean_cloudobjects=False)
+
     def plot(
         self,
         fs: Optional[Union[ResponseFuture, List[ResponseFuture], FuturesList]] = None,
@@ -540,7 +657,8 @@ class FunctionExecutor:
         if isinstance(ftrs, ResponseFuture):
             ftrs = [ftrs]
 
-        ftrs_to_plot = [f for f in ftrs if (f.success or f.done) and not f.error]
+        ftrs_to_plot = [f for f in ftrs if (f.success or f.done) and not f.error
+                        and not f.stats.get('host_result_cache_hit')]
 
         if not ftrs_to_plot:
             logger.debug(f'ExecutorID {self.executor_id} - No futures ready to plot')
@@ -605,6 +723,10 @@ class FunctionExecutor:
                 'fn_to_clean': self.executor_id,
                 'storage_config': self.internal_storage.get_storage_config()
             }
+            if self.config['lithops'].get('function_cache', False):
+                data['function_cache_ttl'] = self.config['lithops'].get(
+                    'function_cache_ttl', constants.FUNCTION_CACHE_TTL
+                )
             save_data_to_clean(data)
 
         futures = fs or self.futures
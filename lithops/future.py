@@ -18,24 +18,188 @@
 
 import os
 import sys
+import copy
 import time
 import zlib
 import base64
 import pickle
 import logging
 import traceback
+from array import array
+from collections.abc import MutableMapping
 from six import reraise
 
 from lithops.storage import InternalStorage
 from lithops.storage.utils import (
     check_storage_path,
     get_storage_path,
-    create_job_key
+    create_job_key,
+    StorageNoSuchKeyError
 )
 from lithops.constants import FN_LOG_FILE, LOGS_DIR
+from lithops.utils import oob_loads, b64str_to_bytes
+from lithops.util.codecs import decompress
 
 logger = logging.getLogger(__name__)
 
+STATS_PREFIXES = ('func', 'host', 'worker')
+
+# Typecodes of the stats columns, by the type of their values
+STATS_TYPECODES = {bool: 'b', int: 'q', float: 'd'}
+
+# Marks a stat deleted from a single future, or a compacted call status
+_DELETED = object()
+_COMPACTED = object()
+
+
+class StatsColumns:
+    """
+    Columnar storage of the stats of all the futures of a job. The numeric
+    stats are stored in typed arrays, one per stat, indexed by the position
+    of the future in the job. The stats of the job metadata, which are equal
+    for all the calls, are stored once.
+    """
+    __slots__ = ('job_stats', 'columns', 'objects', 'status_keys')
+
+    def __init__(self, job_stats):
+        self.job_stats = job_stats
+        self.columns = {}
+        self.objects = {}
+        self.status_keys = set()
+
+    def get(self, key, index, default=None):
+        if key in self.columns:
+            vtype, values, present = self.columns[key]
+            if index < len(present) and present[index]:
+                return vtype(values[index])
+        if key in self.objects:
+            value = self.objects[key].get(index, default)
+            return default if value is _DELETED else value
+        return self.job_stats.get(key, default)
+
+    def set(self, key, index, value):
+        vtype = type(value)
+        if key in self.columns:
+            col_type, values, present = self.columns[key]
+            if vtype is int and col_type is float:
+                value, vtype = float(value), float
+            elif vtype is float and col_type is int:
+                # Promote the column to floats
+                self.columns[key] = (float, array('d', values), present)
+                col_type = float
+            if vtype is col_type:
+                self._set_column(key, index, value)
+                return
+            # A value of another type is stored apart from the column
+            if index < len(present):
+                present[index] = 0
+        elif vtype in STATS_TYPECODES and key not in self.objects:
+            self.columns[key] = (vtype, array(STATS_TYPECODES[vtype]), bytearray())
+            self._set_column(key, index, value)
+            return
+        self.objects.setdefault(key, {})[index] = value
+
+    def _set_column(self, key, index, value):
+        col_type, values, present = self.columns[key]
+        if index >= len(present):
+            missing = index + 1 - len(present)
+            values.extend(array(values.typecode, bytes(values.itemsize * missing)))
+            present.extend(bytes(missing))
+        try:
+            values[index] = value
+        except OverflowError:
+            self.objects.setdefault(key, {})[index] = value
+            return
+        present[index] = 1
+        if key in self.objects:
+            self.objects[key].pop(index, None)
+
+    def delete(self, key, index):
+        if key in self.columns:
+            present = self.columns[key][2]
+            if index < len(present):
+                present[index] = 0
+        self.objects.setdefault(key, {})[index] = _DELETED
+
+    def keys(self, index):
+        keys = dict.fromkeys(self.job_stats)
+        for key, (_, _, present) in self.columns.items():
+            if index < len(present) and present[index]:
+                keys[key] = None
+        for key, values in self.objects.items():
+            if index in values:
+                if values[index] is _DELETED:
+                    keys.pop(key, None)
+                else:
+                    keys[key] = None
+        return list(keys)
+
+
+class FutureStats(MutableMapping):
+    """
+    Dict-like view of the stats of a single future, stored in the
+    columns of its job
+    """
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key):
+        value = self._columns.get(key, self._index, _DELETED)
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._columns.set(key, self._index, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._columns.delete(key, self._index)
+
+    def __iter__(self):
+        return iter(self._columns.keys(self._index))
+
+    def __len__(self):
+        return len(self._columns.keys(self._index))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class JobInfo:
+    """
+    Attributes of a job shared by all its futures, so that they are
+    stored once per job instead of once per call
+    """
+    __slots__ = ('job_id', 'job_key', 'executor_id', 'function_name', 'execution_timeout',
+                 'runtime_name', 'runtime_memory', 'storage_config', 'storage_path',
+                 'status_manifest', 'stats', 'total_futures')
+
+    def __init__(self, job, job_metadata, storage_config):
+        self.job_id = job.job_id
+        self.job_key = job.job_key
+        self.executor_id = job.executor_id
+        self.function_name = job.function_name
+        self.execution_timeout = job.execution_timeout
+        self.runtime_name = job.runtime_name
+        self.runtime_memory = job.runtime_memory
+        self.storage_config = storage_config
+        self.storage_path = get_storage_path(storage_config)
+        self.status_manifest = getattr(job, 'status_manifest', False)
+        job_stats = {key: value for key, value in job_metadata.items() if key.startswith(STATS_PREFIXES)}
+        self.stats = StatsColumns(job_stats)
+        self.total_futures = 0
+
+    def add_future(self):
+        """ Returns the position of a new future in the job"""
+        index = self.total_futures
+        self.total_futures += 1
+        return index
+
 
 class ResponseFuture:
     """
@@ -52,38 +216,129 @@ class ResponseFuture:
         Done = "Done"
         Unknown = "Unknown"
 
-    def __init__(self, call_id, job, job_metadata, storage_config):
+    __slots__ = ('call_id', 'activation_id', 'logs', '_job_info', '_index', '_produce_output',
+                 '_read', '_state', '_exception', '_handler_exception', '_new_futures',
+                 '_status', '_call_output', '_output_key', '_host_status_done_tstamp',
+                 '_status_query_count', '_output_query_count')
+
+    def __init__(self, call_id, job, job_metadata=None, storage_config=None):
+        """
+        :param call_id: call ID
+        :param job: JobInfo shared by the futures of the job, or a job
+        :param job_metadata: metadata of the job, in case of a job
+        :param storage_config: storage config, in case of a job
+        """
+        if not isinstance(job, JobInfo):
+            job = JobInfo(job, job_metadata, storage_config)
+
         self.call_id = call_id
-        self.job_id = job.job_id
-        self.job_key = job.job_key
-        self.executor_id = job.executor_id
-        self.function_name = job.function_name
-        self.execution_timeout = job.execution_timeout
-        self.runtime_name = job.runtime_name
-        self.runtime_memory = job.runtime_memory
         self.activation_id = None
-        self.stats = {}
         self.logs = None
 
-        self._storage_config = storage_config
+        self._job_info = job
+        self._index = job.add_future()
         self._produce_output = True
         self._read = False
         self._state = ResponseFuture.State.New
-        self._exception = Exception()
+        self._exception = None
         self._handler_exception = False
         self._new_futures = None
-        self._traceback = None
-        self._call_status = None
+        self._status = None
         self._call_output = None
+        self._output_key = None
         self._host_status_done_tstamp = None
         self._status_query_count = 0
         self._output_query_count = 0
 
-        for key in job_metadata:
-            if any(key.startswith(ss) for ss in ['func', 'host', 'worker']):
-                self.stats[key] = job_metadata[key]
+    @property
+    def job_id(self):
+        return self._job_info.job_id
 
-        self._storage_path = get_storage_path(self._storage_config)
+    @property
+    def job_key(self):
+        return self._job_info.job_key
+
+    @property
+    def executor_id(self):
+        return self._job_info.executor_id
+
+    @property
+    def function_name(self):
+        return self._job_info.function_name
+
+    @property
+    def execution_timeout(self):
+        return self._job_info.execution_timeout
+
+    @property
+    def status_manifest(self):
+        return self._job_info.status_manifest
+
+    @property
+    def runtime_name(self):
+        return self._job_info.runtime_name
+
+    @property
+    def runtime_memory(self):
+        return self._job_info.runtime_memory
+
+    @property
+    def _storage_config(self):
+        return self._job_info.storage_config
+
+    @property
+    def _storage_path(self):
+        return self._job_info.storage_path
+
+    @property
+    def stats(self):
+        return FutureStats(self._job_info.stats, self._index)
+
+    @property
+    def _call_status(self):
+        if self._status is not _COMPACTED:
+            return self._status
+        # Rebuild the status of a successful call from its stats
+        call_status = {'type': '__end__',
+                       'exception': False,
+                       'executor_id': self.executor_id,
+                       'job_id': self.job_id,
+                       'call_id': self.call_id,
+                       'activation_id': self.activation_id}
+        columns = self._job_info.stats
+        for key in columns.status_keys:
+            value = columns.get(key, self._index, _DELETED)
+            if value is not _DELETED:
+                call_status[key] = value
+        return call_status
+
+    @_call_status.setter
+    def _call_status(self, call_status):
+        self._status = call_status
+
+    def _compact_call_status(self):
+        """
+        Drops the status of a successful call, whose stats are already
+        stored in the columns of the job
+        """
+        call_status = self._status
+        if call_status['exception'] or 'new_futures' in call_status or 'logs' in call_status:
+            return
+        self._job_info.stats.status_keys.update(key for key in call_status if key.startswith(STATS_PREFIXES))
+        self._status = _COMPACTED
+
+    def __getstate__(self):
+        # A pickled future carries its own stats instead of the ones of its job
+        job_info = copy.copy(self._job_info)
+        job_info.stats = StatsColumns(dict(self.stats))
+        job_info.total_futures = 1
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state.update({'_job_info': job_info, '_index': 0, '_status': self._call_status})
+        return state
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
 
     def _set_state(self, new_state):
         self._state = new_state
@@ -159,6 +414,35 @@ class ResponseFuture:
         self.status(throw_except=False)
         self._state = ResponseFuture.State.Ready
 
+    def _set_cached(self, output_key, output_size):
+        """ Set the future as success with an output of the result cache"""
+        self._call_status = {'type': '__end__',
+                             'exception': False,
+                             'executor_id': self.executor_id,
+                             'job_id': self.job_id,
+                             'call_id': self.call_id,
+                             'activation_id': None,
+                             'func_result_size': output_size}
+        self._output_key = output_key
+        self._host_status_done_tstamp = time.time()
+        self.stats['host_result_cache_hit'] = True
+        self.stats['worker_exec_time'] = 0
+        if output_size == 0:
+            # The function returned None
+            self._produce_output = False
+            self._state = ResponseFuture.State.Done
+        else:
+            self._state = ResponseFuture.State.Success
+
+    def _get_call_output(self, internal_storage):
+        """ Downloads the output of the call"""
+        if self._output_key is None:
+            return internal_storage.get_call_output(self.executor_id, self.job_id, self.call_id)
+        try:
+            return internal_storage.get_data(self._output_key)
+        except StorageNoSuchKeyError:
+            return None
+
     def _set_mapreduce(self):
         """ Set the future as mapreduce map"""
         self._read = True
@@ -191,7 +475,8 @@ class ResponseFuture:
             if internal_storage is None:
                 internal_storage = InternalStorage(self._storage_config)
             check_storage_path(internal_storage.get_storage_config(), self._storage_path)
-            self._call_status = internal_storage.get_call_status(self.executor_id, self.job_id, self.call_id)
+            self._call_status = internal_storage.get_call_status(self.executor_id, self.job_id, self.call_id,
+                                                                 self.status_manifest)
             self._status_query_count += 1
 
             if check_only:
@@ -199,7 +484,8 @@ class ResponseFuture:
 
             while self._call_status is None:
                 time.sleep(wait_dur_sec)
-                self._call_status = internal_storage.get_call_status(self.executor_id, self.job_id, self.call_id)
+                self._call_status = internal_storage.get_call_status(self.executor_id, self.job_id, self.call_id,
+                                                                     self.status_manifest)
                 self._status_query_count += 1
             self._host_status_done_tstamp = time.time()
 
@@ -208,7 +494,7 @@ class ResponseFuture:
         self.activation_id = self._call_status['activation_id']
 
         if 'logs' in self._call_status:
-            self.logs = zlib.decompress(base64.b64decode(self._call_status['logs'].encode())).decode()
+            self.logs = zlib.decompress(base64.b64decode(self._call_status['logs'].encode())).decode(errors='replace')
             job_key = create_job_key(self.executor_id, self.job_id)
             log_file = os.path.join(LOGS_DIR, job_key + '.log')
             header = "Activation: '{}' ({})\n[\n".format(self.runtime_name, self.activation_id)
@@ -219,12 +505,13 @@ class ResponseFuture:
             with open(FN_LOG_FILE, 'a') as lf:
                 lf.write(header + '    ' + output + tail)
 
+        stats = self.stats
         for key in self._call_status:
-            if any(key.startswith(ss) for ss in ['func', 'host', 'worker']):
-                self.stats[key] = self._call_status[key]
+            if key.startswith(STATS_PREFIXES):
+                stats[key] = self._call_status[key]
 
-        self.stats['worker_exec_time'] = round(self.stats['worker_end_tstamp'] - self.stats['worker_start_tstamp'], 8)
-        total_time = format(round(self.stats['worker_exec_time'], 2), '.2f')
+        stats['worker_exec_time'] = round(stats['worker_end_tstamp'] - stats['worker_start_tstamp'], 8)
+        total_time = format(round(stats['worker_exec_time'], 2), '.2f')
 
         logger.debug(
             f'ExecutorID {self.executor_id} | JobID {self.job_id} - Got status from call {self.call_id} '
@@ -233,7 +520,7 @@ class ResponseFuture:
 
         if self._call_status['exception']:
             self._set_state(ResponseFuture.State.Error)
-            self._exception = pickle.loads(eval(self._call_status['exc_info']))
+            self._exception = pickle.loads(b64str_to_bytes(self._call_status['exc_info']))
 
             if not self._call_status.get('exc_pickle_fail', False):
                 fn_exctype = self._exception[0]
@@ -273,14 +560,14 @@ class ResponseFuture:
                 return None
 
         if 'new_futures' in self._call_status and not self._new_futures:
-            new_futures = pickle.loads(eval(self._call_status['new_futures']))
+            new_futures = pickle.loads(b64str_to_bytes(self._call_status['new_futures']))
             self._new_futures = [new_futures] if type(new_futures) is ResponseFuture else new_futures
 
         elif self._call_status['func_result_size'] == 0:
             self._produce_output = False
 
         if 'result' in self._call_status:
-            self._call_output = pickle.loads(eval(self._call_status['result']))
+            self._call_output = oob_loads(decompress(b64str_to_bytes(self._call_status['result'])))
             self.stats['host_result_done_tstamp'] = time.time()
             self.stats['host_result_query_count'] = 0
             logger.debug(
@@ -293,7 +580,10 @@ class ResponseFuture:
         else:
             self._set_state(ResponseFuture.State.Success)
 
-        return self._call_status
+        call_status = self._call_status
+        self._compact_call_status()
+
+        return call_status
 
     def result(self, throw_except=True, internal_storage=None, retries=10, wait_dur_sec=1):
         """
@@ -326,12 +616,12 @@ class ResponseFuture:
             return self._call_output
 
         if self._call_output is None:
-            call_output = internal_storage.get_call_output(self.executor_id, self.job_id, self.call_id)
+            call_output = self._get_call_output(internal_storage)
             self._output_query_count += 1
 
             while call_output is None and self._output_query_count < retries:
                 time.sleep(wait_dur_sec)
-                call_output = internal_storage.get_call_output(self.executor_id, self.job_id, self.call_id)
+                call_output = self._get_call_output(internal_storage)
                 self._output_query_count += 1
 
             if call_output is None:
@@ -344,7 +634,7 @@ class ResponseFuture:
                     self._set_state(ResponseFuture.State.Error)
                     return None
 
-            self._call_output = pickle.loads(call_output)
+            self._call_output = oob_loads(decompress(call_output))
 
             self.stats['host_result_done_tstamp'] = time.time()
             self.stats['host_result_query_count'] = self._output_query_count
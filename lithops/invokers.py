@@ -16,15 +16,18 @@
 
 import os
 import sys
+import copy
 import time
 import random
-import queue
 import shutil
 import logging
+import asyncio
 import threading
+from functools import partial
 from concurrent.futures import ThreadPoolExecutor
 
-from lithops.future import ResponseFuture
+from lithops.future import ResponseFuture, JobInfo
+from lithops.scheduler import create_scheduler, set_queue_wait_time
 from lithops.config import extract_storage_config
 from lithops.version import __version__
 from lithops.utils import (
@@ -158,6 +161,7 @@ class Invoker:
             'total_calls': job.total_calls,
             'execution_timeout': job.execution_timeout,
             'data_byte_ranges': job.data_byte_ranges,
+            'payload_codec': job.payload_codec,
             'executor_id': job.executor_id,
             'job_id': job.job_id,
             'job_key': job.job_key,
@@ -170,6 +174,15 @@ class Invoker:
             'worker_processes': job.worker_processes
         }
 
+        if getattr(job, 'remote_invoker_tstamps', None):
+            payload['remote_invoker_tstamps'] = job.remote_invoker_tstamps
+
+        if getattr(job, 'parts_per_object', None):
+            payload['object_processing'] = True
+
+        if getattr(job, 'result_cache_func_hash', None):
+            payload['result_cache_func_hash'] = job.result_cache_func_hash
+
         return payload
 
     def _run_job(self, job):
@@ -214,32 +227,64 @@ class Invoker:
                 f'{job.worker_processes} - Chunksize: {job.chunksize}'
             )
 
-        try:
-            job.runtime_name = self.runtime_name
-            self._invoke_job(job)
-        except (KeyboardInterrupt, Exception) as e:
-            self.stop()
-            raise e
-
-        log_file = os.path.join(LOGS_DIR, job.job_key + '.log')
-        logger.info(
-            f'ExecutorID {job.executor_id} | JobID {job.job_id} - View execution logs at {log_file}'
-        )
+        job.runtime_name = self.runtime_name
 
-        # Create all futures
+        # Create all futures, sharing the attributes of the job
+        job_info = JobInfo(job, job.metadata, self.storage_config)
         futures = []
-        for i in range(job.total_calls):
+        for i in range(*get_call_ids_range(job)):
             call_id = "{:05d}".format(i)
-            fut = ResponseFuture(call_id, job,
-                                 job.metadata.copy(),
-                                 self.storage_config)
-            fut._set_state(ResponseFuture.State.Invoked)
+            fut = ResponseFuture(call_id, job_info)
             futures.append(fut)
 
         job.futures = futures
 
+        if job.total_calls > 0:
+            try:
+                self._invoke_job(job)
+            except (KeyboardInterrupt, Exception) as e:
+                self.stop()
+                raise e
+
+        for fut in futures:
+            fut._set_state(ResponseFuture.State.Invoked)
+
+        if getattr(job, 'cached_calls', None):
+            futures = self._add_cached_futures(job, job_info, futures)
+
+        log_file = os.path.join(LOGS_DIR, job.job_key + '.log')
+        logger.info(
+            f'ExecutorID {job.executor_id} | JobID {job.job_id} - View execution logs at {log_file}'
+        )
+
         return futures
 
+    def _add_cached_futures(self, job, job_info, futures):
+        """
+        Creates the futures of the calls found in the result cache, and
+        returns all the futures of the job in the order of the iterdata.
+        The cached calls take the call IDs that follow the invoked ones.
+        """
+        logger.info(
+            f'ExecutorID {job.executor_id} | JobID {job.job_id} - Got {len(job.cached_calls)} '
+            'activations from the result cache'
+        )
+        all_futures = []
+        invoked_futures = iter(futures)
+        cached_calls = {i: (output_key, output_size) for i, output_key, output_size in job.cached_calls}
+        next_call_id = job.total_calls
+
+        for i in range(job.total_calls + len(job.cached_calls)):
+            if i in cached_calls:
+                fut = ResponseFuture("{:05d}".format(next_call_id), job_info)
+                fut._set_cached(*cached_calls[i])
+                next_call_id += 1
+            else:
+                fut = next(invoked_futures)
+            all_futures.append(fut)
+
+        return all_futures
+
     def stop(self):
         """
         Stop invoker-related processes
@@ -262,6 +307,8 @@ class BatchInvoker(Invoker):
         """
         payload = self._create_payload(job)
         payload['call_ids'] = ["{:05d}".format(i) for i in range(job.total_calls)]
+        if 'result_cache_func_hash' in payload:
+            payload['result_cache_arg_hashes'] = dict(zip(payload['call_ids'], job.result_cache_arg_hashes))
 
         start = time.time()
         activation_id = self.compute_handler.invoke(payload)
@@ -283,26 +330,236 @@ class BatchInvoker(Invoker):
         return futures
 
 
+class AsyncInvokeLoop:
+    """
+    Event loop that runs in a background thread and performs the
+    invocations of the backends that implement invoke_async(). All the
+    invocations share a pool of keep-alive HTTP connections, and at most
+    max_concurrency invocations are in flight at the same time.
+    """
+
+    def __init__(self, max_concurrency):
+        import aiohttp
+        self.aiohttp = aiohttp
+        self.max_concurrency = max_concurrency
+        self.loop = asyncio.new_event_loop()
+        self.session = None
+        self.semaphore = None
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._create_session(), self.loop).result()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _create_session(self):
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = self.aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+        self.session = self.aiohttp.ClientSession(connector=connector)
+
+    async def _run_bounded(self, invoke_fn, args):
+        async with self.semaphore:
+            return await invoke_fn(*args, self.session)
+
+    def submit(self, invoke_fn, *args):
+        """
+        Schedules the coroutine function invoke_fn(*args, session) in the
+        event loop and returns a concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(self._run_bounded(invoke_fn, args), self.loop)
+
+    def stop(self):
+        """
+        Closes the HTTP connections and stops the event loop
+        """
+        if self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+
+class InvokeRateController:
+    """
+    Additive-increase/multiplicative-decrease (AIMD) controller of the
+    number of in-flight invocations. The concurrency limit grows by one
+    for every round of successful invocations, and it is multiplied by
+    'decrease' when the backend throttles an invocation or when the
+    invocation roundtrip exceeds 'latency' seconds. Throttled invocations
+    that keep being throttled after a decrease, with no successful
+    invocation in between, set an exponential backoff with jitter that
+    delays all the following invocations, instead of each invocation
+    sleeping on its own.
+    """
+    MIN_BACKOFF = 0.1
+
+    def __init__(self, max_concurrency, decrease=0.5, latency=None, max_backoff=5):
+        self.max_concurrency = max_concurrency
+        self.decrease = decrease
+        self.latency = latency
+        self.max_backoff = max_backoff
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.backoff = 0
+        self.throttles = 0
+        self._successes = 0
+        self._resume_time = 0
+        self._last_decrease = 0
+        self._cond = threading.Condition()
+        # (loop, future) of the coroutines waiting in acquire_async()
+        self._async_waiters = []
+
+    def _can_acquire(self):
+        return time.time() >= self._resume_time and self.in_flight < int(self.limit)
+
+    def _wait_timeout(self):
+        # Only the end of a backoff is not notified by release()
+        wait_time = self._resume_time - time.time()
+        return wait_time if wait_time > 0 else None
+
+    def try_acquire(self):
+        """
+        Takes an invocation slot if one is available, without waiting
+        """
+        with self._cond:
+            if self._can_acquire():
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self):
+        """
+        Waits until an invocation slot is available and takes it
+        """
+        with self._cond:
+            while not self._can_acquire():
+                self._cond.wait(self._wait_timeout())
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        """
+        Waits in the running event loop until an invocation slot is
+        available and takes it, without blocking the loop
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._can_acquire():
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+                timeout = self._wait_timeout()
+            try:
+                await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                with self._cond:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    @staticmethod
+    def _wake_up(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def release(self, roundtrip=None, throttled=False):
+        """
+        Releases an invocation slot and adapts the concurrency limit with
+        the result of the invocation. A release without roundtrip (failed
+        invocation) does not change the limit.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.time()
+
+            if throttled:
+                self.throttles += 1
+                if self._decrease_limit(now, roundtrip) and self._successes == 0:
+                    self.backoff = min(self.max_backoff, max(self.backoff * 2, self.MIN_BACKOFF))
+                    self._resume_time = now + self.backoff * random.uniform(0.5, 1)
+                self._successes = 0
+            elif roundtrip is not None:
+                if self.latency and roundtrip > self.latency:
+                    self._decrease_limit(now, roundtrip)
+                else:
+                    self.backoff = 0
+                    self._successes += 1
+                    self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+            self._cond.notify_all()
+            for loop, waiter in self._async_waiters:
+                loop.call_soon_threadsafe(self._wake_up, waiter)
+            self._async_waiters.clear()
+
+    def _decrease_limit(self, now, roundtrip):
+        # Decrease at most once per roundtrip, since all the invocations
+        # in flight see the same congestion
+        if now - self._last_decrease < (roundtrip or 0):
+            return False
+        self.limit = max(1, self.limit * self.decrease)
+        self._last_decrease = now
+        return True
+
+    def get_stats(self):
+        """
+        Returns the current state of the controller
+        """
+        return {
+            'host_invoke_concurrency': int(self.limit),
+            'host_invoke_backoff': round(self.backoff, 3),
+            'host_invoke_throttles': self.throttles
+        }
+
+
 class FaaSInvoker(Invoker):
     """
     Module responsible to perform the invocations against a FaaS backend
     """
     ASYNC_INVOKERS = 2
+    INVOKE_RETRIES = 3
 
     def __init__(self, config, executor_id, internal_storage, compute_handler, job_monitor):
         super().__init__(config, executor_id, internal_storage, compute_handler, job_monitor)
 
         remote_invoker = self.config[self.backend].get('remote_invoker', False)
         self.remote_invoker = remote_invoker if not is_lithops_worker() else False
+        self.remote_invoker_fanout = self.config[self.backend].get('remote_invoker_fanout', 1)
+        self.remote_invoker_leaf_size = self.config[self.backend].get('remote_invoker_leaf_size', 1000)
 
         self.invokers = []
         self.ongoing_activations = 0
-        self.pending_calls_q = queue.Queue()
+        self.pending_calls_q = create_scheduler(self.config['lithops'].get('invoker_scheduler', 'fair'))
         self.should_run = False
         self.sync = is_lithops_worker()
 
         self.invoke_pool_threads = self.config[self.backend]['invoke_pool_threads']
         self.executor = ThreadPoolExecutor(self.invoke_pool_threads)
+        self.async_invoke = False
+        self.async_loop = None
+        self.rate_controller = None
+        # Failed invocations of each range of pending calls
+        self.invoke_failures = {}
+
+        if self.config[self.backend].get('rate_control', True):
+            self.rate_controller = InvokeRateController(
+                max_concurrency=self.invoke_pool_threads,
+                latency=self.config[self.backend].get('rate_control_latency'),
+                max_backoff=self.config[self.backend].get('rate_control_max_backoff', 5)
+            )
+
+        if self.config['lithops'].get('async_invoke', False):
+            if not self.compute_handler.supports_async_invoke():
+                logger.debug(f'ExecutorID {self.executor_id} - The {self.backend} backend does not '
+                             'support async invocations, using the thread-based invoker')
+            else:
+                try:
+                    self.async_loop = AsyncInvokeLoop(self.invoke_pool_threads)
+                    self.async_invoke = True
+                    logger.debug(f'ExecutorID {self.executor_id} - Using the asyncio invoker')
+                except ModuleNotFoundError:
+                    logger.warning("The asyncio invoker requires the 'aiohttp' package, "
+                                   "using the thread-based invoker")
 
         logger.debug(f'ExecutorID {self.executor_id} - Serverless invoker created')
 
@@ -322,10 +579,13 @@ class FaaSInvoker(Invoker):
                         job, call_ids_range = self.pending_calls_q.get()
                     except KeyboardInterrupt:
                         break
-                    if self.should_run:
-                        executor.submit(self._invoke_task, job, call_ids_range)
-                    else:
+                    if not self.should_run:
                         break
+                    elif self.async_loop:
+                        future = self.async_loop.submit(self._invoke_task_async, job, call_ids_range)
+                    else:
+                        future = executor.submit(self._invoke_task, job, call_ids_range)
+                    future.add_done_callback(partial(self._check_pending_invocation, job, call_ids_range))
 
             logger.debug(f'ExecutorID {self.executor_id} - Async invoker {inv_id} finished')
 
@@ -336,6 +596,31 @@ class FaaSInvoker(Invoker):
             p.daemon = True
             p.start()
 
+    def _check_pending_invocation(self, job, call_ids_range, future):
+        """
+        Puts back in the queue the pending calls whose invocation failed,
+        up to INVOKE_RETRIES times
+        """
+        exception = future.exception()
+        range_key = (job.job_key, call_ids_range[0])
+        if exception is None:
+            self.invoke_failures.pop(range_key, None)
+            return
+
+        failures = self.invoke_failures.get(range_key, 0) + 1
+        call_ids = f'{call_ids_range[0]:05d}-{call_ids_range[-1]:05d}'
+        if failures > self.INVOKE_RETRIES or not self.should_run:
+            self.invoke_failures.pop(range_key, None)
+            logger.error(f'ExecutorID {job.executor_id} | JobID {job.job_id} - Invocation of '
+                         f'calls {call_ids} failed: {exception!r}')
+            return
+
+        logger.warning(f'ExecutorID {job.executor_id} | JobID {job.job_id} - Invocation of '
+                       f'calls {call_ids} failed: {exception!r}. Retrying')
+        self.invoke_failures[range_key] = failures
+        self.pending_calls_q.put((job, call_ids_range))
+        self.job_monitor.token_bucket_q.put('#')
+
     def stop(self):
         """
         Stop async invokers
@@ -356,11 +641,14 @@ class FaaSInvoker(Invoker):
 
             self.invokers = []
 
-    def _invoke_task(self, job, call_ids_range):
-        """Method used to perform the actual invocation against the
-        compute backend.
+        if self.async_loop:
+            self.async_loop.stop()
+            self.async_loop = None
+
+    def _create_task_payload(self, job, call_ids_range):
+        """
+        Creates the payload of the invocation of a range of calls
         """
-        # prepare payload
         payload = self._create_payload(job)
 
         call_ids = ["{:05d}".format(i) for i in call_ids_range]
@@ -373,48 +661,149 @@ class FaaSInvoker(Invoker):
             del payload['data_byte_ranges']
             payload['data_byte_strs'] = [job.data_byte_strs[int(call_id)] for call_id in call_ids]
 
+        if 'result_cache_func_hash' in payload:
+            payload['result_cache_arg_hashes'] = {call_id: job.result_cache_arg_hashes[int(call_id)] for call_id in call_ids}
+
+        return payload
+
+    def _invoke_task(self, job, call_ids_range):
+        """Method used to perform the actual invocation against the
+        compute backend.
+        """
+        payload = self._create_task_payload(job, call_ids_range)
+
+        if self.rate_controller:
+            self.rate_controller.acquire()
+
         # do the invocation
         start = time.time()
-        activation_id = self.compute_handler.invoke(payload)
+        try:
+            activation_id = self.compute_handler.invoke(payload)
+        except Exception:
+            if self.rate_controller:
+                self.rate_controller.release()
+            raise
         roundtrip = time.time() - start
-        resp_time = format(round(roundtrip, 3), '.3f')
+
+        if self.rate_controller:
+            self.rate_controller.release(roundtrip, throttled=not activation_id)
+        elif not activation_id:
+            time.sleep(random.randint(0, 5))
+
+        if not activation_id:
+            # reached quota limit
+            self.pending_calls_q.put((job, call_ids_range))
+            self.job_monitor.token_bucket_q.put('#')
+            return
+
+        self._log_invocation(job, payload['call_ids'], activation_id, roundtrip)
+
+    async def _invoke_task_async(self, job, call_ids_range, session):
+        """Same as _invoke_task(), but performs the invocation in the
+        event loop of the asyncio invoker.
+        """
+        payload = self._create_task_payload(job, call_ids_range)
+
+        if self.rate_controller:
+            await self.rate_controller.acquire_async()
+
+        # do the invocation
+        start = time.time()
+        try:
+            activation_id = await self.compute_handler.invoke_async(payload, session)
+        except Exception:
+            if self.rate_controller:
+                self.rate_controller.release()
+            raise
+        roundtrip = time.time() - start
+
+        if self.rate_controller:
+            self.rate_controller.release(roundtrip, throttled=not activation_id)
+        elif not activation_id:
+            await asyncio.sleep(random.randint(0, 5))
 
         if not activation_id:
             # reached quota limit
-            time.sleep(random.randint(0, 5))
             self.pending_calls_q.put((job, call_ids_range))
             self.job_monitor.token_bucket_q.put('#')
             return
 
+        self._log_invocation(job, payload['call_ids'], activation_id, roundtrip)
+
+    def _log_invocation(self, job, call_ids, activation_id, roundtrip):
+        resp_time = format(round(roundtrip, 3), '.3f')
         logger.debug(
             f'ExecutorID {job.executor_id} | JobID {job.job_id} - Calls {", ".join(call_ids)} '
             f'invoked ({resp_time}s) - Activation ID: {activation_id}'
         )
 
-    def _invoke_job_remote(self, job):
+        if self.rate_controller:
+            invoke_stats = self.rate_controller.get_stats()
+            first_call = get_call_ids_range(job)[0]
+            for call_id in call_ids:
+                job.futures[int(call_id) - first_call].stats.update(invoke_stats)
+
+    def _split_call_ids_range(self, job):
         """
-        Logic for invoking a job using a remote function
+        Splits the range of calls of a job into the ranges handled by the
+        remote invokers of the next level of the invocation tree. Ranges
+        are aligned to the chunksize, so no worker spans two ranges.
         """
-        start = time.time()
-        payload = {}
-        payload['config'] = self.config
-        payload['log_level'] = self.log_level
-        payload['runtime_name'] = job.runtime_name
-        payload['runtime_memory'] = job.runtime_memory
-        payload['remote_invoker'] = True
-        payload['job'] = job.__dict__
+        first_call, last_call = get_call_ids_range(job)
+        total_calls = last_call - first_call
 
-        activation_id = self.compute_handler.invoke(payload)
-        roundtrip = time.time() - start
-        resp_time = format(round(roundtrip, 3), '.3f')
+        if self.remote_invoker_fanout <= 1 or total_calls <= self.remote_invoker_leaf_size:
+            return [(first_call, last_call)]
 
-        if activation_id:
-            logger.debug(
-                f'ExecutorID {job.executor_id} | JobID {job.job_id} - Remote invoker '
-                f'call done ({resp_time}s) - Activation ID: {activation_id}'
-            )
-        else:
-            raise Exception('Unable to spawn remote invoker')
+        total_chunks = total_calls // job.chunksize + (total_calls % job.chunksize > 0)
+        fanout = min(self.remote_invoker_fanout, total_chunks)
+        chunks_per_range = total_chunks // fanout + (total_chunks % fanout > 0)
+        range_size = chunks_per_range * job.chunksize
+
+        return [(start, min(start + range_size, last_call))
+                for start in range(first_call, last_call, range_size)]
+
+    def _invoke_job_remote(self, job):
+        """
+        Logic for invoking a job using remote functions. With a fan-out
+        degree k > 1, the calls are split into k ranges, each one sent to
+        a remote invoker that splits it again, until the ranges are
+        small enough to be invoked directly.
+        """
+        call_ids_ranges = self._split_call_ids_range(job)
+        first_call, last_call = get_call_ids_range(job)
+        job_data = {k: v for k, v in job.__dict__.items() if k not in ('futures', 'cached_calls')}
+
+        def invoke_remote_invoker(call_ids_range):
+            range_calls = call_ids_range[1] - call_ids_range[0]
+            config = copy.deepcopy(self.config)
+            # Each remote invoker gets the share of workers of its calls
+            max_workers = -(-self.max_workers * range_calls // (last_call - first_call))
+            config[self.backend]['max_workers'] = max(1, max_workers)
+
+            start = time.time()
+            payload = {}
+            payload['config'] = config
+            payload['log_level'] = self.log_level
+            payload['runtime_name'] = job.runtime_name
+            payload['runtime_memory'] = job.runtime_memory
+            payload['remote_invoker'] = True
+            payload['job'] = {**job_data, 'call_ids_range': call_ids_range}
+
+            activation_id = self.compute_handler.invoke(payload)
+            roundtrip = time.time() - start
+            resp_time = format(round(roundtrip, 3), '.3f')
+
+            if activation_id:
+                logger.debug(
+                    f'ExecutorID {job.executor_id} | JobID {job.job_id} - Remote invoker '
+                    f'call done ({resp_time}s) - Calls {call_ids_range[0]}-{call_ids_range[1] - 1} '
+                    f'- Activation ID: {activation_id}'
+                )
+            else:
+                raise Exception('Unable to spawn remote invoker')
+
+        list(self.executor.map(invoke_remote_invoker, call_ids_ranges))
 
     def _invoke_job(self, job):
         """
@@ -426,9 +815,14 @@ class FaaSInvoker(Invoker):
         if self.remote_invoker:
             return self._invoke_job_remote(job)
 
+        call_ids = range(*get_call_ids_range(job))
+
         if self.should_run is False:
             self.running_workers = 0
             self.should_run = True
+            if self.async_invoke and not self.async_loop:
+                # The event loop is closed by stop()
+                self.async_loop = AsyncInvokeLoop(self.invoke_pool_threads)
             self._start_async_invokers()
 
         if self.running_workers > 0 and not self.job_monitor.token_bucket_q.empty():
@@ -444,9 +838,8 @@ class FaaSInvoker(Invoker):
         if self.running_workers < self.max_workers:
             free_workers = self.max_workers - self.running_workers
             total_direct = free_workers * job.chunksize
-            callids = range(job.total_calls)
-            callids_to_invoke_direct = callids[:total_direct]
-            callids_to_invoke_nondirect = callids[total_direct:]
+            callids_to_invoke_direct = call_ids[:total_direct]
+            callids_to_invoke_nondirect = call_ids[total_direct:]
 
             ci = len(callids_to_invoke_direct)
             cz = job.chunksize
@@ -463,8 +856,12 @@ class FaaSInvoker(Invoker):
                 future.result()
 
             invoke_futures = []
+            set_queue_wait_time(job, callids_to_invoke_direct, 0)
             for call_ids_range in iterchunks(callids_to_invoke_direct, job.chunksize):
-                future = self.executor.submit(self._invoke_task, job, call_ids_range)
+                if self.async_loop:
+                    future = self.async_loop.submit(self._invoke_task_async, job, call_ids_range)
+                else:
+                    future = self.executor.submit(self._invoke_task, job, call_ids_range)
                 future.add_done_callback(_callback)
                 invoke_futures.append(future)
 
@@ -482,9 +879,9 @@ class FaaSInvoker(Invoker):
         else:
             logger.debug(
                 f'ExecutorID {job.executor_id} | JobID {job.job_id} - Reached maximum {self.max_workers} '
-                f'workers, queuing {job.total_calls} function activations'
+                f'workers, queuing {len(call_ids)} function activations'
             )
-            for call_ids_range in iterchunks(range(job.total_calls), job.chunksize):
+            for call_ids_range in iterchunks(call_ids, job.chunksize):
                 self.pending_calls_q.put((job, call_ids_range))
 
     def run_job(self, job):
@@ -502,6 +899,14 @@ class FaaSInvoker(Invoker):
         return futures
 
 
+def get_call_ids_range(job):
+    """
+    Returns the (first, last + 1) call IDs of a job handled by an invoker.
+    The remote invokers of an invocation tree handle a subrange of the calls.
+    """
+    return getattr(job, 'call_ids_range', None) or (0, job.total_calls)
+
+
 def extend_runtime(job, compute_handler, internal_storage):
     """
     This method is used when runtime_include_function is active
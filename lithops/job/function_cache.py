@@ -0,0 +1,242 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+
+from lithops.storage.utils import StorageNoSuchKeyError
+from lithops.constants import FUNCTION_CACHE_DIR, FUNCTION_CACHE_TTL
+
+try:
+    import fcntl
+except ModuleNotFoundError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class FunctionCache:
+    """
+    Persistent index of the content-addressed function bundles uploaded
+    to the storage backend. The index is kept in the local disk, so it is
+    shared by all the executors created in this host, and it keeps track
+    of the executors that reference each function in order to clean them
+    once they are not used anymore. The index is updated under a file lock,
+    since the executors and the cleaner of the host update it concurrently.
+
+    The bundles are shared by all the hosts that use the same bucket, so
+    each host also records its last use of a function in storage, as a
+    marker key next to the function, and a function is only deleted once
+    the last use recorded by all the hosts is older than the ttl.
+    """
+    MARKER_SUFFIX = '.refs/'
+    LOCK_TIMEOUT = 60
+
+    def __init__(self, storage, ttl=FUNCTION_CACHE_TTL):
+        """
+        :param storage: Storage instance
+        :param ttl: Time (in seconds) that an unreferenced function is kept in storage
+        """
+        self.storage = storage
+        self.bucket = storage.bucket
+        self.ttl = ttl
+        self.index_dir = os.path.join(FUNCTION_CACHE_DIR, storage.backend, self.bucket)
+
+    @contextmanager
+    def _lock(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        if fcntl:
+            with open(os.path.join(self.index_dir, '.lock'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+            return
+
+        # Without fcntl, the lock is the exclusive creation of a lock file.
+        # A lock file older than LOCK_TIMEOUT belongs to a process that
+        # did not finish properly
+        lock_path = os.path.join(self.index_dir, '.lockfile')
+        while True:
+            try:
+                lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > self.LOCK_TIMEOUT:
+                        logger.debug(f'Removing the expired function cache lock file {lock_path}')
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    pass
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(lock_fd)
+            os.remove(lock_path)
+
+    def _entry_path(self, func_key):
+        return os.path.join(self.index_dir, os.path.basename(func_key) + '.json')
+
+    def _load_entry(self, func_key):
+        try:
+            with open(self._entry_path(func_key), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_entry(self, entry):
+        os.makedirs(self.index_dir, exist_ok=True)
+        entry_path = self._entry_path(entry['func_key'])
+        tmp_path = f'{entry_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, entry_path)
+
+    def _exists(self, func_key):
+        try:
+            self.storage.head_object(self.bucket, func_key)
+            return True
+        except StorageNoSuchKeyError:
+            return False
+
+    def _put_marker(self, func_key, executor_id, now):
+        marker_key = f'{func_key}{self.MARKER_SUFFIX}{int(now):012d}.{executor_id}'
+        self.storage.put_object(self.bucket, marker_key, b'')
+
+    def _list_markers(self, func_key):
+        """
+        Returns the (marker key, timestamp) of the last uses of a function
+        recorded in storage
+        """
+        markers = []
+        for key in self.storage.list_keys(self.bucket, func_key + self.MARKER_SUFFIX):
+            try:
+                markers.append((key, int(key.rsplit('/', 1)[-1].split('.', 1)[0])))
+            except ValueError:
+                pass
+        return markers
+
+    def put_func(self, func_key, func_module_str, executor_id):
+        """
+        Registers the executor as a reference of the function, and uploads
+        the function bundle only if it is not already in storage. The
+        reference is registered first, so a concurrent purge() either keeps
+        the function or deletes it before the HEAD request. The use of the
+        function is recorded in storage at most every ttl / 4 seconds.
+
+        :param func_key: content-addressed function key
+        :param func_module_str: serialized function and modules
+        :param executor_id: ID of the executor that uses the function
+
+        :return: True if the function was uploaded, False if it was already in storage
+        """
+        now = time.time()
+
+        with self._lock():
+            entry = self._load_entry(func_key) or {
+                'func_key': func_key,
+                'size': len(func_module_str),
+                'created': now,
+                'refs': {}
+            }
+            entry['last_used'] = now
+            entry['refs'][executor_id] = now
+            put_marker = now - entry.get('last_marker', 0) >= self.ttl / 4
+            if put_marker:
+                entry['last_marker'] = now
+            self._save_entry(entry)
+
+        if put_marker:
+            self._put_marker(func_key, executor_id, now)
+
+        if self._exists(func_key):
+            return False
+
+        self.storage.put_object(self.bucket, func_key, func_module_str)
+        return True
+
+    def release(self, executor_id):
+        """
+        Removes the references of an executor from all the functions
+        """
+        if not os.path.isdir(self.index_dir):
+            return
+
+        with self._lock():
+            for file_name in os.listdir(self.index_dir):
+                if not file_name.endswith('.json'):
+                    continue
+                entry = self._load_entry(file_name[:-len('.json')])
+                if entry and entry['refs'].pop(executor_id, None) is not None:
+                    self._save_entry(entry)
+
+    def purge(self):
+        """
+        Deletes from storage the functions that are not referenced by any
+        executor of this host and that have not been used by any host during
+        the last ttl seconds. References older than the ttl belong to
+        executors that did not finish properly and are discarded.
+
+        :return: list of deleted function keys
+        """
+        if not os.path.isdir(self.index_dir):
+            return []
+
+        to_delete = []
+
+        # The functions are deleted while holding the lock, so no executor
+        # references them in the meantime
+        with self._lock():
+            now = time.time()
+            for file_name in os.listdir(self.index_dir):
+                if not file_name.endswith('.json'):
+                    continue
+                entry = self._load_entry(file_name[:-len('.json')])
+                if not entry:
+                    continue
+                refs = {ex_id: ts for ex_id, ts in entry['refs'].items() if now - ts < self.ttl}
+                if refs != entry['refs']:
+                    entry['refs'] = refs
+                    self._save_entry(entry)
+                if refs or now - entry['last_used'] < self.ttl:
+                    continue
+
+                # The function can still be used by other hosts. Since the
+                # uses are recorded every ttl / 4 seconds, a marker records
+                # the uses of the following ttl / 4 seconds too
+                markers = self._list_markers(entry['func_key'])
+                expired_markers = [key for key, ts in markers if now - ts >= self.ttl * 1.25]
+                if len(expired_markers) == len(markers):
+                    to_delete.append(entry['func_key'])
+                    self.storage.delete_objects(self.bucket, [entry['func_key']] + expired_markers)
+                    try:
+                        os.remove(self._entry_path(entry['func_key']))
+                    except OSError:
+                        pass
+                elif expired_markers:
+                    self.storage.delete_objects(self.bucket, expired_markers)
+
+            if to_delete:
+                logger.debug(f'Deleted {len(to_delete)} expired functions from the function cache')
+
+        return to_delete
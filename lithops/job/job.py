@@ -27,15 +27,21 @@ from types import SimpleNamespace
 from lithops import utils
 from lithops.job.partitioner import create_partitions
 from lithops.storage.utils import create_func_key, create_data_key, \
-    create_job_key, func_key_suffix
-from lithops.job.serialize import SerializeIndependent, create_module_data
+    create_job_key, func_key_suffix, create_func_cache_key
+from lithops.job.serialize import SerializeIndependent, DataWriter, \
+    create_module_data, serialize_iterdata, find_shared_args
+from lithops.job.function_cache import FunctionCache
+from lithops.job.result_cache import ResultCache
+from lithops.util.codecs import compress, get_codec
 from lithops.constants import MAX_AGG_DATA_SIZE, LOCALHOST, \
-    SERVERLESS, STANDALONE, CUSTOM_RUNTIME_DIR
+    SERVERLESS, STANDALONE, CUSTOM_RUNTIME_DIR, FUNCTION_CACHE_TTL, \
+    SHARED_ARG_MIN_SIZE, JOBS_PREFIX, RESULT_CACHE_TTL, RESULT_CACHE_MAX_SIZE
 
 
 logger = logging.getLogger(__name__)
 
 FUNCTION_CACHE = set()
+SHARED_ARGS_CACHE = set()
 MAX_DATA_IN_PAYLOAD = 8 * 1024  # Per invocation. 8KB
 
 
@@ -56,7 +62,10 @@ def create_map_job(
     extra_args=None,
     obj_chunk_size=None,
     obj_newline='\n',
-    obj_chunk_number=None
+    obj_chunk_number=None,
+    priority=0,
+    deadline=None,
+    result_cache=None
 ):
     """
     Wrapper to create a map job. It integrates COS logic to process objects.
@@ -78,6 +87,11 @@ def create_map_job(
         host_job_meta['host_job_create_partitions_time'] = round(time.time() - create_partitions_start, 6)
     # ########
 
+    if result_cache is None:
+        result_cache = config['lithops'].get('result_cache', False)
+    # The contents of the object partitions are not part of the call arguments
+    result_cache = result_cache and not ppo
+
     job = _create_job(
         config=config,
         internal_storage=internal_storage,
@@ -92,7 +106,10 @@ def create_map_job(
         include_modules=include_modules,
         exclude_modules=exclude_modules,
         execution_timeout=execution_timeout,
-        host_job_meta=host_job_meta
+        host_job_meta=host_job_meta,
+        priority=priority,
+        deadline=deadline,
+        result_cache=result_cache
     )
 
     if ppo:
@@ -116,7 +133,8 @@ def create_reduce_job(
     include_modules,
     exclude_modules,
     execution_timeout=None,
-    extra_args=None
+    extra_args=None,
+    priority=0
 ):
     """
     Wrapper to create a reduce job. Apply a function across all map futures.
@@ -154,7 +172,8 @@ def create_reduce_job(
         include_modules=include_modules,
         exclude_modules=exclude_modules,
         execution_timeout=execution_timeout,
-        host_job_meta=host_job_meta
+        host_job_meta=host_job_meta,
+        priority=priority
     )
 
 
@@ -172,7 +191,10 @@ def _create_job(
     exclude_modules,
     execution_timeout,
     host_job_meta,
-    chunksize=None
+    chunksize=None,
+    priority=0,
+    deadline=None,
+    result_cache=False
 ):
     """
     Creates a new Job
@@ -197,6 +219,11 @@ def _create_job(
     job.extra_env = ext_env
     job.function_name = func.__name__ if inspect.isfunction(func) or inspect.ismethod(func) else type(func).__name__
     job.total_calls = len(iterdata)
+    job.priority = priority
+    job.deadline = host_job_meta['host_job_create_tstamp'] + deadline if deadline else None
+    job.payload_codec = config['lithops'].get('payload_codec')
+    job.status_manifest = config['lithops'].get('status_manifest', False)
+    get_codec(job.payload_codec)  # Validate the codec on the host
 
     if mode == SERVERLESS:
         job.runtime_memory = runtime_memory or config[backend]['runtime_memory']
@@ -242,84 +269,148 @@ def _create_job(
     logger.debug(f'ExecutorID {executor_id} | JobID {job_id} - Serializing function and data')
     job_serialize_start = time.time()
     serializer = SerializeIndependent(runtime_meta['preinstalls'])
-    func_and_data_ser, mod_paths = serializer([func] + iterdata, inc_modules, exc_modules)
-    data_strs = func_and_data_ser[1:]
-    data_size_bytes = sum(len(x) for x in data_strs)
+    func_and_data_ser, mod_paths = serializer([func] + iterdata, inc_modules, exc_modules, serialize_data=False)
     module_data = create_module_data(mod_paths)
     func_str = func_and_data_ser[0]
-    func_module_str = pickle.dumps({'func': func_str, 'module_data': module_data}, -1)
+    func_module_str = compress(pickle.dumps({'func': func_str, 'module_data': module_data}, -1), job.payload_codec)
     func_module_size_bytes = len(func_module_str)
 
-    host_job_meta['host_job_serialize_time'] = round(time.time() - job_serialize_start, 6)
-    host_job_meta['func_data_size_bytes'] = data_size_bytes
-    host_job_meta['func_module_size_bytes'] = func_module_size_bytes
-
     # Check data limit
     if 'data_limit' in config['lithops']:
         data_limit = config['lithops']['data_limit']
     else:
         data_limit = MAX_AGG_DATA_SIZE
-    if data_limit and data_size_bytes > data_limit * 1024**2:
-        log_msg = ('ExecutorID {} | JobID {} - Total data exceeded maximum size '
-                   'of {}'.format(executor_id, job_id, utils.sizeof_fmt(data_limit * 1024**2)))
-        raise Exception(log_msg)
-
-    # Upload function and data
-    upload_function = not config[backend].get("runtime_include_function", False)
-    upload_data = any([(len(data_str) * job.chunksize) > MAX_DATA_IN_PAYLOAD for data_str in data_strs])
-
-    # Upload function and modules
-    if upload_function:
-        function_hash = hashlib.md5(func_module_str).hexdigest()
-        job.func_key = create_func_key(executor_id, function_hash)
-        if job.func_key not in FUNCTION_CACHE:
-            logger.debug('ExecutorID {} | JobID {} - Uploading function and modules '
-                         'to the storage backend'.format(executor_id, job_id))
+
+    oob = config['lithops'].get('oob_serialization', False)
+
+    # Upload once the arguments repeated across calls
+    if config['lithops'].get('share_args', False):
+        iterdata, shared_args = find_shared_args(iterdata, executor_id, SHARED_ARG_MIN_SIZE * 1024**2,
+                                                 oob, job.payload_codec)
+        for shared_arg_key, shared_arg_str in shared_args.items():
+            if shared_arg_key not in SHARED_ARGS_CACHE:
+                logger.debug(f'ExecutorID {executor_id} | JobID {job_id} - Uploading shared argument '
+                             f'{shared_arg_key} - Size: {utils.sizeof_fmt(len(shared_arg_str))}')
+                internal_storage.put_data(shared_arg_key, shared_arg_str)
+                SHARED_ARGS_CACHE.add(shared_arg_key)
+
+    # Find the calls whose output is already in the result cache
+    digest_ignore = None
+    if result_cache:
+        job.result_cache_func_hash = hashlib.md5(func_module_str).hexdigest()
+        ttl = config['lithops'].get('result_cache_ttl', RESULT_CACHE_TTL)
+        max_size = config['lithops'].get('result_cache_max_size', RESULT_CACHE_MAX_SIZE)
+        cached_outputs = ResultCache(internal_storage.storage, job.result_cache_func_hash, ttl, max_size).lookup()
+        job.result_cache_arg_hashes = []
+        job.cached_calls = []
+        # The shared argument keys contain the executor ID
+        digest_ignore = '/'.join([JOBS_PREFIX, executor_id, '']).encode()
+
+    data_writer = DataWriter()
+    try:
+        for i, data_str in enumerate(serialize_iterdata(iterdata, oob=oob, codec=job.payload_codec,
+                                                        digest_ignore=digest_ignore)):
+            if result_cache:
+                data_str, arg_hash = data_str
+                if arg_hash in cached_outputs:
+                    job.cached_calls.append((i, *cached_outputs[arg_hash]))
+                    continue
+                job.result_cache_arg_hashes.append(arg_hash)
+            data_writer.write(data_str)
+            if data_limit and data_writer.size > data_limit * 1024**2:
+                log_msg = ('ExecutorID {} | JobID {} - Total data exceeded maximum size '
+                           'of {}'.format(executor_id, job_id, utils.sizeof_fmt(data_limit * 1024**2)))
+                raise Exception(log_msg)
+        data_size_bytes = data_writer.size
+
+        if result_cache:
+            job.total_calls = len(job.result_cache_arg_hashes)
+            logger.debug(f'ExecutorID {executor_id} | JobID {job_id} - {len(job.cached_calls)} of '
+                         f'{len(iterdata)} calls found in the result cache')
+
+        host_job_meta['host_job_serialize_time'] = round(time.time() - job_serialize_start, 6)
+        host_job_meta['func_data_size_bytes'] = data_size_bytes
+        host_job_meta['func_module_size_bytes'] = func_module_size_bytes
+
+        # Upload function and data
+        upload_function = not config[backend].get("runtime_include_function", False)
+        upload_data = data_writer.max_element_size * job.chunksize > MAX_DATA_IN_PAYLOAD
+
+        # Upload function and modules
+        if upload_function:
+            function_hash = hashlib.md5(func_module_str).hexdigest()
+            function_cache = None
+            if config['lithops'].get('function_cache', False):
+                # Content-addressed key shared by all the executors
+                job.func_key = create_func_cache_key(function_hash)
+                ttl = config['lithops'].get('function_cache_ttl', FUNCTION_CACHE_TTL)
+                function_cache = FunctionCache(internal_storage.storage, ttl)
+            else:
+                job.func_key = create_func_key(executor_id, function_hash)
+
             func_upload_start = time.time()
-            internal_storage.put_func(job.func_key, func_module_str)
-            func_upload_end = time.time()
-            host_job_meta['host_func_upload_time'] = round(func_upload_end - func_upload_start, 6)
+            if function_cache:
+                # The function can be purged by other executors of the host, so
+                # it is always checked in storage
+                uploaded = function_cache.put_func(job.func_key, func_module_str, executor_id)
+            elif job.func_key not in FUNCTION_CACHE:
+                internal_storage.put_func(job.func_key, func_module_str)
+                uploaded = True
+            else:
+                uploaded = False
             FUNCTION_CACHE.add(job.func_key)
+
+            if uploaded:
+                logger.debug('ExecutorID {} | JobID {} - Function and modules uploaded '
+                             'to the storage backend'.format(executor_id, job_id))
+                func_upload_end = time.time()
+                host_job_meta['host_func_upload_time'] = round(func_upload_end - func_upload_start, 6)
+            else:
+                logger.debug('ExecutorID {} | JobID {} - Function and modules '
+                             'found in cache'.format(executor_id, job_id))
+                host_job_meta['host_func_upload_time'] = 0
+
         else:
-            logger.debug('ExecutorID {} | JobID {} - Function and modules '
-                         'found in local cache'.format(executor_id, job_id))
+            # Prepare function and modules locally to store in the runtime image later
+            function_file = func.__code__.co_filename
+            function_hash = hashlib.md5(open(function_file, 'rb').read()).hexdigest()[:16]
+            mod_hash = hashlib.md5(repr(sorted(mod_paths)).encode('utf-8')).hexdigest()[:16]
+            job.func_key = func_key_suffix
+            job.ext_runtime_uuid = f'{function_hash}{mod_hash}'
+            job.local_tmp_dir = os.path.join(CUSTOM_RUNTIME_DIR, job.ext_runtime_uuid)
+            _store_func_and_modules(job.local_tmp_dir, job.func_key, func_str, module_data)
             host_job_meta['host_func_upload_time'] = 0
 
-    else:
-        # Prepare function and modules locally to store in the runtime image later
-        function_file = func.__code__.co_filename
-        function_hash = hashlib.md5(open(function_file, 'rb').read()).hexdigest()[:16]
-        mod_hash = hashlib.md5(repr(sorted(mod_paths)).encode('utf-8')).hexdigest()[:16]
-        job.func_key = func_key_suffix
-        job.ext_runtime_uuid = f'{function_hash}{mod_hash}'
-        job.local_tmp_dir = os.path.join(CUSTOM_RUNTIME_DIR, job.ext_runtime_uuid)
-        _store_func_and_modules(job.local_tmp_dir, job.func_key, func_str, module_data)
-        host_job_meta['host_func_upload_time'] = 0
-
-    # upload data
-    if upload_data or config['lithops']['backend_type'] == utils.BackendType.BATCH.value:
-        # Upload iterdata to COS only if a single element is greater than MAX_DATA_IN_PAYLOAD
-        logger.debug('ExecutorID {} | JobID {} - Uploading data to the storage backend'
-                     .format(executor_id, job_id))
-        # pass_iteradata through an object storage file
-        data_key = create_data_key(executor_id, job_id)
-        job.data_key = data_key
-        data_bytes, data_byte_ranges = utils.agg_data(data_strs)
-        job.data_byte_ranges = data_byte_ranges
-        data_upload_start = time.time()
-        internal_storage.put_data(data_key, data_bytes)
-        data_upload_end = time.time()
-        host_job_meta['host_data_upload_time'] = round(data_upload_end - data_upload_start, 6)
+        # upload data
+        if upload_data or config['lithops']['backend_type'] == utils.BackendType.BATCH.value:
+            # Upload iterdata to COS only if a single element is greater than MAX_DATA_IN_PAYLOAD
+            logger.debug('ExecutorID {} | JobID {} - Uploading data to the storage backend'
+                         .format(executor_id, job_id))
+            # pass_iteradata through an object storage file
+            data_key = create_data_key(executor_id, job_id)
+            job.data_key = data_key
+            job.data_byte_ranges = data_writer.data_byte_ranges
+            data_upload_start = time.time()
+            if data_writer.file_name is None:
+                internal_storage.put_data(data_key, data_writer.getvalue())
+            else:
+                data_writer.flush()
+                internal_storage.put_data_file(data_key, data_writer.file_name)
+            data_upload_end = time.time()
+            host_job_meta['host_data_upload_time'] = round(data_upload_end - data_upload_start, 6)
 
-    else:
-        # pass iteradata as part of the invocation payload
-        logger.debug('ExecutorID {} | JobID {} - Data per activation is < '
-                     '{}. Passing data through invocation payload'
-                     .format(executor_id, job_id, utils.sizeof_fmt(MAX_DATA_IN_PAYLOAD)))
-        job.data_key = None
-        job.data_byte_ranges = None
-        job.data_byte_strs = data_strs
-        host_job_meta['host_data_upload_time'] = 0
+        else:
+            # pass iteradata as part of the invocation payload
+            logger.debug('ExecutorID {} | JobID {} - Data per activation is < '
+                         '{}. Passing data through invocation payload'
+                         .format(executor_id, job_id, utils.sizeof_fmt(MAX_DATA_IN_PAYLOAD)))
+            job.data_key = None
+            job.data_byte_ranges = None
+            job.data_byte_strs = data_writer.get_data_strs()
+            host_job_meta['host_data_upload_time'] = 0
+    finally:
+        # Removes the temporary file of the data spilled to disk
+        data_writer.close()
 
     host_job_meta['host_job_created_time'] = round(time.time() - host_job_meta['host_job_create_tstamp'], 6)
 
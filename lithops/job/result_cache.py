@@ -0,0 +1,99 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import logging
+
+from lithops.storage.utils import create_result_cache_prefix, output_key_suffix
+from lithops.constants import RESULT_CACHE_TTL, RESULT_CACHE_MAX_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Index of the cached outputs of the calls of a function. The workers
+    store the output of each call under a key derived from the hash of
+    the function bundle and the hash of the call arguments, so a call
+    with the same function and arguments is not executed again. The
+    creation time of each output is part of its key, so a single listing
+    of the function prefix is enough to build the index.
+    """
+
+    def __init__(self, storage, function_hash, ttl=RESULT_CACHE_TTL, max_size=RESULT_CACHE_MAX_SIZE):
+        """
+        :param storage: Storage instance
+        :param function_hash: hash of the function and modules bundle
+        :param ttl: Time (in seconds) that a cached output is valid
+        :param max_size: Maximum size (in MiB) of the cached outputs of the function
+        """
+        self.storage = storage
+        self.bucket = storage.bucket
+        self.function_hash = function_hash
+        self.ttl = ttl
+        self.max_size = max_size * 1024**2
+        self.prefix = create_result_cache_prefix(function_hash)
+
+    def _parse_key(self, key):
+        name = key[len(self.prefix):]
+        if not name.endswith('.' + output_key_suffix):
+            return None, None
+        try:
+            arg_hash, tstamp = name[:-len(output_key_suffix) - 1].rsplit('.', 1)
+            return arg_hash, int(tstamp)
+        except ValueError:
+            return None, None
+
+    def lookup(self):
+        """
+        Lists the cached outputs of the function. The outputs older than
+        the ttl, and the oldest outputs that exceed the maximum size, are
+        deleted from storage.
+
+        :return: dict of argument hash -> (output key, output size)
+        """
+        now = time.time()
+        entries = {}
+        to_delete = []
+
+        for obj in self.storage.list_objects(self.bucket, self.prefix):
+            arg_hash, tstamp = self._parse_key(obj['Key'])
+            if arg_hash is None:
+                continue
+            if now - tstamp >= self.ttl:
+                to_delete.append(obj['Key'])
+                continue
+            entry = (tstamp, obj['Key'], obj['Size'])
+            if arg_hash in entries:
+                # The same call was cached twice; keep the newest output
+                to_delete.append(min(entry, entries[arg_hash])[1])
+                entry = max(entry, entries[arg_hash])
+            entries[arg_hash] = entry
+
+        total_size = sum(size for _, _, size in entries.values())
+        if total_size > self.max_size:
+            for arg_hash, (_, key, size) in sorted(entries.items(), key=lambda e: e[1][0]):
+                if total_size <= self.max_size:
+                    break
+                to_delete.append(key)
+                total_size -= size
+                del entries[arg_hash]
+
+        if to_delete:
+            logger.debug(f'Deleting {len(to_delete)} expired outputs from the result cache')
+            self.storage.delete_objects(self.bucket, to_delete)
+
+        return {arg_hash: (key, size) for arg_hash, (_, key, size) in entries.items()}
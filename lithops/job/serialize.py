@@ -16,13 +16,20 @@
 # limitations under the License.
 #
 
+import io
 import os
+import sys
+import json
 import glob
+import hashlib
 import importlib
 import logging
 import inspect
+import tempfile
+import threading
 import cloudpickle
 from pathlib import Path
+from collections import OrderedDict
 from dis import Bytecode
 from functools import reduce
 from importlib import import_module
@@ -30,11 +37,57 @@ from types import CodeType, FunctionType, ModuleType
 
 from lithops.libs import imp
 from lithops.libs import inspect as linspect
-from lithops.utils import bytes_to_b64str
+from lithops.utils import bytes_to_b64str, is_lithops_worker, oob_dumps
+from lithops.constants import DEPENDENCY_CACHE_DIR, DATA_SPOOL_SIZE, LITHOPS_TEMP_DIR, \
+    MODULE_DATA_CACHE_SIZE
+from lithops.util.codecs import compress
+from lithops.storage.utils import SharedArgument, create_shared_arg_key
 from lithops.libs.multyvac.module_dependency import ModuleDependencyAnalyzer
 
 logger = logging.getLogger(__name__)
 
+DEPENDENCY_CACHE = {}
+
+
+class ModuleDataCache:
+    """
+    LRU cache of the encoded module files, keyed by path and evicted by
+    size. An entry is only valid while the modification time and the size
+    of its file do not change
+    """
+
+    def __init__(self, max_size=MODULE_DATA_CACHE_SIZE):
+        self.max_size = max_size * 1024**2
+        self.size = 0
+        self.modules = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, path, st):
+        """
+        :return: the encoded module, or None if it is not cached or the file changed
+        """
+        with self.lock:
+            cached = self.modules.get(path)
+            if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+                return None
+            self.modules.move_to_end(path)
+            return cached[2]
+
+    def put(self, path, st, mod_str):
+        with self.lock:
+            if path in self.modules:
+                self.size -= len(self.modules.pop(path)[2])
+            if len(mod_str) > self.max_size:
+                return
+            self.modules[path] = (st.st_mtime_ns, st.st_size, mod_str)
+            self.size += len(mod_str)
+            while self.size > self.max_size:
+                _, (_, _, evicted_str) = self.modules.popitem(last=False)
+                self.size -= len(evicted_str)
+
+
+MODULE_DATA_CACHE = ModuleDataCache()
+
 
 class SerializeIndependent:
 
@@ -43,16 +96,18 @@ class SerializeIndependent:
         self.preinstalled_modules.append(['lithops', True])
         self._modulemgr = None
 
-    def __call__(self, list_of_objs, include_modules, exclude_modules):
+    def __call__(self, list_of_objs, include_modules, exclude_modules, serialize_data=True):
         """
-        Serialize f, args, kwargs independently
+        Serialize f, args, kwargs independently. If serialize_data is False,
+        only the function is serialized, and the data must be serialized
+        later with serialize_iterdata()
         """
         preinstalled_modules = [name for name, _ in self.preinstalled_modules]
 
         strs = []
         mod_paths = set()
 
-        for obj in list_of_objs:
+        for obj in list_of_objs if serialize_data else list_of_objs[:1]:
             strs.append(cloudpickle.dumps(obj))
 
         if include_modules is None:
@@ -63,36 +118,15 @@ class SerializeIndependent:
         if len(include_modules) == 0:
             # If include_modules is not provided (empty list by default),
             # inspect the objects looking for referenced modules
-            self._modulemgr = ModuleDependencyAnalyzer()
-            self._modulemgr.ignore(preinstalled_modules)
-            self._modulemgr.ignore(exclude_modules)
-
-            ref_modules = set()
+            cache_key = self._dependencies_cache_key(strs[0], list_of_objs, exclude_modules, preinstalled_modules)
+            cached_mod_paths = get_cached_dependencies(cache_key)
 
-            for obj in list_of_objs:
-                ref_modules.update(self._module_inspect(obj))
-
-            logger.debug("Referenced Modules: {}".format(None if not
-                         ref_modules else ", ".join(ref_modules)))
-
-            for module_name in ref_modules:
-                if module_name in ['__main__', None]:
-                    continue
-                try:
-                    mod_spec = importlib.util.find_spec(module_name)
-                except Exception:
-                    mod_spec = None
-
-                origin = mod_spec.origin if mod_spec else module_name
-                if origin and origin.endswith('.so'):
-                    if origin not in exclude_modules and \
-                       os.path.basename(origin) not in exclude_modules:
-                        mod_paths.add(origin)
-                else:
-                    self._modulemgr.add(module_name)
-
-            tent_mod_paths = self._modulemgr.get_and_clear_paths()
-            mod_paths = mod_paths.union(tent_mod_paths)
+            if cached_mod_paths is not None:
+                logger.debug('Module dependencies found in cache')
+                mod_paths = cached_mod_paths
+            else:
+                mod_paths = self._find_dependencies(list_of_objs, exclude_modules, preinstalled_modules)
+                put_cached_dependencies(cache_key, mod_paths)
 
         else:
             # If include_modules is provided, include only the provided list
@@ -121,6 +155,69 @@ class SerializeIndependent:
 
         return (strs, mod_paths)
 
+    def _find_dependencies(self, list_of_objs, exclude_modules, preinstalled_modules):
+        """
+        Inspects the objects looking for referenced modules and returns the
+        paths of the modules to transmit
+        """
+        mod_paths = set()
+
+        self._modulemgr = ModuleDependencyAnalyzer()
+        self._modulemgr.ignore(preinstalled_modules)
+        self._modulemgr.ignore(exclude_modules)
+
+        ref_modules = set()
+
+        for obj in list_of_objs:
+            ref_modules.update(self._module_inspect(obj))
+
+        logger.debug("Referenced Modules: {}".format(None if not
+                     ref_modules else ", ".join(ref_modules)))
+
+        for module_name in ref_modules:
+            if module_name in ['__main__', None]:
+                continue
+            try:
+                mod_spec = importlib.util.find_spec(module_name)
+            except Exception:
+                mod_spec = None
+
+            origin = mod_spec.origin if mod_spec else module_name
+            if origin and origin.endswith('.so'):
+                if origin not in exclude_modules and \
+                   os.path.basename(origin) not in exclude_modules:
+                    mod_paths.add(origin)
+            else:
+                self._modulemgr.add(module_name)
+
+        tent_mod_paths = self._modulemgr.get_and_clear_paths()
+
+        return mod_paths.union(tent_mod_paths)
+
+    def _dependencies_cache_key(self, func_str, list_of_objs, exclude_modules, preinstalled_modules):
+        """
+        Creates the key of the dependency cache. The key is derived from the
+        serialized function and the types of the arguments, which are the
+        objects inspected by _module_inspect()
+        """
+        arg_types = set()
+        for obj in list_of_objs[1:]:
+            params = obj.values() if type(obj) is dict else [obj]
+            for param in params:
+                if inspect.isfunction(param):
+                    arg_types.add((param.__module__, param.__qualname__,
+                                   hashlib.md5(param.__code__.co_code).hexdigest()))
+                else:
+                    arg_types.add((type(param).__module__, type(param).__qualname__))
+
+        key = hashlib.md5(func_str)
+        key.update(repr(sorted(arg_types)).encode())
+        key.update(repr(sorted(set(exclude_modules))).encode())
+        key.update(repr(sorted(set(preinstalled_modules))).encode())
+        key.update(repr(sys.path).encode())
+
+        return key.hexdigest()
+
     def _module_inspect(self, obj):
         """
         inspect objects for module dependencies
@@ -225,6 +322,282 @@ class SerializeIndependent:
         return (None, None)
 
 
+def _data_digest(data_str, digest_ignore):
+    """
+    Returns the digest of a serialized element, ignoring the occurrences
+    of digest_ignore in its pickle stream
+    """
+    segments = data_str if type(data_str) is list else [data_str]
+    digest = hashlib.md5(bytes(segments[0]).replace(digest_ignore, b''))
+    for segment in segments[1:]:
+        digest.update(segment)
+    return digest.hexdigest()
+
+
+def serialize_iterdata(iterdata, oob=False, codec=None, digest_ignore=None):
+    """
+    Serializes the iterdata elements one at a time and yields them in
+    order, so the consumer can write each element out before the next one
+    is serialized. If oob is True, each element is a list of segments
+    created by oob_dumps(). If a codec is set, each element is compressed
+    in its own frame, so that the data byte ranges still point to
+    individual calls. If digest_ignore is set, (element, digest) tuples
+    are yielded, where the digest of the uncompressed element ignores the
+    digest_ignore bytes.
+    """
+    for obj in iterdata:
+        data_str = oob_dumps(obj, cloudpickle.dumps) if oob else cloudpickle.dumps(obj)
+        if digest_ignore is not None:
+            digest = _data_digest(data_str, digest_ignore)
+        if codec:
+            data_str = compress(b''.join(data_str) if oob else data_str, codec)
+        yield (data_str, digest) if digest_ignore is not None else data_str
+
+
+class DataWriter:
+    """
+    Aggregates the serialized data elements of a job into a single data
+    object, computing the byte range of each element. The data is kept
+    in memory until it exceeds spool_size MiB, then it is spilled to a
+    temporary file, so the host memory is bounded regardless of the
+    iterdata length.
+    """
+
+    def __init__(self, spool_size=DATA_SPOOL_SIZE):
+        self.spool_size = spool_size * 1024**2
+        self.data_byte_ranges = []
+        self.size = 0
+        self.max_element_size = 0
+        self.file_name = None
+        self._buffer = io.BytesIO()
+
+    def write(self, data_str):
+        """
+        Appends a serialized element, either a bytes-like object or a list
+        of segments created by oob_dumps()
+        """
+        segments = data_str if type(data_str) is list else [data_str]
+        data_len = sum(memoryview(segment).nbytes for segment in segments)
+        self.data_byte_ranges.append((self.size, self.size + data_len - 1))
+        self.size += data_len
+        self.max_element_size = max(self.max_element_size, data_len)
+        for segment in segments:
+            self._buffer.write(segment)
+
+        if self.file_name is None and self.size > self.spool_size:
+            os.makedirs(LITHOPS_TEMP_DIR, exist_ok=True)
+            fd, self.file_name = tempfile.mkstemp(prefix='data-', suffix='.pickle', dir=LITHOPS_TEMP_DIR)
+            spooled = self._buffer
+            self._buffer = os.fdopen(fd, 'wb')
+            self._buffer.write(spooled.getbuffer())
+
+    def getvalue(self):
+        """
+        Returns the aggregated data. Only available when it is in memory
+        """
+        return self._buffer.getvalue()
+
+    def flush(self):
+        self._buffer.flush()
+
+    def get_data_strs(self):
+        """
+        Returns the list of serialized data elements
+        """
+        if self.file_name is None:
+            data = self._buffer.getbuffer()
+            return [bytes(data[start:end + 1]) for start, end in self.data_byte_ranges]
+
+        self.flush()
+        with open(self.file_name, 'rb') as f:
+            return [f.read(end - start + 1) for start, end in self.data_byte_ranges]
+
+    def close(self):
+        self._buffer.close()
+        if self.file_name is not None:
+            try:
+                os.remove(self.file_name)
+            except OSError:
+                pass
+
+
+def _content_digest(obj, min_size):
+    """
+    Returns a digest of the contents of a buffer-like object (bytes,
+    NumPy arrays, ...) of at least min_size bytes, or None otherwise
+    """
+    try:
+        buffer = memoryview(obj)
+    except TypeError:
+        return None
+    if buffer.nbytes < min_size or not buffer.c_contiguous:
+        return None
+
+    digest = hashlib.md5(type(obj).__qualname__.encode())
+    digest.update(repr((getattr(obj, 'dtype', None), getattr(obj, 'shape', None))).encode())
+    digest.update(buffer.cast('B'))
+
+    return digest.hexdigest()
+
+
+def find_shared_args(iterdata, executor_id, min_size, oob=False, codec=None):
+    """
+    Finds the arguments repeated across the calls of a job, either the
+    same object or buffer-like objects with the same contents, whose
+    serialized size is at least min_size bytes. Each one is serialized
+    once and replaced by a SharedArgument reference in the iterdata.
+
+    :return: new iterdata and a dict of shared argument keys and their serialized values
+    """
+    record = {}
+    for i, call_data in enumerate(iterdata):
+        for k, v in call_data.items():
+            if type(v) in (int, float, bool, complex, type(None)):
+                continue
+            if id(v) not in record:
+                record[id(v)] = [v]
+            record[id(v)].append((i, k))
+
+    # Group the objects that are not repeated by identity by their contents
+    by_content = {}
+    for obj_id, positions in list(record.items()):
+        if len(positions) == 2:
+            digest = _content_digest(positions[0], min_size)
+            if digest is not None:
+                by_content.setdefault(digest, []).append(obj_id)
+
+    for obj_ids in by_content.values():
+        if len(obj_ids) > 1:
+            for obj_id in obj_ids[1:]:
+                record[obj_ids[0]].extend(record.pop(obj_id)[1:])
+
+    new_iterdata = list(iterdata)
+    shared_args = {}
+    for obj, *positions in record.values():
+        if len(positions) < 2:
+            continue
+        if oob:
+            obj_str = b''.join(oob_dumps(obj, cloudpickle.dumps))
+        else:
+            obj_str = cloudpickle.dumps(obj)
+        if len(obj_str) < min_size:
+            continue
+        obj_str = compress(obj_str, codec)
+
+        key = create_shared_arg_key(executor_id, hashlib.md5(obj_str).hexdigest())
+        shared_args[key] = obj_str
+        shared_arg = SharedArgument(key)
+        for i, k in positions:
+            if new_iterdata[i] is iterdata[i]:
+                new_iterdata[i] = iterdata[i].copy()
+            new_iterdata[i][k] = shared_arg
+
+    return new_iterdata, shared_args
+
+
+def _fingerprint_paths(mod_paths):
+    """
+    Returns the modification time and size of the module paths and all
+    their contents. Directories are included, so adding or removing a
+    file from a package changes the fingerprint.
+    """
+    fingerprint = {}
+    for m in mod_paths:
+        if os.path.isdir(m):
+            for root, dirs, files in os.walk(m):
+                dirs[:] = [d for d in dirs if d != '__pycache__']
+                for name in [root] + [os.path.join(root, f) for f in files if f.endswith('.py')]:
+                    st = os.stat(name)
+                    fingerprint[name] = [st.st_mtime_ns, st.st_size]
+        else:
+            st = os.stat(m)
+            fingerprint[m] = [st.st_mtime_ns, st.st_size]
+    return fingerprint
+
+
+def _is_fingerprint_valid(fingerprint):
+    """
+    Checks that none of the paths of a fingerprint has been modified
+    """
+    for path, (mtime_ns, size) in fingerprint.items():
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_mtime_ns != mtime_ns or st.st_size != size:
+            return False
+    return True
+
+
+def get_cached_dependencies(cache_key):
+    """
+    Returns the cached module paths of a dependency analysis, or None if
+    they are not in the cache or any of the modules changed since then
+    """
+    entry = DEPENDENCY_CACHE.get(cache_key)
+
+    if entry is None and not is_lithops_worker():
+        try:
+            with open(os.path.join(DEPENDENCY_CACHE_DIR, cache_key + '.json'), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+    if entry is None or not _is_fingerprint_valid(entry['fingerprint']):
+        DEPENDENCY_CACHE.pop(cache_key, None)
+        return None
+
+    DEPENDENCY_CACHE[cache_key] = entry
+    return set(entry['mod_paths'])
+
+
+def put_cached_dependencies(cache_key, mod_paths):
+    """
+    Stores the module paths of a dependency analysis in the memory cache
+    and, if not running in a worker, in the local disk cache
+    """
+    try:
+        entry = {
+            'mod_paths': sorted(mod_paths),
+            'fingerprint': _fingerprint_paths(mod_paths)
+        }
+    except OSError as e:
+        logger.debug(f'Could not fingerprint module dependencies: {e}')
+        return
+
+    DEPENDENCY_CACHE[cache_key] = entry
+
+    if is_lithops_worker():
+        return
+
+    try:
+        os.makedirs(DEPENDENCY_CACHE_DIR, exist_ok=True)
+        entry_path = os.path.join(DEPENDENCY_CACHE_DIR, cache_key + '.json')
+        tmp_path = f'{entry_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, entry_path)
+    except OSError as e:
+        logger.debug(f'Could not store module dependencies in the local cache: {e}')
+
+
+def _read_module_file(f):
+    """
+    Reads and encodes a module file, reusing the previous result if the
+    file has not changed
+    """
+    st = os.stat(f)
+    mod_str = MODULE_DATA_CACHE.get(f, st)
+    if mod_str is not None:
+        return mod_str
+
+    with open(f, 'rb') as file:
+        mod_str = bytes_to_b64str(file.read())
+    MODULE_DATA_CACHE.put(f, st, mod_str)
+
+    return mod_str
+
+
 def create_module_data(mod_paths):
 
     module_data = {}
@@ -238,9 +611,7 @@ def create_module_data(mod_paths):
             files = [m]
         for f in files:
             f = os.path.abspath(f)
-            with open(f, 'rb') as file:
-                mod_str = file.read()
             dest_filename = Path(f[len(pkg_root) + 1:]).as_posix()
-            module_data[dest_filename] = bytes_to_b64str(mod_str)
+            module_data[dest_filename] = _read_module_file(f)
 
     return module_data
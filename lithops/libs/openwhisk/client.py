@@ -292,6 +292,31 @@ class OpenWhiskClient:
                 logger.debug(data)
                 raise Exception(data['error'])
 
+    async def invoke_async(self, session, package, action_name, payload={}):
+        """
+        Invoke an WSK function using a shared aiohttp session
+        """
+        url = '/'.join([self.url, self.namespace, 'actions', package, action_name])
+
+        try:
+            async with session.post(url, data=json.dumps(payload, default=str),
+                                    headers=self.headers, ssl=False) as resp:
+                resp_status = resp.status
+                data = await resp.json(content_type=None)
+        except Exception as e:
+            logger.debug(f'Invocation Failed: {str(e)}')
+            return None
+
+        if resp_status == 202 and 'activationId' in data:
+            return data["activationId"]
+        elif resp_status == 429:
+            return None  # "Too many concurrent requests in flight"
+        elif resp_status in (401, 404):
+            return resp_status
+        else:
+            logger.debug(data)
+            raise Exception(data['error'])
+
     def invoke_with_result(self, package, action_name, payload={}):
         """
         Invoke a WSK function waiting for the result.
@@ -24,8 +24,12 @@ import sys
 import queue
 import threading
 import concurrent.futures as cf
+from collections import deque
 from tblib import pickling_support
 
+from lithops.utils import bytes_to_b64str
+from lithops.util.redis_streams import create_redis_client, get_stream_name
+
 pickling_support.install()
 
 logger = logging.getLogger(__name__)
@@ -48,6 +52,15 @@ class Monitor(threading.Thread):
         super().__init__()
         self.executor_id = executor_id
         self.futures = set()
+        # Index of the tracked futures by (executor_id, job_id, call_id), and
+        # the futures not done yet, so each poll only touches the new events
+        self.futures_index = {}
+        self.pending_futures = set()
+        self.running_futures = set()
+        # Futures of this executor whose done status was not listed yet, and
+        # the [first, last + 1, count] call IDs of these futures in each job
+        self.unlisted_futures = set()
+        self.job_ranges = {}
         self.internal_storage = internal_storage
         self.should_run = True
         self.token_bucket_q = token_bucket_q
@@ -58,15 +71,31 @@ class Monitor(threading.Thread):
 
         # vars for _generate_tokens
         self.workers = {}
-        self.workers_done = []
+        self.workers_done = set()
         self.callids_done_worker = {}
         self.present_jobs = set()
 
+    def _track_futures(self, fs):
+        """
+        Adds futures to the index and state sets
+        """
+        for f in fs:
+            if f in self.futures:
+                continue
+            self.futures.add(f)
+            self.futures_index[(f.executor_id, f.job_id, f.call_id)] = f
+            if not (f.ready or f.success or f.done):
+                self.pending_futures.add(f)
+                if f.executor_id == self.executor_id:
+                    self._add_unlisted_future(f)
+                if f.running:
+                    self.running_futures.add(f)
+
     def add_futures(self, fs):
         """
         Extends the current thread list of futures to track
         """
-        self.futures.update(set(fs))
+        self._track_futures(fs)
 
         present_jobs = {future.job_id for future in fs}
         for job_id in present_jobs:
@@ -81,16 +110,76 @@ class Monitor(threading.Thread):
         for future in fs:
             if future in self.futures:
                 self.futures.remove(future)
+                self.futures_index.pop((future.executor_id, future.job_id, future.call_id), None)
+                self.pending_futures.discard(future)
+                self.running_futures.discard(future)
+                self._remove_unlisted_future(future)
 
         for job_id in {future.job_id for future in fs}:
             if job_id in self.present_jobs:
                 self.present_jobs.remove(job_id)
 
+    def _add_unlisted_future(self, f):
+        if f in self.unlisted_futures:
+            return
+        self.unlisted_futures.add(f)
+        call_id = int(f.call_id)
+        job_range = self.job_ranges.get(f.job_id)
+        if job_range is None:
+            self.job_ranges[f.job_id] = [call_id, call_id + 1, 1]
+        else:
+            job_range[0] = min(job_range[0], call_id)
+            job_range[1] = max(job_range[1], call_id + 1)
+            job_range[2] += 1
+
+    def _remove_unlisted_future(self, f):
+        if f not in self.unlisted_futures:
+            return
+        self.unlisted_futures.remove(f)
+        job_range = self.job_ranges[f.job_id]
+        job_range[2] -= 1
+        if job_range[2] == 0:
+            del self.job_ranges[f.job_id]
+
+    def _get_job_ranges(self):
+        """
+        Returns the (first, last + 1) call IDs of the futures whose done
+        status was not listed yet, for each job of this executor. The jobs
+        whose calls are all listed as done are left out
+        """
+        return {job_id: (first_call, last_call)
+                for job_id, (first_call, last_call, _) in self.job_ranges.items()}
+
+    def _get_pending_future(self, callid):
+        """
+        Returns the tracked future of a call ID if it is not done yet
+        """
+        f = self.futures_index.get(callid)
+        if f is None or f not in self.pending_futures:
+            return None
+        if f.ready or f.success or f.done:
+            # Updated outside the monitor, e.g. by a direct status() call
+            self.pending_futures.discard(f)
+            self.running_futures.discard(f)
+            return None
+        return f
+
+    def _set_future_running(self, f, call_status):
+        f._set_running(call_status)
+        self.running_futures.add(f)
+
+    def _set_future_ready(self, f, call_status):
+        f._set_ready(call_status)
+        self.pending_futures.discard(f)
+        self.running_futures.discard(f)
+
     def _all_ready(self):
         """
-        Checks if all futures are ready, success or done
+        Checks if all futures are ready, success or done. The futures updated
+        outside the monitor are dropped from the pending set when their
+        status event is processed
         """
-        return all([f.ready or f.success or f.done for f in self.futures])
+        return not self.pending_futures
 
     def _check_new_futures(self, call_status, f):
         """Checks if a functions returned new futures to track"""
@@ -98,7 +187,9 @@ class Monitor(threading.Thread):
             return False
 
         f._set_futures(call_status)
-        self.futures.update(f._new_futures)
+        self.pending_futures.discard(f)
+        self.running_futures.discard(f)
+        self._track_futures(f._new_futures)
         logger.debug(
             f'ExecutorID {self.executor_id} - Received {len(f._new_futures)} '
             'new function Futures to track'
@@ -111,7 +202,7 @@ class Monitor(threading.Thread):
         Checks if running futures exceeded the timeout
         """
         current_time = time.time()
-        futures_running = [f for f in futures if f.running and f._call_status]
+        futures_running = [f for f in list(futures) if f.running and f._call_status]
         for fut in futures_running:
             try:
                 start_tstamp = fut._call_status['worker_start_tstamp']
@@ -121,7 +212,7 @@ class Monitor(threading.Thread):
                     raise TimeoutError('HANDLER', msg)
             except TimeoutError:
                 # generate fake TimeoutError call status
-                pickled_exception = str(pickle.dumps(sys.exc_info()))
+                pickled_exception = bytes_to_b64str(pickle.dumps(sys.exc_info()))
                 call_status = {'type': '__end__',
                                'exception': True,
                                'exc_info': pickled_exception,
@@ -131,15 +222,15 @@ class Monitor(threading.Thread):
                                'activation_id': fut.activation_id,
                                'worker_start_tstamp': start_tstamp,
                                'worker_end_tstamp': time.time()}
-                fut._set_ready(call_status)
+                self._set_future_ready(fut, call_status)
 
     def _print_status_log(self, previous_log=None, log_time=None):
         """prints a debug log showing the status of the job"""
         if not self.futures:
             return previous_log, log_time
-        callids_pending = len([f for f in self.futures if f.invoked])
-        callids_running = len([f for f in self.futures if f.running])
-        callids_done = len([f for f in self.futures if f.ready or f.success or f.done])
+        callids_running = len(self.running_futures)
+        callids_pending = len(self.pending_futures) - callids_running
+        callids_done = len(self.futures) - len(self.pending_futures)
         if (callids_pending, callids_running, callids_done) != previous_log or log_time > LOG_INTERVAL:
             logger.debug(f'ExecutorID {self.executor_id} - Pending: {callids_pending} '
                          f'- Running: {callids_running} - Done: {callids_done}')
@@ -147,7 +238,51 @@ class Monitor(threading.Thread):
         return (callids_pending, callids_running, callids_done), log_time
 
 
-class RabbitmqMonitor(Monitor):
+class EventMonitor(Monitor):
+    """
+    Base class of the monitors that receive the call status events pushed
+    by the workers
+    """
+
+    def _tag_future_as_running(self, call_status):
+        """
+        Assigns a call_status to its future
+        """
+        calljob_id = (call_status['executor_id'], call_status['job_id'], call_status['call_id'])
+        f = self._get_pending_future(calljob_id)
+        if f and not f.running:
+            self._set_future_running(f, call_status)
+
+    def _tag_future_as_ready(self, call_status):
+        """
+        tags a future as ready based on call_status
+        """
+        calljob_id = (call_status['executor_id'], call_status['job_id'], call_status['call_id'])
+        f = self._get_pending_future(calljob_id)
+        if f and not self._check_new_futures(call_status, f):
+            self._set_future_ready(f, call_status)
+
+    def _generate_tokens(self, call_status):
+        """
+        generates a new token for the invoker
+        """
+        if not self.generate_tokens or not self.should_run:
+            return
+
+        call_id = (call_status['executor_id'], call_status['job_id'], call_status['call_id'])
+        worker_id = call_status['activation_id']
+        if worker_id not in self.callids_done_worker:
+            self.callids_done_worker[worker_id] = []
+        self.callids_done_worker[worker_id].append(call_id)
+
+        if worker_id not in self.workers_done and \
+                len(self.callids_done_worker[worker_id]) == call_status['chunksize']:
+            self.workers_done.add(worker_id)
+            if self.should_run:
+                self.token_bucket_q.put('#')
+
+
+class RabbitmqMonitor(EventMonitor):
 
     def __init__(
             self,
@@ -203,46 +338,6 @@ class RabbitmqMonitor(Monitor):
         self.should_run = False
         self._delete_resources()
 
-    def _tag_future_as_running(self, call_status):
-        """
-        Assigns a call_status to its future
-        """
-        not_running_futures = [f for f in self.futures if not (f.running or f.ready or f.success or f.done)]
-        for f in not_running_futures:
-            calljob_id = (call_status['executor_id'], call_status['job_id'], call_status['call_id'])
-            if (f.executor_id, f.job_id, f.call_id) == calljob_id:
-                f._set_running(call_status)
-
-    def _tag_future_as_ready(self, call_status):
-        """
-        tags a future as ready based on call_status
-        """
-        not_ready_futures = [f for f in self.futures if not (f.ready or f.success or f.done)]
-        for f in not_ready_futures:
-            calljob_id = (call_status['executor_id'], call_status['job_id'], call_status['call_id'])
-            if (f.executor_id, f.job_id, f.call_id) == calljob_id:
-                if not self._check_new_futures(call_status, f):
-                    f._set_ready(call_status)
-
-    def _generate_tokens(self, call_status):
-        """
-        generates a new token for the invoker
-        """
-        if not self.generate_tokens or not self.should_run:
-            return
-
-        call_id = (call_status['executor_id'], call_status['job_id'], call_status['call_id'])
-        worker_id = call_status['activation_id']
-        if worker_id not in self.callids_done_worker:
-            self.callids_done_worker[worker_id] = []
-        self.callids_done_worker[worker_id].append(call_id)
-
-        if worker_id not in self.workers_done and \
-                len(self.callids_done_worker[worker_id]) == call_status['chunksize']:
-            self.workers_done.append(worker_id)
-            if self.should_run:
-                self.token_bucket_q.put('#')
-
     def run(self):
         logger.debug(f'ExecutorID {self.executor_id} | Starting RabbitMQ job monitor')
         SLEEP_TIME = 2
@@ -269,7 +364,7 @@ class RabbitmqMonitor(Monitor):
             while self.should_run and not self._all_ready():
                 # Format call_ids running, pending and done
                 prevoius_log, log_time = self._print_status_log(previous_log=prevoius_log, log_time=log_time)
-                self._future_timeout_checker(self.futures)
+                self._future_timeout_checker(self.running_futures)
                 time.sleep(SLEEP_TIME)
                 log_time += SLEEP_TIME
 
@@ -282,9 +377,127 @@ class RabbitmqMonitor(Monitor):
         logger.debug(f'ExecutorID {self.executor_id} | RabbitMQ job monitor finished')
 
 
+class RedisMonitor(EventMonitor):
+    """
+    Job monitor that receives the call status events that the workers push
+    to a Redis stream, reading them in batches with blocking XREAD calls
+    """
+
+    READ_BLOCK_MS = 1000
+    READ_COUNT = 1000
+
+    def __init__(
+            self,
+            executor_id,
+            internal_storage,
+            token_bucket_q,
+            job_chunksize,
+            generate_tokens,
+            config
+    ):
+        super().__init__(
+            executor_id,
+            internal_storage,
+            token_bucket_q,
+            job_chunksize,
+            generate_tokens,
+            config
+        )
+
+        self.redis_client = create_redis_client(config)
+        self.stream = get_stream_name(self.executor_id)
+        # Events of the calls whose futures are not tracked yet
+        self.unmatched_events = {}
+        self.lock = threading.Lock()
+
+    def _track_futures(self, fs):
+        with self.lock:
+            super()._track_futures(fs)
+            unmatched_events = self.unmatched_events
+            self.unmatched_events = {}
+            for call_status in unmatched_events.values():
+                self._process_event(call_status)
+
+    def _process_event(self, call_status):
+        """
+        Applies a call status event to its future. Returns False if the
+        future of the call is not tracked yet
+        """
+        calljob_id = (call_status['executor_id'], call_status['job_id'], call_status['call_id'])
+        if calljob_id not in self.futures_index:
+            if self.unmatched_events.get(calljob_id, {}).get('type') != '__end__':
+                self.unmatched_events[calljob_id] = call_status
+            return False
+
+        if call_status['type'] == '__init__':
+            self._tag_future_as_running(call_status)
+
+        elif call_status['type'] == '__end__':
+            self._generate_tokens(call_status)
+            self._tag_future_as_ready(call_status)
+
+        return True
+
+    def stop(self):
+        """
+        Stops the monitor thread
+        """
+        self.should_run = False
+        try:
+            self.redis_client.delete(self.stream)
+        except Exception as e:
+            logger.debug(f'ExecutorID {self.executor_id} - Cannot delete the Redis stream: {e}')
+
+    def run(self):
+        logger.debug(f'ExecutorID {self.executor_id} | Starting Redis job monitor')
+        SLEEP_TIME = 2
+
+        last_id = '0'
+        prevoius_log = None
+        log_time = 0
+        last_check = time.time()
+
+        while self.should_run and not self._all_ready():
+            try:
+                response = self.redis_client.xread(
+                    {self.stream: last_id},
+                    count=self.READ_COUNT,
+                    block=self.READ_BLOCK_MS
+                )
+            except Exception as e:
+                logger.debug(f'ExecutorID {self.executor_id} - Error reading the Redis stream: {e}')
+                time.sleep(SLEEP_TIME)
+                response = []
+
+            event_ids = []
+            with self.lock:
+                for _, events in response:
+                    for event_id, fields in events:
+                        last_id = event_id
+                        status = fields.get(b'status', fields.get('status'))
+                        if self._process_event(json.loads(status)):
+                            event_ids.append(event_id)
+
+            if event_ids:
+                # Each event is consumed once, so keep the stream small. The
+                # events of untracked calls are kept, since they can belong to
+                # a job whose futures are tracked by the next monitor
+                self.redis_client.xdel(self.stream, *event_ids)
+
+            if time.time() - last_check >= SLEEP_TIME:
+                prevoius_log, log_time = self._print_status_log(previous_log=prevoius_log, log_time=log_time)
+                self._future_timeout_checker(self.running_futures)
+                log_time += time.time() - last_check
+                last_check = time.time()
+
+        self._print_status_log()
+        logger.debug(f'ExecutorID {self.executor_id} | Redis job monitor finished')
+
+
 class StorageMonitor(Monitor):
 
     THREADPOOL_SIZE = 64
+    REQUERY_SIZE = 64
 
     def __init__(
             self,
@@ -305,17 +518,22 @@ class StorageMonitor(Monitor):
         )
 
         self.monitoring_interval = config['monitoring_interval']
+        # Listed status and listing cursors of the jobs, see get_job_status()
+        self.job_status = {}
 
         # vars for _generate_tokens
         self.callids_running_worker = {}
         self.callids_running_processed = set()
         self.callids_done_processed = set()
+        self.workers_to_check = set()
 
         # vars for _mark_status_as_running
         self.callids_running_processed_timeout = set()
 
         # vars for _mark_status_as_ready
         self.callids_done_processed_status = set()
+        self.callids_done_to_query = set()
+        self.futures_to_requery = deque()
 
     def stop(self):
         """
@@ -328,44 +546,66 @@ class StorageMonitor(Monitor):
         Mark which futures are in running status based on callids_running
         """
         current_time = time.time()
-        not_running_futures = [f for f in self.futures if not (f.running or f.ready or f.success or f.done)]
         callids_running_to_process = callids_running - self.callids_running_processed_timeout
-        for f in not_running_futures:
-            for call in callids_running_to_process:
-                if f.invoked and (f.executor_id, f.job_id, f.call_id) == call[0]:
-                    call_status = {'type': '__init__',
-                                   'activation_id': call[1],
-                                   'worker_start_tstamp': current_time}
-                    f._set_running(call_status)
+        for callid, activation_id in callids_running_to_process:
+            f = self._get_pending_future(callid)
+            if f and f.invoked:
+                call_status = {'type': '__init__',
+                               'activation_id': activation_id,
+                               'worker_start_tstamp': current_time}
+                self._set_future_running(f, call_status)
 
         self.callids_running_processed_timeout.update(callids_running_to_process)
-        self._future_timeout_checker(self.futures)
+        self._future_timeout_checker(self.running_futures)
+
+    def _get_futures_to_requery(self):
+        """
+        Returns the next REQUERY_SIZE pending futures, in turns
+        """
+        fs = []
+        refilled = False
+        while len(fs) < self.REQUERY_SIZE:
+            if not self.futures_to_requery:
+                if refilled:
+                    break
+                self.futures_to_requery.extend(self.pending_futures)
+                refilled = True
+                continue
+            f = self.futures_to_requery.popleft()
+            if f in self.pending_futures and not (f.ready or f.success or f.done):
+                fs.append(f)
+        return fs
 
     def _tag_future_as_ready(self, callids_done):
         """
         Mark which futures has a call_status ready to be downloaded
         """
-        not_ready_futures = [f for f in self.futures if not (f.ready or f.success or f.done)]
-        callids_done_to_process = callids_done - self.callids_done_processed_status
-        fs_to_query = []
+        # The listed calls whose status is not downloaded yet are queried
+        # again in the next polls
+        self.callids_done_to_query.update(callids_done - self.callids_done_processed_status)
+        fs_to_query = set()
+        for callid in list(self.callids_done_to_query):
+            f = self._get_pending_future(callid)
+            if f:
+                fs_to_query.add(f)
+            else:
+                self.callids_done_to_query.discard(callid)
 
+        # The last calls are also queried directly, in case their status is
+        # not listed yet, a few of them in each poll
         ten_percent = int(len(self.futures) * (10 / 100))
-        if len(self.futures) - len(callids_done) <= max(10, ten_percent):
-            fs_to_query = not_ready_futures
-        else:
-            for f in not_ready_futures:
-                if (f.executor_id, f.job_id, f.call_id) in callids_done_to_process:
-                    fs_to_query.append(f)
+        if len(self.pending_futures) <= max(10, ten_percent):
+            fs_to_query.update(self._get_futures_to_requery())
 
         if not fs_to_query:
             return
 
         def get_status(f):
-            cs = self.internal_storage.get_call_status(f.executor_id, f.job_id, f.call_id)
+            cs = self.internal_storage.get_call_status(f.executor_id, f.job_id, f.call_id, f.status_manifest)
             f._status_query_count += 1
             if cs:
                 if not self._check_new_futures(cs, f):
-                    f._set_ready(cs)
+                    self._set_future_ready(f, cs)
                 return (f.executor_id, f.job_id, f.call_id)
             else:
                 return None
@@ -384,6 +624,7 @@ class StorageMonitor(Monitor):
 
         try:
             self.callids_done_processed_status.update(call_ids_processed)
+            self.callids_done_to_query.difference_update(call_ids_processed)
         except Exception:
             pass
 
@@ -409,15 +650,19 @@ class StorageMonitor(Monitor):
                 if worker_id not in self.callids_done_worker:
                     self.callids_done_worker[worker_id] = []
                 self.callids_done_worker[worker_id].append(callid_done)
+                self.workers_to_check.add(worker_id)
 
-        for worker_id in self.callids_done_worker:
+        # Only the workers with new finished calls, or of jobs that were
+        # not present yet, can have finished since the previous poll
+        for worker_id in list(self.workers_to_check):
             job_id = self.callids_done_worker[worker_id][0][1]
             if job_id not in self.present_jobs:
                 continue
+            self.workers_to_check.discard(worker_id)
             chunksize = self.job_chunksize[job_id]
             if worker_id not in self.workers_done and \
                     len(self.callids_done_worker[worker_id]) == chunksize:
-                self.workers_done.append(worker_id)
+                self.workers_done.add(worker_id)
                 if self.should_run:
                     self.token_bucket_q.put('#')
                 else:
@@ -426,6 +671,27 @@ class StorageMonitor(Monitor):
         self.callids_running_processed.update(callids_running_to_process)
         self.callids_done_processed.update(callids_done_to_process)
 
+    def _process_callids(self):
+        """
+        Lists the new running and done calls, and tags their futures.
+        Returns the new done call IDs
+        """
+        callids_running, callids_done = self.internal_storage.get_job_status(
+            self.executor_id, self._get_job_ranges(), self.job_status
+        )
+        for callid in callids_done:
+            f = self.futures_index.get(callid)
+            if f:
+                self._remove_unlisted_future(f)
+        # verify if there are new callids_done and reduce the sleep
+        new_callids_done = callids_done - self.callids_done_processed_status
+        # generate tokens and mark futures as running/done
+        self._generate_tokens(callids_running, callids_done)
+        self._tag_future_as_running(callids_running)
+        self._tag_future_as_ready(callids_done)
+
+        return new_callids_done
+
     def run(self):
         """
         Run method
@@ -438,13 +704,7 @@ class StorageMonitor(Monitor):
 
         def process_callids():
             nonlocal previous_log, log_time
-            callids_running, callids_done = self.internal_storage.get_job_status(self.executor_id)
-            # verify if there are new callids_done and reduce the sleep
-            new_callids_done = callids_done - self.callids_done_processed_status
-            # generate tokens and mark futures as running/done
-            self._generate_tokens(callids_running, callids_done)
-            self._tag_future_as_running(callids_running)
-            self._tag_future_as_ready(callids_done)
+            new_callids_done = self._process_callids()
             previous_log, log_time = self._print_status_log(previous_log, log_time)
 
             return new_callids_done
@@ -95,7 +95,7 @@ def export_execution_details(futures, lithops_executor):
             plots_file_name = '{}_{}'.format(lithops_executor.executor_id, job_id)
             lithops_executor.plot(fs=futures, dst=os.path.join(path, plots_file_name))
 
-            stats = {fut.call_id: fut.stats for fut in futures}
+            stats = {fut.call_id: dict(fut.stats) for fut in futures}
             stats_file_name = '{}_{}_stats.json'.format(lithops_executor.executor_id, job_id)
             with open(os.path.join(path, stats_file_name), 'w') as stats_file:
                 stats_json = json.dumps(stats, indent=4)
@@ -31,7 +31,7 @@ logger = logging.getLogger(__name__)
 
 
 def create_timeline(fs, dst, figsize=(10, 6)):
-    stats = [f.stats for f in fs]
+    stats = [dict(f.stats) for f in fs]
     host_job_create_tstamp = min([cm['host_job_create_tstamp'] for cm in stats])
 
     stats_df = pd.DataFrame(stats)
@@ -101,7 +101,7 @@ def create_timeline(fs, dst, figsize=(10, 6)):
 
 
 def create_histogram(fs, dst, figsize=(10, 6)):
-    stats = [f.stats for f in fs]
+    stats = [dict(f.stats) for f in fs]
     host_job_create_tstamp = min([cm['host_job_create_tstamp'] for cm in stats])
 
     total_calls = len(stats)
@@ -0,0 +1,163 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import queue
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def create_scheduler(name):
+    """
+    Creates the scheduler of the pending calls of the FaaS invoker
+    """
+    if name == 'fifo':
+        return FIFOScheduler()
+    elif name == 'fair':
+        return FairShareScheduler()
+    else:
+        raise ValueError(f"Unknown invoker scheduler '{name}'. Use one of: fifo, fair")
+
+
+def set_queue_wait_time(job, call_ids_range, wait_time):
+    """
+    Adds the time that a range of calls waited in the scheduler to the
+    stats of their futures
+    """
+    futures = getattr(job, 'futures', None)
+    if not futures:
+        return
+    first_call = int(futures[0].call_id)
+    for call_id in call_ids_range:
+        stats = futures[call_id - first_call].stats
+        stats['host_queue_wait_time'] = round(stats.get('host_queue_wait_time', 0) + wait_time, 6)
+
+
+class FIFOScheduler:
+    """
+    Invokes the pending calls in the same order they were submitted
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def put(self, item):
+        """
+        Adds a (job, call_ids_range) tuple to the scheduler
+        """
+        self._queue.put((item, time.time()))
+
+    def get(self, block=True):
+        """
+        Returns the next (job, call_ids_range) tuple to invoke
+        """
+        (job, call_ids_range), put_tstamp = self._queue.get(block)
+        if job is not None:
+            set_queue_wait_time(job, call_ids_range, time.time() - put_tstamp)
+        return job, call_ids_range
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def empty(self):
+        return self._queue.empty()
+
+
+class FairShareScheduler:
+    """
+    Shares the invocations among the jobs with pending calls, so that a
+    small job submitted after a large one does not wait for all the calls
+    of the large job.
+
+    Each job has a weight of 2 ** job.priority, and the scheduler always
+    invokes the calls of the job with the lowest number of invoked calls
+    divided by its weight, so a job with priority 1 gets twice the
+    invocations of a job with priority 0. Jobs with a deadline hint are
+    invoked before the rest, earliest deadline first.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._sentinels = deque()
+        self._size = 0
+        self._min_vtime = 0
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        """
+        Adds a (job, call_ids_range) tuple to the scheduler
+        """
+        job, call_ids_range = item
+
+        with self._cond:
+            if job is None:
+                self._sentinels.append(item)
+            else:
+                if job.job_key not in self._jobs:
+                    # A new job starts with the virtual time of the last
+                    # invoked job, so it gets no credit for the past
+                    self._jobs[job.job_key] = {
+                        'job': job,
+                        'calls': deque(),
+                        'vtime': self._min_vtime,
+                        'weight': 2 ** getattr(job, 'priority', 0),
+                        'deadline': getattr(job, 'deadline', None)
+                    }
+                self._jobs[job.job_key]['calls'].append((call_ids_range, time.time()))
+            self._size += 1
+            self._cond.notify()
+
+    def _next_job(self):
+        deadline_jobs = [j for j in self._jobs.values() if j['deadline'] is not None]
+        if deadline_jobs:
+            return min(deadline_jobs, key=lambda j: j['deadline'])
+        return min(self._jobs.values(), key=lambda j: j['vtime'])
+
+    def get(self, block=True):
+        """
+        Returns the next (job, call_ids_range) tuple to invoke
+        """
+        with self._cond:
+            while self._size == 0:
+                if not block:
+                    raise queue.Empty
+                self._cond.wait()
+
+            self._size -= 1
+            if self._sentinels:
+                return self._sentinels.popleft()
+
+            sched_job = self._next_job()
+            call_ids_range, put_tstamp = sched_job['calls'].popleft()
+            sched_job['vtime'] += len(call_ids_range) / sched_job['weight']
+            if sched_job['deadline'] is None:
+                self._min_vtime = sched_job['vtime']
+            if not sched_job['calls']:
+                del self._jobs[sched_job['job'].job_key]
+
+        job = sched_job['job']
+        set_queue_wait_time(job, call_ids_range, time.time() - put_tstamp)
+
+        return job, call_ids_range
+
+    def qsize(self):
+        return self._size
+
+    def empty(self):
+        return self._size == 0
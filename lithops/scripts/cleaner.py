@@ -23,6 +23,7 @@ from concurrent.futures import ThreadPoolExecutor
 
 from lithops.storage import Storage
 from lithops.storage.utils import clean_bucket
+from lithops.job.function_cache import FunctionCache
 from lithops.constants import JOBS_PREFIX, TEMP_PREFIX, CLEANER_DIR, \
     CLEANER_PID_FILE, CLEANER_LOG_FILE
 
@@ -105,6 +106,12 @@ def clean_functions(functions_data):
     key_list = storage.list_keys(storage.bucket, prefix)
     storage.delete_objects(storage.bucket, key_list)
 
+    if 'function_cache_ttl' in data:
+        function_cache = FunctionCache(storage, data['function_cache_ttl'])
+        function_cache.release(executor_id)
+        purged = function_cache.purge()
+        logger.info(f'Purged {len(purged)} expired functions from the function cache')
+
     if os.path.exists(file_location):
         os.remove(file_location)
     logger.info('Finished')
@@ -17,6 +17,7 @@
 
 
 import os
+import gzip
 import time
 import click
 import logging
@@ -47,9 +48,12 @@ from lithops.config import (
 )
 from lithops.constants import (
     CACHE_DIR,
+    DEPENDENCY_CACHE_DIR,
     LITHOPS_TEMP_DIR,
     RUNTIMES_PREFIX,
     JOBS_PREFIX,
+    FUNCTIONS_PREFIX,
+    RESULTS_PREFIX,
     LOCALHOST,
     SERVERLESS,
     STANDALONE,
@@ -59,7 +63,7 @@ from lithops.constants import (
 )
 from lithops.storage import InternalStorage
 from lithops.serverless import ServerlessHandler
-from lithops.storage.utils import clean_bucket
+from lithops.storage.utils import clean_bucket, logs_key_suffix
 from lithops.standalone import StandaloneHandler
 from lithops.localhost import LocalhostHandler
 
@@ -132,11 +136,17 @@ def clean(config, backend, storage, debug, region, all):
     jobs_path = JOBS_PREFIX
     clean_bucket(storage, storage.bucket, runtimes_path, sleep=1)
     clean_bucket(storage, storage.bucket, jobs_path, sleep=1)
+    clean_bucket(storage, storage.bucket, FUNCTIONS_PREFIX, sleep=1)
+    clean_bucket(storage, storage.bucket, RESULTS_PREFIX, sleep=1)
 
     # Clean localhost executor temp dirs
     shutil.rmtree(LITHOPS_TEMP_DIR, ignore_errors=True)
     # Clean local lithops runtime cache
     shutil.rmtree(os.path.join(CACHE_DIR, RUNTIMES_PREFIX, backend), ignore_errors=True)
+    # Clean local function cache index
+    shutil.rmtree(os.path.join(CACHE_DIR, FUNCTIONS_PREFIX, storage.backend, storage.bucket), ignore_errors=True)
+    # Clean local module dependency cache
+    shutil.rmtree(DEPENDENCY_CACHE_DIR, ignore_errors=True)
 
     logger.info('All Lithops temporary data cleaned')
 
@@ -435,15 +445,32 @@ def poll():
 
 @logs.command('get')
 @click.argument('job_key')
-def get_logs(job_key):
+@click.option('--full', '-f', is_flag=True, help='get the full logs uploaded by the workers')
+@click.option('--config', '-c', default=None, help='path to yaml config file', type=click.Path(exists=True))
+@click.option('--backend', '-b', default=None, help='storage backend')
+def get_logs(job_key, full, config, backend):
     log_file = os.path.join(LOGS_DIR, job_key + '.log')
 
-    if not os.path.isfile(log_file):
+    if not full and os.path.isfile(log_file):
+        with open(log_file, 'r') as content_file:
+            print(content_file.read())
+        return
+
+    # The full logs are only uploaded on request or on error, next to the
+    # other objects of the job, until the job is cleaned
+    config = load_yaml_config(config) if config else None
+    storage = Storage(config=config, backend=backend)
+    keys = storage.list_keys(storage.bucket, '/'.join([JOBS_PREFIX, job_key, '']))
+    keys = [key for key in keys if key.endswith('/' + logs_key_suffix)]
+
+    if not keys:
         print('The execution id: {} does not exists in logs'.format(job_key))
         return
 
-    with open(log_file, 'r') as content_file:
-        print(content_file.read())
+    for key in sorted(keys):
+        call_id = key.split('/')[-2]
+        logs = gzip.decompress(storage.get_object(storage.bucket, key)).decode(errors='replace')
+        print(f"Call: '{call_id}'\n[\n{logs}]\n")
 
 
 # /---------------------------------------------------------------------------/
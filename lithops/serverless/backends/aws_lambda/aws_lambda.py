@@ -659,6 +659,45 @@ class AWSLambdaBackend:
         #     else:
         #         raise Exception(response)
 
+    async def invoke_async(self, runtime_name, runtime_memory, payload, session):
+        """
+        Invoke lambda function asynchronously using a shared aiohttp session
+        @param runtime_name: name of the runtime
+        @param runtime_memory: memory of the runtime in MB
+        @param payload: invoke dict payload
+        @param session: aiohttp client session
+        @return: invocation ID
+        """
+        function_name = self._format_function_name(runtime_name, runtime_memory)
+
+        headers = {'Host': self.host, 'X-Amz-Invocation-Type': 'Event', 'User-Agent': self.user_agent}
+        url = f'https://{self.host}/2015-03-31/functions/{function_name}/invocations'
+        request = AWSRequest(method="POST", url=url, data=json.dumps(payload, default=str), headers=headers)
+        SigV4Auth(self.credentials, "lambda", self.region).add_auth(request)
+
+        try:
+            async with session.post(url, data=request.body, headers=dict(request.headers)) as r:
+                status = r.status
+                text = await r.text()
+                request_id = r.headers.get('x-amzn-RequestId')
+        except Exception as e:
+            logger.debug(f'Invocation failed: {e}')
+            return None
+
+        if status == 202:
+            return request_id
+        elif status == 429:
+            return None
+        elif status == 401:
+            logger.debug(text)
+            raise Exception('Unauthorized - Invalid API Key')
+        elif status == 404:
+            logger.debug(text)
+            raise Exception(f'Lithops Runtime: {runtime_name} not deployed')
+        else:
+            logger.debug(text)
+            raise Exception(f'Error {status}: {text}')
+
     def get_runtime_key(self, runtime_name, runtime_memory, version=__version__):
         """
         Method that creates and returns the runtime key.
@@ -15,6 +15,7 @@
 #
 
 import os
+import asyncio
 import logging
 from threading import Lock
 
@@ -334,6 +335,23 @@ class IBMCloudFunctionsBackend:
 
         return activation_id
 
+    async def invoke_async(self, docker_image_name, runtime_memory, payload, session):
+        """
+        Invoke using a shared aiohttp session -- return information about this invocation
+        """
+        self._get_or_create_namespace()
+        action_name = self._format_function_name(docker_image_name, runtime_memory)
+
+        activation_id = await self.cf_client.invoke_async(session, self.package, action_name, payload)
+
+        if activation_id in (401, 404):
+            # Token expired or runtime not deployed. Retry with the blocking
+            # invoke, which refreshes the client or deploys the runtime
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.invoke, docker_image_name, runtime_memory, payload)
+
+        return activation_id
+
     def get_runtime_key(self, docker_image_name, runtime_memory, version=__version__):
         """
         Method that creates and returns the runtime key.
@@ -17,6 +17,7 @@
 import os
 import ssl
 import json
+import asyncio
 import time
 import yaml
 import base64
@@ -127,6 +128,8 @@ class KnativeServingBackend:
             self.service_host_suffix = self.kn_config['service_host_suffix']
         if self.service_host_suffix is not None:
             logger.debug(f'Loaded service host suffix: {self.service_host_suffix}')
+        # Service hosts resolved by invoke_async()
+        self._service_hosts = {}
 
         logger.info(f'{COMPUTE_CLI_MSG.format("Knative")} - Cluster: {self.cluster}')
 
@@ -709,6 +712,50 @@ class KnativeServingBackend:
             logger.debug('ExecutorID {} | JobID {} - Function call {} failed ({}). Retrying request'
                          .format(exec_id, job_id, ', '.join(call_ids), resp_status))
 
+    async def invoke_async(self, runtime_name, memory, payload, session):
+        """
+        Invoke using a shared aiohttp session -- return information about this invocation
+        """
+        service_name = self._format_service_name(runtime_name, memory)
+        if self.service_host_suffix:
+            service_host = service_name + self.service_host_suffix
+        else:
+            # The kubernetes client blocks, so the service host is resolved
+            # once per service in a thread, out of the event loop
+            if service_name not in self._service_hosts:
+                loop = asyncio.get_running_loop()
+                self._service_hosts[service_name] = await loop.run_in_executor(
+                    None, self._get_service_host, service_name)
+            service_host = self._service_hosts[service_name]
+
+        headers = {}
+
+        if self.ingress_endpoint:
+            headers['Host'] = service_host
+            endpoint = self.ingress_endpoint
+        else:
+            endpoint = f'http://{service_host}'
+
+        if 'codeengine' in endpoint:
+            endpoint = endpoint.replace('http://', 'https://')
+
+        route = payload.get("service_route", '/')
+        url = endpoint.rstrip('/') + route
+
+        async with session.post(url, data=json.dumps(payload, default=str),
+                                headers=headers, ssl=False) as resp:
+            resp_status = resp.status
+            resp_data = await resp.text()
+
+        if resp_status in [200, 202]:
+            return json.loads(resp_data)["activationId"]
+        elif resp_status == 404:
+            raise Exception("Lithops runtime is not deployed in your k8s cluster")
+        else:
+            logger.debug('ExecutorID {} | JobID {} - Function call {} failed ({}). Retrying request'
+                         .format(payload.get('executor_id'), payload.get('job_id'),
+                                 ', '.join(payload.get('call_ids') or []), resp_status))
+
     def get_runtime_key(self, runtime_name, runtime_memory, version=__version__):
         """
         Method that creates and returns the runtime key.
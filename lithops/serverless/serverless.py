@@ -69,6 +69,21 @@ class ServerlessHandler:
 
         return self.backend.invoke(runtime_name, runtime_memory, job_payload)
 
+    def supports_async_invoke(self):
+        """
+        Returns True if the backend implements the invoke_async() method
+        """
+        return hasattr(self.backend, 'invoke_async')
+
+    async def invoke_async(self, job_payload, session):
+        """
+        Invoke using a shared aiohttp session -- return information about this invocation
+        """
+        runtime_name = job_payload['runtime_name']
+        runtime_memory = job_payload['runtime_memory']
+
+        return await self.backend.invoke_async(runtime_name, runtime_memory, job_payload, session)
+
     def build_runtime(self, runtime_name, file, extra_args=[]):
         """
         Wrapper method to build a new runtime for the compute backend.
@@ -225,10 +225,10 @@ class GCPStorageBackend:
             raise StorageNoSuchKeyError(bucket_name, '')
         return [{'Key': blob.name, 'Size': blob.size, 'LastModified': blob.updated} for blob in page]
 
-    def list_keys(self, bucket_name, prefix=None):
+    def list_keys(self, bucket_name, prefix=None, start_after=None):
         try:
             bucket = self.client.get_bucket(bucket_name, timeout=TIMEOUT)
-            page = bucket.list_blobs(prefix=prefix)
+            page = bucket.list_blobs(prefix=prefix, start_offset=start_after)
         except google_exceptions.ClientError:
             raise StorageNoSuchKeyError(bucket_name, '')
-        return [blob.name for blob in page]
+        return [blob.name for blob in page if not start_after or blob.name > start_after]
@@ -235,11 +235,12 @@ class LocalhostStorageBackend:
 
         return obj_list
 
-    def list_keys(self, bucket_name, prefix=None):
+    def list_keys(self, bucket_name, prefix=None, start_after=None):
         """
         Return a list of keys for the given prefix.
         :param bucket_name: Name of the bucket.
         :param prefix: Prefix to filter object names.
+        :param start_after: Only return the keys after this key.
         :return: List of keys in bucket that match the given prefix.
         :rtype: list of str
         """
@@ -262,4 +263,7 @@ class LocalhostStorageBackend:
                 if os.path.isfile(file_name):
                     key_list.append(file_name.replace(base_dir, '').replace('\\', '/'))
 
+        if start_after:
+            key_list = [key for key in key_list if key > start_after]
+
         return key_list
@@ -278,18 +278,22 @@ class MinioStorageBackend:
             else:
                 raise e
 
-    def list_keys(self, bucket_name, prefix=None):
+    def list_keys(self, bucket_name, prefix=None, start_after=None):
         """
         Return a list of keys for the given prefix.
         :param bucket_name: Name of the bucket.
         :param prefix: Prefix to filter object names.
+        :param start_after: Only return the keys after this key.
         :return: List of keys in bucket that match the given prefix.
         :rtype: list of str
         """
         try:
             prefix = '' if prefix is None else prefix
             paginator = self.s3_client.get_paginator('list_objects_v2')
-            page_iterator = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+            if start_after:
+                page_iterator = paginator.paginate(Bucket=bucket_name, Prefix=prefix, StartAfter=start_after)
+            else:
+                page_iterator = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
 
             key_list = []
             for page in page_iterator:
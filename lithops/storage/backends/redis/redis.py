@@ -120,10 +120,11 @@ class RedisBackend:
         if key is None:
             key = os.path.basename(file_name)
 
-        # Upload the file
+        # Upload the file. put_object() does not accept files, and Redis
+        # keeps the whole value in memory anyway
         try:
             with open(file_name, 'rb') as in_file:
-                self.put_object(bucket, key, in_file)
+                self.put_object(bucket, key, in_file.read())
         except Exception as e:
             logging.error(e)
             return False
@@ -20,12 +20,13 @@ from functools import partial
 from lithops.storage import Storage
 from lithops.utils import is_lithops_worker
 from lithops.config import default_storage_config, load_yaml_config, extract_storage_config
-from lithops.constants import JOBS_PREFIX, TEMP_PREFIX, LOGS_PREFIX, RUNTIMES_PREFIX
+from lithops.constants import JOBS_PREFIX, TEMP_PREFIX, LOGS_PREFIX, RUNTIMES_PREFIX, \
+    FUNCTIONS_PREFIX, RESULTS_PREFIX
 
 
 def remove_lithops_keys(keys):
     return list(filter(lambda key: not any([key.startswith(prefix) for prefix in [
-                JOBS_PREFIX, TEMP_PREFIX, LOGS_PREFIX, RUNTIMES_PREFIX]]), keys))
+                JOBS_PREFIX, TEMP_PREFIX, LOGS_PREFIX, RUNTIMES_PREFIX, FUNCTIONS_PREFIX, RESULTS_PREFIX]]), keys))
 
 
 #
@@ -89,7 +90,7 @@ class CloudFileProxy:
         names = set()
         for p in paths:
             if any([p.startswith(prefix) for prefix in [
-                   JOBS_PREFIX, TEMP_PREFIX, LOGS_PREFIX, RUNTIMES_PREFIX]]):
+                   JOBS_PREFIX, TEMP_PREFIX, LOGS_PREFIX, RUNTIMES_PREFIX, FUNCTIONS_PREFIX, RESULTS_PREFIX]]):
                 continue
             p = p[len(prefix):] if p.startswith(prefix) else p
             if p.startswith('/'):
@@ -17,13 +17,17 @@
 
 import os
 import json
+import time
+import inspect
 import logging
 import itertools
 import importlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Union, Tuple, Dict, TextIO, BinaryIO, Any
 
 from lithops.constants import CACHE_DIR, RUNTIMES_PREFIX, JOBS_PREFIX, TEMP_PREFIX
 from lithops.utils import is_lithops_worker
+from lithops.util.codecs import decompress
 from lithops.storage import utils
 from lithops.config import extract_storage_config, default_storage_config
 
@@ -233,17 +237,25 @@ class Storage:
 
         return self.storage_handler.list_objects(bucket, prefix, match_pattern)
 
-    def list_keys(self, bucket, prefix=None) -> List[str]:
+    def list_keys(self, bucket, prefix=None, start_after=None) -> List[str]:
         """
         Similar to list_objects(), it returns all of the object keys in a bucket.
         For each object, the list contains only the names of the objects (keys).
 
         :param bucket: Name of the bucket
         :param prefix: Key prefix for filtering
+        :param start_after: Only return the keys that sort after this key. The backends
+                that do not support it natively list all the keys and filter them
 
         :return: List of object keys
         """
-        return self.storage_handler.list_keys(bucket, prefix)
+        if not start_after:
+            return self.storage_handler.list_keys(bucket, prefix)
+
+        if 'start_after' in inspect.signature(self.storage_handler.list_keys).parameters:
+            return self.storage_handler.list_keys(bucket, prefix, start_after=start_after)
+
+        return [key for key in self.storage_handler.list_keys(bucket, prefix) if key > start_after]
 
     def put_cloudobject(self,
                         body: Union[str,
@@ -333,6 +345,7 @@ class InternalStorage:
     An InternalStorage object is used by executors and other components to access
     underlying storage backend without exposing the the implementation details.
     """
+    MANIFEST_LIST_INTERVAL = 10  # seconds
 
     def __init__(self, storage_config):
         """ Creates an InternalStorage instance
@@ -351,6 +364,16 @@ class InternalStorage:
 
         self.storage.create_bucket(self.bucket)
 
+        # Listed status of the calls and listing cursors of get_job_status()
+        self._job_status = {}
+        # Executors whose status is listed by get_job_status()
+        self._listed_executors = set()
+        # Call statuses of the status manifests written by the workers
+        self._manifest_keys = {}
+        self._manifest_status = {}
+        # Last listing of the manifests of each job by get_call_status()
+        self._manifest_list_tstamps = {}
+
     def get_client(self):
         """
         Retrieves the underlying storage client.
@@ -374,6 +397,19 @@ class InternalStorage:
         """
         return self.storage.put_object(self.bucket, key, data)
 
+    def put_data_file(self, key, file_name):
+        """
+        Put data object into storage from a local file, using a multipart
+        upload if the storage backend supports it.
+        :param key: data key
+        :param file_name: path of the local file
+        :return: None
+        """
+        if not self.storage.upload_file(file_name, self.bucket, key):
+            # Stream the file, so it is not loaded in memory
+            with open(file_name, 'rb') as f:
+                self.storage.put_object(self.bucket, key, f)
+
     def put_func(self, key, func):
         """
         Put serialized function into storage.
@@ -408,15 +444,10 @@ class InternalStorage:
         """
         return self.storage.delete_object(self.bucket, key)
 
-    def get_job_status(self, executor_id):
+    def _parse_status_keys(self, keys):
         """
-        Get the status of a callset.
-        :param executor_id: executor's ID
-        :return: A list of call IDs that have updated status.
+        Returns the running and done call IDs of a list of job keys
         """
-        callset_prefix = '/'.join([JOBS_PREFIX, executor_id])
-        keys = self.storage.list_keys(self.bucket, callset_prefix)
-
         running_keys = [k.split('/')
                         for k in keys if utils.init_key_suffix in k]
         running_callids = [(tuple(k[1].rsplit("-", 1) + [k[2]]),
@@ -427,21 +458,125 @@ class InternalStorage:
                      for k in keys if utils.status_key_suffix in k]
         done_callids = [tuple(k[0].rsplit("-", 1) + [k[1]]) for k in done_keys]
 
-        return set(running_callids), set(done_callids)
+        return running_callids, done_callids
 
-    def get_call_status(self, executor_id, job_id, call_id):
+    def _load_manifests(self, keys):
+        """
+        Downloads the status manifests of a list of job keys that are not
+        loaded yet, and returns the call IDs whose status they contain
+        """
+        manifest_keys = [k for k in keys if k.endswith(utils.manifest_key_suffix)]
+        keys_to_load = [k for k in manifest_keys if k not in self._manifest_keys]
+
+        def get_manifest(key):
+            data = self.storage.get_object(self.bucket, key)
+            return key, json.loads(bytes(decompress(data)).decode('ascii'))
+
+        if keys_to_load:
+            with ThreadPoolExecutor(max_workers=min(len(keys_to_load), 32)) as executor:
+                for key, manifest in executor.map(get_manifest, keys_to_load):
+                    callids = []
+                    for status in manifest['statuses']:
+                        callid = (status['executor_id'], status['job_id'], status['call_id'])
+                        self._manifest_status[callid] = status
+                        callids.append(callid)
+                    self._manifest_keys[key] = callids
+
+        return [callid for key in manifest_keys for callid in self._manifest_keys[key]]
+
+    def get_job_status(self, executor_id, job_ranges=None, job_status=None):
+        """
+        Get the status of a callset.
+        :param executor_id: executor's ID
+        :param job_ranges: Optional dict of job_id -> (first, last + 1) call IDs. When
+                set, each job prefix is listed in parallel, starting after the calls that
+                are already known to be done, and only the call IDs that were not returned
+                by the previous calls are returned. The status of the jobs left out of
+                job_ranges is discarded
+        :param job_status: Optional dict in which the listed status and the cursor of
+                each job are kept between calls. Defaults to a dict of the executor
+        :return: A list of call IDs that have updated status.
+        """
+        self._listed_executors.add(executor_id)
+
+        if job_ranges is None:
+            callset_prefix = '/'.join([JOBS_PREFIX, executor_id])
+            keys = self.storage.list_keys(self.bucket, callset_prefix)
+            running_callids, done_callids = self._parse_status_keys(keys)
+            done_callids.extend(self._load_manifests(keys))
+            return set(running_callids), set(done_callids)
+
+        if job_status is None:
+            job_status = self._job_status.setdefault(executor_id, {})
+
+        # The jobs whose calls are all listed as done are not listed anymore
+        for job_id in set(job_status) - set(job_ranges):
+            del job_status[job_id]
+
+        # The cursor of a job is the first call that is not known to be done.
+        # All the keys of the previous calls are already processed.
+        jobs_to_list = []
+        for job_id, (first_call, last_call) in job_ranges.items():
+            status = job_status.setdefault(job_id, {'running': set(), 'done': set(), 'cursor': first_call})
+            cursor = status['cursor']
+            while cursor < last_call and (executor_id, job_id, f'{cursor:05d}') in status['done']:
+                cursor += 1
+            status['cursor'] = cursor
+            if cursor < last_call:
+                jobs_to_list.append((job_id, cursor, last_call))
+
+        def list_job_keys(job):
+            job_id, cursor, last_call = job
+            job_prefix = '/'.join([JOBS_PREFIX, utils.create_job_key(executor_id, job_id), ''])
+            start_after = job_prefix + utils.get_min_call_id(cursor, last_call)
+            return job_id, self.storage.list_keys(self.bucket, job_prefix, start_after=start_after)
+
+        new_running_callids = set()
+        new_done_callids = set()
+
+        if jobs_to_list:
+            with ThreadPoolExecutor(max_workers=min(len(jobs_to_list), 32)) as executor:
+                for job_id, keys in executor.map(list_job_keys, jobs_to_list):
+                    status = job_status[job_id]
+                    running_callids, done_callids = self._parse_status_keys(keys)
+                    done_callids.extend(self._load_manifests(keys))
+                    new_running_callids.update(set(running_callids) - status['running'])
+                    new_done_callids.update(set(done_callids) - status['done'])
+                    status['running'].update(running_callids)
+                    status['done'].update(done_callids)
+
+        return new_running_callids, new_done_callids
+
+    def get_call_status(self, executor_id, job_id, call_id, status_manifest=False):
         """
         Get status of a call.
         :param executor_id: executor ID of the call
         :param call_id: call ID of the call
+        :param status_manifest: if the status can be in a status manifest
         :return: A dictionary containing call's status, or None if no updated status
         """
+        callid = (executor_id, job_id, call_id)
+        if callid in self._manifest_status:
+            return self._manifest_status[callid]
+
         status_key = utils.create_status_key(executor_id, job_id, call_id)
         try:
             data = self.storage.get_object(self.bucket, status_key)
-            return json.loads(data.decode('ascii'))
+            return json.loads(bytes(decompress(data)).decode('ascii'))
         except utils.StorageNoSuchKeyError:
-            return None
+            pass
+
+        if status_manifest and executor_id not in self._listed_executors:
+            # The status can be in a manifest that get_job_status() did not
+            # load. Each job is listed once, and again only after an interval
+            # in case the call is still running
+            job_key = utils.create_job_key(executor_id, job_id)
+            if time.time() - self._manifest_list_tstamps.get(job_key, 0) > self.MANIFEST_LIST_INTERVAL:
+                self._manifest_list_tstamps[job_key] = time.time()
+                job_prefix = '/'.join([JOBS_PREFIX, job_key, ''])
+                self._load_manifests(self.storage.list_keys(self.bucket, job_prefix))
+
+        return self._manifest_status.get(callid)
 
     def get_call_output(self, executor_id, job_id, call_id):
         """
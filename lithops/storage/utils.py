@@ -18,7 +18,7 @@
 import os
 import time
 import logging
-from lithops.constants import JOBS_PREFIX
+from lithops.constants import JOBS_PREFIX, FUNCTIONS_PREFIX, RESULTS_PREFIX
 
 
 logger = logging.getLogger(__name__)
@@ -28,8 +28,11 @@ func_key_suffix = "func.pickle"
 agg_data_key_suffix = "aggdata.pickle"
 data_key_suffix = "data.pickle"
 output_key_suffix = "output.pickle"
+shared_arg_key_suffix = "shared.pickle"
 status_key_suffix = "status.json"
+manifest_key_suffix = "manifest.json"
 init_key_suffix = ".init"
+logs_key_suffix = "log.gz"
 
 
 class StorageNoSuchKeyError(Exception):
@@ -55,6 +58,18 @@ class CloudObject:
         return f'<CloudObject at {path}>'
 
 
+class SharedArgument:
+    """
+    Reference to a function argument shared by several calls of a job,
+    which is stored only once in the storage backend
+    """
+    def __init__(self, key):
+        self.key = key
+
+    def __str__(self):
+        return f'<SharedArgument at {self.key}>'
+
+
 class CloudObjectUrl:
     def __init__(self, url):
         self.url = url
@@ -113,6 +128,46 @@ def create_func_key(executor_id, function_hash):
     return '/'.join([JOBS_PREFIX, executor_id, f'{function_hash}.{func_key_suffix}'])
 
 
+def create_func_cache_key(function_hash):
+    """
+    Create a content-addressed function key, shared by all executors
+    :param function_hash: hash of the function and modules bundle
+    :return: function key
+    """
+    return '/'.join([FUNCTIONS_PREFIX, f'{function_hash}.{func_key_suffix}'])
+
+
+def create_result_cache_prefix(function_hash):
+    """
+    Create the prefix of the cached outputs of a function
+    :param function_hash: hash of the function and modules bundle
+    :return: result cache prefix
+    """
+    return '/'.join([RESULTS_PREFIX, function_hash, ''])
+
+
+def create_result_cache_key(function_hash, arg_hash, tstamp):
+    """
+    Create a result cache key, content-addressed by the function and the
+    arguments of the call, and shared by all executors
+    :param function_hash: hash of the function and modules bundle
+    :param arg_hash: hash of the serialized arguments of the call
+    :param tstamp: creation timestamp of the cached output
+    :return: result cache key
+    """
+    return create_result_cache_prefix(function_hash) + f'{arg_hash}.{int(tstamp)}.{output_key_suffix}'
+
+
+def create_shared_arg_key(executor_id, obj_hash):
+    """
+    Create shared argument key
+    :param executor_id: callset's ID
+    :param obj_hash: hash of the serialized argument
+    :return: shared argument key
+    """
+    return '/'.join([JOBS_PREFIX, executor_id, f'{obj_hash}.{shared_arg_key_suffix}'])
+
+
 def create_data_key(executor_id, job_id):
     """
     Create aggregate data key
@@ -151,6 +206,18 @@ def create_status_key(executor_id, job_id, call_id):
     return '/'.join([JOBS_PREFIX, job_key, call_id, status_key_suffix])
 
 
+def create_logs_key(executor_id, job_id, call_id):
+    """
+    Create the key of the full execution log of a call
+    :param executor_id: Executor's ID
+    :param job_id: Job's ID
+    :param call_id: call's ID
+    :return: logs key
+    """
+    job_key = create_job_key(executor_id, job_id)
+    return '/'.join([JOBS_PREFIX, job_key, call_id, logs_key_suffix])
+
+
 def create_init_key(executor_id, job_id, call_id, act_id):
     """
     Create init key
@@ -164,6 +231,33 @@ def create_init_key(executor_id, job_id, call_id, act_id):
     return '/'.join([JOBS_PREFIX, job_key, call_id, f'{act_id}{init_key_suffix}'])
 
 
+def create_manifest_key(executor_id, job_id, call_id, act_id):
+    """
+    Create status manifest key
+    :param executor_id: Executor's ID
+    :param job_id: Job's ID
+    :param call_id: lowest call ID of the manifest
+    :param act_id: activation ID of the worker
+    :return: manifest key
+    """
+    job_key = create_job_key(executor_id, job_id)
+    return '/'.join([JOBS_PREFIX, job_key, call_id, f'{act_id}.{manifest_key_suffix}'])
+
+
+def get_min_call_id(first_call, last_call):
+    """
+    Returns the call ID of range(first_call, last_call) that sorts first in a
+    key listing. Call IDs are zero-padded to 5 digits, so from the call 100000
+    on, their lexicographic and numeric orders differ.
+    :param first_call: first call of the range
+    :param last_call: last call of the range (not included)
+    :return: call ID
+    """
+    call_ids = [first_call] + [10 ** digits for digits in range(5, len(str(last_call)))
+                               if first_call < 10 ** digits < last_call]
+    return min(f'{call_id:05d}' for call_id in call_ids)
+
+
 def get_storage_path(storage_config):
     backend = storage_config['backend']
     bucket = storage_config[backend]['storage_bucket']
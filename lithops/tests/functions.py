@@ -177,3 +177,21 @@ class SideEffect:
 
 def passthrough_function(x):
     return x.result
+
+
+def buffer_sum(x):
+    return sum(memoryview(x))
+
+
+def shared_arg_function(x, data):
+    return x + len(data)
+
+
+def count_lines_function(obj):
+    return len(obj.data_stream.read().splitlines())
+
+
+def print_lines_function(n):
+    for i in range(n):
+        print(f'Line {i}')
+    return n
@@ -61,3 +61,9 @@ class TestCallAsync:
         fexec.call_async(passthrough_function, se)
         result = fexec.get_result()
         assert result == 5
+
+    def test_priority(self):
+        fexec = lithops.FunctionExecutor(config=pytest.lithops_config)
+        fexec.call_async(simple_map_function, (4, 6), priority=1, deadline=10)
+        result = fexec.get_result()
+        assert result == 10
@@ -0,0 +1,107 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import time
+import uuid
+import pytest
+import lithops
+from types import SimpleNamespace
+import multiprocessing as mp
+from lithops.config import extract_storage_config
+from lithops.job import function_cache as fc
+from lithops.job.function_cache import FunctionCache
+from lithops.storage.utils import create_func_cache_key
+
+
+def put_func(storage_config, func_key, executor_ids):
+    function_cache = FunctionCache(lithops.Storage(storage_config=storage_config))
+    for executor_id in executor_ids:
+        function_cache.put_func(func_key, b'function', executor_id)
+
+
+class TestFunctionCache:
+
+    @classmethod
+    def setup_class(cls):
+        cls.storage_config = extract_storage_config(pytest.lithops_config)
+        cls.storage = lithops.Storage(storage_config=cls.storage_config)
+
+    @pytest.mark.parametrize('lock_file', [False, True])
+    def test_concurrent_references(self, lock_file, monkeypatch):
+        if lock_file:
+            # Lock of the platforms without fcntl, inherited by the forked processes
+            monkeypatch.setattr(fc, 'fcntl', None)
+        func_key = create_func_cache_key(uuid.uuid4().hex)
+        executor_ids = [[f'{i}-{j}' for j in range(20)] for i in range(4)]
+        processes = [mp.Process(target=put_func, args=(self.storage_config, func_key, ids))
+                     for ids in executor_ids]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+
+        function_cache = FunctionCache(self.storage)
+        entry = function_cache._load_entry(func_key)
+        assert set(entry['refs']) == {ex_id for ids in executor_ids for ex_id in ids}
+
+        for ids in executor_ids:
+            function_cache.release(ids[0])
+        assert len(function_cache._load_entry(func_key)['refs']) == 4 * 19
+
+        function_cache.ttl = 0
+        for ids in executor_ids:
+            for executor_id in ids:
+                function_cache.release(executor_id)
+        assert func_key in function_cache.purge()
+        assert not self.storage.list_keys(self.storage.bucket, func_key)
+
+        assert not os.path.exists(os.path.join(function_cache.index_dir, '.lockfile'))
+
+    def test_other_hosts(self, tmp_path, monkeypatch):
+        func_key = create_func_cache_key(uuid.uuid4().hex)
+        host1 = FunctionCache(self.storage, ttl=100)
+        host2 = FunctionCache(self.storage, ttl=100)
+        host2.index_dir = str(tmp_path)
+
+        # The function was used by the first host long ago
+        now = time.time()
+        monkeypatch.setattr(fc, 'time', SimpleNamespace(time=lambda: now - 1000, sleep=time.sleep))
+        assert host1.put_func(func_key, b'function', 'host1-0')
+        host1.release('host1-0')
+        monkeypatch.setattr(fc, 'time', time)
+
+        # The second host reuses it, and is recorded in storage
+        assert not host2.put_func(func_key, b'function', 'host2-0')
+        host2.release('host2-0')
+        assert len(host1._list_markers(func_key)) == 2
+
+        # The first host keeps the function, and only deletes its old use
+        assert host1.purge() == []
+        assert self.storage.get_object(self.storage.bucket, func_key) == b'function'
+        assert [ts for _, ts in host1._list_markers(func_key)] == [int(now)]
+
+        # Once the second host stops using it, the function is deleted
+        monkeypatch.setattr(fc, 'time', SimpleNamespace(time=lambda: now + 1000, sleep=time.sleep))
+        assert host1.purge() == [func_key]
+        assert not self.storage.list_keys(self.storage.bucket, func_key)
+
+        # A host that still has the function in its index uploads it again
+        assert host2.put_func(func_key, b'function', 'host2-1')
+        assert self.storage.get_object(self.storage.bucket, func_key) == b'function'
+        host2.ttl = 0
+        host2.release('host2-1')
+        assert host2.purge() == [func_key]
@@ -0,0 +1,231 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import queue
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+
+from lithops.invokers import AsyncInvokeLoop, FaaSInvoker, InvokeRateController
+
+
+class TestAsyncInvokeLoop:
+
+    def test_invoke(self):
+        web = pytest.importorskip('aiohttp.web')
+        async_loop = AsyncInvokeLoop(max_concurrency=2)
+        in_flight = []
+
+        async def handle(request):
+            in_flight.append(1)
+            concurrency = len(in_flight)
+            await asyncio.sleep(0.05)
+            in_flight.pop()
+            payload = await request.json()
+            return web.json_response({'activationId': payload['call_id'], 'concurrency': concurrency})
+
+        async def start_server():
+            app = web.Application()
+            app.router.add_post('/', handle)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            return runner, runner.addresses[0][1]
+
+        async def invoke(payload, url, session):
+            async with session.post(url, json=payload) as resp:
+                return await resp.json()
+
+        runner, port = asyncio.run_coroutine_threadsafe(start_server(), async_loop.loop).result()
+        try:
+            url = f'http://127.0.0.1:{port}/'
+            futures = [async_loop.submit(invoke, {'call_id': f'{i:05d}'}, url) for i in range(8)]
+            responses = [f.result(10) for f in futures]
+            assert [r['activationId'] for r in responses] == [f'{i:05d}' for i in range(8)]
+            assert max(r['concurrency'] for r in responses) <= 2
+        finally:
+            asyncio.run_coroutine_threadsafe(runner.cleanup(), async_loop.loop).result()
+            async_loop.stop()
+        assert not async_loop.thread.is_alive()
+
+
+class TestInvokeRateController:
+
+    def test_increase(self):
+        controller = InvokeRateController(max_concurrency=4)
+        controller.limit = 2
+        # One round of successful invocations raises the limit by one
+        for _ in range(2):
+            assert controller.try_acquire()
+            controller.release(roundtrip=0.1)
+        assert controller.limit == pytest.approx(2.9)
+        for _ in range(20):
+            controller.try_acquire()
+            controller.release(roundtrip=0.1)
+        assert controller.limit == 4
+
+    def test_decrease(self):
+        controller = InvokeRateController(max_concurrency=8, latency=1)
+        for _ in range(4):
+            assert controller.try_acquire()
+        # All the invocations of the same roundtrip decrease the limit once
+        controller.release(roundtrip=10, throttled=True)
+        controller.release(roundtrip=10, throttled=True)
+        assert controller.limit == 4 and controller.throttles == 2
+        # Slow invocations decrease the limit as well
+        controller._last_decrease = 0
+        controller.release(roundtrip=2)
+        assert controller.limit == 2
+        # Failed invocations do not change the limit
+        controller.release()
+        assert controller.limit == 2 and controller.in_flight == 0
+
+    def test_backoff(self):
+        controller = InvokeRateController(max_concurrency=8, max_backoff=0.4)
+        backoffs = []
+        for _ in range(4):
+            controller.acquire()
+            controller.release(roundtrip=0, throttled=True)
+            backoffs.append(controller.backoff)
+            assert not controller.try_acquire()
+        assert backoffs == [0.1, 0.2, 0.4, 0.4]
+        assert controller.limit == 1
+
+        # The backoff ends by itself, and a success resets it
+        start = time.time()
+        controller.acquire()
+        assert time.time() - start < 0.5
+        controller.release(roundtrip=0)
+        assert controller.backoff == 0 and controller.try_acquire()
+
+    def test_acquire_async(self):
+        controller = InvokeRateController(max_concurrency=1)
+        assert controller.try_acquire()
+
+        async def acquire():
+            start = time.time()
+            await controller.acquire_async()
+            return time.time() - start
+
+        # The waiting coroutine is woken up by a release from another thread
+        threading.Timer(0.2, controller.release, kwargs={'roundtrip': 0}).start()
+        assert 0.15 < asyncio.run(acquire()) < 1
+        assert controller.in_flight == 1
+
+        # The waiting coroutine is woken up by the end of the backoff
+        controller.release(roundtrip=0, throttled=True)
+        controller.try_acquire()
+        controller.release(roundtrip=0, throttled=True)
+        assert controller.backoff > 0 and not controller.try_acquire()
+        assert asyncio.run(acquire()) < 0.5
+
+
+class FakeComputeHandler:
+    """
+    Compute handler whose asynchronous invocations fail once for the
+    calls in fail_once
+    """
+
+    def __init__(self, fail_once=()):
+        self.fail_once = set(fail_once)
+        self.invoked = []
+        self.async_invoked = []
+
+    def get_runtime_info(self):
+        return {'runtime_name': 'fake-runtime', 'max_workers': 1,
+                'runtime_memory': 256, 'runtime_timeout': 600}
+
+    def supports_async_invoke(self):
+        return True
+
+    def pre_invoke(self, job):
+        pass
+
+    def invoke(self, payload):
+        self.invoked.extend(payload['call_ids'])
+        return 'activation'
+
+    async def invoke_async(self, payload, session):
+        for call_id in payload['call_ids']:
+            if call_id in self.fail_once:
+                self.fail_once.remove(call_id)
+                raise ConnectionError(f'Cannot invoke call {call_id}')
+        self.async_invoked.extend(payload['call_ids'])
+        return 'activation'
+
+
+class TestFaaSInvoker:
+
+    def create_invoker(self, compute_handler, monkeypatch):
+        pytest.importorskip('aiohttp')
+        monkeypatch.setenv('__LITHOPS_SESSION_ID', 'a1b2c3-0')
+        config = {
+            'lithops': {'mode': 'serverless', 'backend': 'fake', 'storage': 'localhost',
+                        'async_invoke': True, 'invoker_scheduler': 'fifo'},
+            'fake': {'invoke_pool_threads': 4, 'rate_control': False},
+            'localhost': {}
+        }
+        job_monitor = SimpleNamespace(token_bucket_q=queue.Queue())
+        invoker = FaaSInvoker(config, 'a1b2c3-0', None, compute_handler, job_monitor)
+        invoker._create_task_payload = lambda job, call_ids_range: {
+            'call_ids': [f'{call_id:05d}' for call_id in call_ids_range]
+        }
+        return invoker
+
+    def wait_invoked(self, invoked, total_calls, timeout=10):
+        start = time.time()
+        while len(invoked) < total_calls and time.time() - start < timeout:
+            time.sleep(0.05)
+        return sorted(invoked)
+
+    def test_retry_pending_calls(self, monkeypatch):
+        compute_handler = FakeComputeHandler(fail_once={'00001'})
+        invoker = self.create_invoker(compute_handler, monkeypatch)
+        job = SimpleNamespace(executor_id='a1b2c3-0', job_id='M000', job_key='a1b2c3-0-M000',
+                              total_calls=4, chunksize=1)
+        try:
+            # One call is invoked directly, and the rest wait for the tokens
+            # of the invoker threads
+            invoker._invoke_job(job)
+            invoker.job_monitor.token_bucket_q.put('#')
+            call_ids = [f'{i:05d}' for i in range(4)]
+            assert self.wait_invoked(compute_handler.async_invoked, 4) == call_ids
+            assert invoker.invoke_failures == {}
+        finally:
+            invoker.stop()
+
+    def test_restart_async_loop(self, monkeypatch):
+        compute_handler = FakeComputeHandler()
+        invoker = self.create_invoker(compute_handler, monkeypatch)
+        job = SimpleNamespace(executor_id='a1b2c3-0', job_id='M000', job_key='a1b2c3-0-M000',
+                              total_calls=1, chunksize=1)
+        invoker._invoke_job(job)
+        assert self.wait_invoked(compute_handler.async_invoked, 1) == ['00000']
+
+        # The jobs submitted after a stop() are still invoked asynchronously
+        invoker.stop()
+        assert invoker.async_loop is None
+        job = SimpleNamespace(executor_id='a1b2c3-0', job_id='M001', job_key='a1b2c3-0-M001',
+                              total_calls=1, chunksize=1)
+        try:
+            invoker._invoke_job(job)
+            assert self.wait_invoked(compute_handler.async_invoked, 2) == ['00000', '00000']
+            assert compute_handler.invoked == []
+        finally:
+            invoker.stop()
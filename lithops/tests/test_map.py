@@ -14,16 +14,30 @@
 # limitations under the License.
 #
 
+import os
+import copy
+import gzip
+import pickle
 import pytest
 import lithops
+import threading
+from lithops.job import job as job_module
+from lithops.job.serialize import DataWriter
+from lithops.constants import JOBS_PREFIX, RESULTS_PREFIX, FUNCTIONS_PREFIX, PREFETCH_DIR
+from lithops.tests.conftest import TESTS_PREFIX
 from lithops.tests.functions import (
     simple_map_function,
+    simple_reduce_function,
     hello_world,
     lithops_inside_lithops_map_function,
     lithops_return_futures_map,
     lithops_return_futures_call_async,
     lithops_return_futures_map_multiple,
-    concat
+    concat,
+    buffer_sum,
+    shared_arg_function,
+    print_lines_function,
+    count_lines_function
 )
 
 
@@ -118,3 +132,214 @@ class TestMap:
         fexec.wait()
         result = fexec.get_result()
         assert result == [1, 2, 3, 1, 2, 3]
+
+    def test_function_cache(self):
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['function_cache'] = True
+        iterdata = [(1, 1), (2, 2)]
+        fexec = lithops.FunctionExecutor(config=config)
+        fexec.map(simple_map_function, iterdata)
+        result1 = fexec.get_result()
+        fexec = lithops.FunctionExecutor(config=config)
+        futures = fexec.map(simple_map_function, iterdata)
+        result2 = fexec.get_result()
+        assert result1 == result2 == [2, 4]
+        assert futures[0].stats['host_func_upload_time'] == 0
+
+        # The function is uploaded again if it was purged from storage
+        storage = fexec.internal_storage.storage
+        storage.delete_objects(storage.bucket, storage.list_keys(storage.bucket, FUNCTIONS_PREFIX))
+        fexec = lithops.FunctionExecutor(config=config)
+        futures = fexec.map(simple_map_function, iterdata)
+        assert fexec.get_result() == [2, 4]
+        assert futures[0].stats['host_func_upload_time'] > 0
+
+    def test_map_generator(self):
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['iterdata_window_size'] = 2
+        iterdata = ((x, x) for x in range(1, 6))
+        fexec = lithops.FunctionExecutor(config=config)
+        futures = fexec.map(simple_map_function, iterdata)
+        result = fexec.get_result(futures)
+        assert result == [2, 4, 6, 8, 10]
+        assert len(set(f.job_id for f in futures)) == 3
+
+    def test_map_reduce_generator(self):
+        iterdata = ((x, x) for x in range(1, 6))
+        fexec = lithops.FunctionExecutor(config=pytest.lithops_config)
+        with pytest.raises(ValueError):
+            fexec.map_reduce(simple_map_function, iterdata, simple_reduce_function)
+
+    def test_oob_serialization(self):
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['oob_serialization'] = True
+        iterdata = [pickle.PickleBuffer(bytearray([i]) * 10000) for i in range(3)]
+        fexec = lithops.FunctionExecutor(config=config)
+        fexec.map(buffer_sum, iterdata)
+        result = fexec.get_result()
+        assert result == [0, 10000, 20000]
+
+    def test_shared_args(self):
+        data = bytes(2 * 1024**2)
+        iterdata = [(x, data) for x in range(3)]
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['share_args'] = True
+        fexec = lithops.FunctionExecutor(config=config)
+        futures = fexec.map(shared_arg_function, iterdata)
+        result = fexec.get_result()
+        assert result == [len(data), len(data) + 1, len(data) + 2]
+        assert futures[0].stats['func_data_size_bytes'] < len(data)
+
+    def test_payload_codec(self):
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['payload_codec'] = 'zlib'
+        iterdata = [(1, 1), (2, 2), (3, 3), (4, 4)]
+        fexec = lithops.FunctionExecutor(config=config)
+        fexec.map(simple_map_function, iterdata)
+        fexec.map(concat, [[str(x) * 1000 for x in range(10)]])
+        result = fexec.get_result()
+        assert result == [2, 4, 6, 8, ' '.join(str(x) * 1000 for x in range(10))]
+
+    def test_status_manifest(self):
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['status_manifest'] = True
+        iterdata = [(1, 1), (2, 2), (3, 3), (4, 4)]
+        fexec = lithops.FunctionExecutor(config=config)
+        futures = fexec.map(simple_map_function, iterdata, chunksize=2)
+        result = fexec.get_result()
+        assert result == [2, 4, 6, 8]
+        job_prefix = '/'.join([JOBS_PREFIX, futures[0].job_key, ''])
+        keys = fexec.internal_storage.storage.list_keys(fexec.internal_storage.bucket, job_prefix)
+        assert [k for k in keys if k.endswith('manifest.json')]
+        assert not [k for k in keys if k.endswith('status.json')]
+
+    def test_as_completed(self):
+        iterdata = [(1, 1), (2, 2), (3, 3), (4, 4)]
+        fexec = lithops.FunctionExecutor(config=pytest.lithops_config)
+        futures = fexec.map(simple_map_function, iterdata)
+        fexec.map(concat, [[str(x) * 1000 for x in range(10)]])
+        results = []
+        for future, result in fexec.as_completed(max_in_flight=2, max_in_flight_bytes=1024):
+            results.append(result)
+            assert future._call_output is result
+        expected = [2, 4, 6, 8, ' '.join(str(x) * 1000 for x in range(10))]
+        assert sorted(map(str, results)) == sorted(map(str, expected))
+        assert all(f._call_output is None for f in futures)
+
+    def test_jobrunner_pool(self):
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['jobrunner_pool'] = True
+        config['lithops']['jobrunner_max_tasks'] = 2
+        iterdata = [(1, 1), (2, 2), (3, 3), (4, 4), (5, 5)]
+        fexec = lithops.FunctionExecutor(config=config)
+        fexec.map(simple_map_function, iterdata, chunksize=5)
+        fexec.map(concat, [["a", "b"], ["c", "d"]], chunksize=2)
+        result = fexec.get_result()
+        assert result == [2, 4, 6, 8, 10, "a b", "c d"]
+
+    def test_futures_stats(self):
+        iterdata = [(1, 1), (2, 2), (3, 3)]
+        fexec = lithops.FunctionExecutor(config=pytest.lithops_config)
+        futures = fexec.map(simple_map_function, iterdata)
+        assert fexec.get_result() == [2, 4, 6]
+        stats = [dict(f.stats) for f in futures]
+        assert all(s['host_job_create_tstamp'] == stats[0]['host_job_create_tstamp'] for s in stats)
+        assert all(s['worker_exec_time'] >= 0 for s in stats)
+        futures[0].stats['custom_stat'] = 'value'
+        assert 'custom_stat' not in futures[1].stats
+        future = pickle.loads(pickle.dumps(futures[0]))
+        assert dict(future.stats) == dict(futures[0].stats)
+        assert future.status()['func_result_size'] == futures[0].status()['func_result_size']
+        assert future.result() == 2
+
+    def test_result_cache(self):
+        iterdata = [(x, x) for x in range(5)]
+        fexec = lithops.FunctionExecutor(config=pytest.lithops_config)
+        storage = fexec.internal_storage.storage
+        cached_keys = storage.list_keys(storage.bucket, RESULTS_PREFIX)
+        if cached_keys:
+            storage.delete_objects(storage.bucket, cached_keys)
+        fexec.map(simple_map_function, iterdata, result_cache=True)
+        assert fexec.get_result() == [0, 2, 4, 6, 8]
+
+        fexec = lithops.FunctionExecutor(config=pytest.lithops_config)
+        futures = fexec.map(simple_map_function, iterdata + [(5, 5), (6, 6)], result_cache=True)
+        assert fexec.get_result() == [0, 2, 4, 6, 8, 10, 12]
+        cache_hits = [f.stats.get('host_result_cache_hit', False) for f in futures]
+        assert cache_hits == [True] * 5 + [False] * 2
+
+        data = bytes(2 * 1024**2)
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['share_args'] = True
+        for _ in range(2):
+            fexec = lithops.FunctionExecutor(config=config)
+            futures = fexec.map(shared_arg_function, [(x, data) for x in range(2)], result_cache=True)
+            assert fexec.get_result() == [len(data), len(data) + 1]
+        assert all(f.stats.get('host_result_cache_hit') for f in futures)
+
+    def test_log_capture(self):
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['log_head_size'] = 1
+        config['lithops']['log_tail_size'] = 16
+        config['lithops']['upload_logs'] = True
+        fexec = lithops.FunctionExecutor(config=config)
+        futures = fexec.map(print_lines_function, [10, 100000])
+        assert fexec.get_result() == [10, 100000]
+        assert 'Line 9\n' in futures[0].logs
+        assert futures[1].stats['worker_logs_size'] > 100000
+        assert len(futures[1].logs) < 20 * 1024
+        assert 'bytes of logs truncated' in futures[1].logs
+        storage = fexec.internal_storage.storage
+        logs = gzip.decompress(storage.get_object(storage.bucket, futures[1].status()['logs_key'])).decode()
+        assert all(f'Line {i}\n' in logs for i in (0, 50000, 99999))
+        # The logs of the function are placed before the ones the handler writes after it
+        assert logs.index('Line 99999\n') < logs.index('JobRunner process finished')
+
+    def test_prefetch(self):
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['prefetch_depth'] = 2
+        if config['lithops']['backend'] == 'localhost':
+            # Run the calls of the chunk in the same worker process
+            config['localhost'] = {**config.get('localhost', {}), 'version': 1, 'worker_processes': 1}
+        storage = lithops.Storage(config=config)
+        prefix = TESTS_PREFIX + '/prefetch/'
+        for i in range(3):
+            storage.put_object(storage.bucket, f'{prefix}obj{i}.txt', b'\n'.join(b'line %d' % j for j in range(1000)))
+
+        fexec = lithops.FunctionExecutor(config=config)
+        futures = fexec.map(count_lines_function, f'{storage.backend}://{storage.bucket}/{prefix}',
+                            obj_chunk_size=2000, obj_newline='\n', chunksize=100)
+        assert sum(fexec.get_result()) == 3000
+        assert any('prefetched partition' in (f.logs or '') for f in futures)
+        if config['lithops']['backend'] == 'localhost':
+            job_key = futures[0].job_key
+            assert not [f for f in os.listdir(PREFETCH_DIR) if f.startswith(job_key)]
+
+        storage.delete_objects(storage.bucket, storage.list_keys(storage.bucket, prefix))
+
+    def test_data_spill(self, monkeypatch):
+        config = copy.deepcopy(pytest.lithops_config)
+        config['lithops']['data_limit'] = False
+        data_writers = []
+
+        class SpillDataWriter(DataWriter):
+            # Spills the data to disk above 1MiB instead of DATA_SPOOL_SIZE
+            def __init__(self):
+                super().__init__(spool_size=1)
+                data_writers.append(self)
+
+        monkeypatch.setattr(job_module, 'DataWriter', SpillDataWriter)
+        iterdata = [(i, bytes([i]) * 600 * 1024) for i in range(3)]
+        fexec = lithops.FunctionExecutor(config=config)
+        fexec.map(shared_arg_function, iterdata)
+        result = fexec.get_result()
+        assert result == [i + 600 * 1024 for i in range(3)]
+        assert data_writers[0].file_name is not None
+        assert not os.path.exists(data_writers[0].file_name)
+
+        # The spilled data is removed when the serialization fails
+        iterdata.append((3, threading.Lock()))
+        with pytest.raises(TypeError):
+            fexec.map(shared_arg_function, iterdata)
+        assert data_writers[1].file_name is not None
+        assert not os.path.exists(data_writers[1].file_name)
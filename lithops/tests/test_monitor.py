@@ -0,0 +1,225 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import time
+import uuid
+import queue
+import pytest
+from types import SimpleNamespace
+
+from lithops import monitor
+from lithops.config import extract_storage_config
+from lithops.future import ResponseFuture
+from lithops.monitor import JobMonitor, StorageMonitor
+from lithops.storage import InternalStorage
+from lithops.storage.utils import create_status_key
+from lithops.util.redis_streams import get_stream_name
+
+EXECUTOR_ID = 'a1b2c3-0'
+
+
+class CallFuture:
+    """Minimal future of a call, with the state the monitors track"""
+
+    def __init__(self, job_id, call_id, executor_id=EXECUTOR_ID):
+        self.executor_id = executor_id
+        self.job_id = job_id
+        self.call_id = call_id
+        self.activation_id = None
+        self.execution_timeout = 60
+        self.invoked = True
+        self.status_manifest = False
+        self.running = self.ready = self.success = self.done = False
+        self._call_status = None
+        self._status_query_count = 0
+
+    def _set_running(self, call_status):
+        self.running = True
+        self._call_status = call_status
+
+    def _set_ready(self, call_status):
+        self.running = False
+        self.ready = True
+        self._call_status = call_status
+
+
+def push_event(client, job_id, call_id, event_type):
+    call_status = {'type': event_type, 'executor_id': EXECUTOR_ID, 'job_id': job_id,
+                   'call_id': call_id, 'activation_id': 'act', 'chunksize': 1}
+    client.xadd(get_stream_name(EXECUTOR_ID), {'status': json.dumps(call_status)})
+
+
+def wait_ready(fs, timeout=10):
+    start = time.time()
+    while not all(f.ready for f in fs) and time.time() - start < timeout:
+        time.sleep(0.05)
+    return all(f.ready for f in fs)
+
+
+class TestRedisMonitor:
+
+    def test_back_to_back_jobs(self, monkeypatch):
+        fakeredis = pytest.importorskip('fakeredis')
+        server = fakeredis.FakeServer()
+        monkeypatch.setattr(monitor, 'create_redis_client',
+                            lambda config: fakeredis.FakeRedis(server=server))
+        client = fakeredis.FakeRedis(server=server)
+
+        config = {'lithops': {'monitoring': 'redis'}, 'redis': {}}
+        internal_storage = SimpleNamespace(get_storage_config=lambda: {}, backend='localhost')
+        job_monitor = JobMonitor(EXECUTOR_ID, internal_storage, config)
+
+        # The events of the second job arrive before its futures are tracked,
+        # and are read by the monitor of the first job before it stops
+        push_event(client, 'M000', '00000', '__end__')
+        push_event(client, 'M001', '00000', '__init__')
+        push_event(client, 'M001', '00000', '__end__')
+
+        fs1 = [CallFuture('M000', '00000')]
+        job_monitor.start(fs1)
+        assert wait_ready(fs1)
+        job_monitor.monitor.join(5)
+
+        fs2 = [CallFuture('M001', '00000'), CallFuture('M001', '00001')]
+        job_monitor.start(fs2)
+        push_event(client, 'M001', '00001', '__end__')
+        assert wait_ready(fs2)
+        job_monitor.stop()
+
+
+class TestStorageMonitor:
+
+    def test_finished_jobs(self):
+        executor_id = f'{uuid.uuid4().hex[:6]}-0'
+        internal_storage = InternalStorage(extract_storage_config(pytest.lithops_config))
+        config = {'lithops': {'monitoring': 'storage'}}
+        job_monitor = JobMonitor(executor_id, internal_storage, config)
+
+        def put_status(f):
+            call_status = {'type': '__end__', 'executor_id': executor_id, 'job_id': f.job_id,
+                           'call_id': f.call_id, 'activation_id': 'act', 'chunksize': 1}
+            status_key = create_status_key(executor_id, f.job_id, f.call_id)
+            internal_storage.put_data(status_key, json.dumps(call_status))
+
+        fs1 = [CallFuture('M000', f'{i:05d}', executor_id) for i in range(3)]
+        fs2 = [CallFuture('M001', f'{i:05d}', executor_id) for i in range(2)]
+        job_monitor.start(fs1)
+        job_monitor.start(fs2)
+        for f in fs1 + fs2:
+            put_status(f)
+        assert wait_ready(fs1 + fs2)
+        job_monitor.monitor.join(10)
+
+        # The listing state of the jobs is dropped once all their calls are done
+        assert not job_monitor.monitor.unlisted_futures
+        assert job_monitor.monitor.job_ranges == {} and job_monitor.monitor.job_status == {}
+
+        fs3 = [CallFuture('M002', '00000', executor_id)]
+        job_monitor.start(fs3)
+        put_status(fs3[0])
+        assert wait_ready(fs3)
+        job_monitor.stop()
+
+
+class FakeInternalStorage:
+    """
+    Internal storage that lists the new running and done calls of the
+    current simulation step
+    """
+
+    def __init__(self):
+        self.callids_running = set()
+        self.callids_done = set()
+        self.status_queries = 0
+
+    def get_job_status(self, executor_id, job_ranges=None, job_status=None):
+        callids_running, callids_done = self.callids_running, self.callids_done
+        self.callids_running, self.callids_done = set(), set()
+        return callids_running, callids_done
+
+    def get_call_status(self, executor_id, job_id, call_id, status_manifest=False):
+        self.status_queries += 1
+        return {'type': '__end__', 'exception': False, 'executor_id': executor_id,
+                'job_id': job_id, 'call_id': call_id, 'activation_id': call_id,
+                'worker_start_tstamp': 0, 'worker_end_tstamp': 1}
+
+
+def run_storage_monitor_polls(total_futures, batch_size):
+    """
+    Simulates the polls of the storage monitor of a job in which a batch
+    of calls starts and another one finishes between two polls. Returns
+    the CPU time and the number of status queries of each poll
+    """
+    job = SimpleNamespace(
+        job_id='M000', job_key=f'{EXECUTOR_ID}-M000', executor_id=EXECUTOR_ID,
+        function_name='bench', execution_timeout=10**9, runtime_name='bench',
+        runtime_memory=256, status_manifest=False
+    )
+    storage_config = {'backend': 'localhost', 'localhost': {'storage_bucket': 'bench'}}
+    futures = []
+    for i in range(total_futures):
+        f = ResponseFuture(f'{i:05d}', job, {}, storage_config)
+        f._set_state(ResponseFuture.State.Invoked)
+        futures.append(f)
+
+    storage = FakeInternalStorage()
+    storage_monitor = StorageMonitor(
+        executor_id=EXECUTOR_ID,
+        internal_storage=storage,
+        token_bucket_q=queue.Queue(),
+        job_chunksize={'M000': 1},
+        generate_tokens=True,
+        config={'monitoring_interval': 2}
+    )
+    storage_monitor.add_futures(futures)
+
+    polls = []
+    for start in range(0, total_futures + batch_size, batch_size):
+        for i in range(start, min(start + batch_size, total_futures)):
+            storage.callids_running.add(((EXECUTOR_ID, 'M000', f'{i:05d}'), f'worker-{i}'))
+        for i in range(max(start - batch_size, 0), min(start, total_futures)):
+            storage.callids_done.add((EXECUTOR_ID, 'M000', f'{i:05d}'))
+
+        status_queries = storage.status_queries
+        t0 = time.process_time()
+        storage_monitor._process_callids()
+        storage_monitor._all_ready()
+        polls.append((time.process_time() - t0, storage.status_queries - status_queries))
+
+    assert all(f.ready for f in futures)
+    assert storage_monitor._all_ready() and storage_monitor.job_ranges == {}
+    return polls
+
+
+class TestStorageMonitorPollCost:
+
+    def test_flat_poll_cost(self):
+        batch_size = 500
+        small_polls = run_storage_monitor_polls(5000, batch_size)
+        large_polls = run_storage_monitor_polls(100000, batch_size)
+
+        # Each poll queries the status of the new done calls, and of a few
+        # of the last pending calls
+        max_queries = batch_size + StorageMonitor.REQUERY_SIZE
+        assert max(queries for _, queries in small_polls + large_polls) <= max_queries
+
+        # The CPU time of each poll depends on the new events, not on the
+        # total number of futures
+        def mean_poll_time(polls):
+            return sum(poll_time for poll_time, _ in polls) / len(polls)
+
+        assert mean_poll_time(large_polls) < 3 * mean_poll_time(small_polls) + 0.005
@@ -0,0 +1,117 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import queue
+import threading
+import pytest
+from types import SimpleNamespace
+
+from lithops.scheduler import FIFOScheduler, FairShareScheduler, create_scheduler
+
+
+def create_job(job_key, total_calls, priority=0, deadline=None):
+    futures = [SimpleNamespace(call_id=str(i).zfill(5), stats={}) for i in range(total_calls)]
+    return SimpleNamespace(job_key=job_key, futures=futures, priority=priority, deadline=deadline)
+
+
+def put_calls(scheduler, job):
+    for call_id in range(len(job.futures)):
+        scheduler.put((job, range(call_id, call_id + 1)))
+
+
+def get_job_keys(scheduler, n):
+    return [scheduler.get()[0].job_key for _ in range(n)]
+
+
+class TestCreateScheduler:
+
+    def test_names(self):
+        assert isinstance(create_scheduler('fifo'), FIFOScheduler)
+        assert isinstance(create_scheduler('fair'), FairShareScheduler)
+        with pytest.raises(ValueError):
+            create_scheduler('lifo')
+
+
+class TestFIFOScheduler:
+
+    def test_order(self):
+        scheduler = FIFOScheduler()
+        job1, job2 = create_job('A', 2), create_job('B', 2)
+        put_calls(scheduler, job1)
+        put_calls(scheduler, job2)
+        scheduler.put((None, None))
+        assert scheduler.qsize() == 5
+
+        assert get_job_keys(scheduler, 4) == ['A', 'A', 'B', 'B']
+        assert scheduler.get() == (None, None)
+        assert scheduler.empty()
+        with pytest.raises(queue.Empty):
+            scheduler.get(block=False)
+
+    def test_queue_wait_time(self):
+        scheduler = FIFOScheduler()
+        job = create_job('A', 4)
+        scheduler.put((job, range(0, 2)))
+        time.sleep(0.1)
+        scheduler.get()
+        assert [f.stats.get('host_queue_wait_time', 0) >= 0.1 for f in job.futures] == [True, True, False, False]
+
+
+class TestFairShareScheduler:
+
+    def test_fair_share(self):
+        scheduler = FairShareScheduler()
+        put_calls(scheduler, create_job('A', 10))
+        assert get_job_keys(scheduler, 5) == ['A'] * 5
+
+        # A job submitted after a large one does not wait for all its calls
+        put_calls(scheduler, create_job('B', 2))
+        assert get_job_keys(scheduler, 4).count('B') == 2
+        assert get_job_keys(scheduler, 3) == ['A'] * 3
+        assert scheduler.empty()
+
+    def test_priority(self):
+        scheduler = FairShareScheduler()
+        put_calls(scheduler, create_job('A', 10))
+        put_calls(scheduler, create_job('B', 10, priority=1))
+        # A job with priority 1 gets twice the invocations
+        job_keys = get_job_keys(scheduler, 9)
+        assert job_keys.count('A') == 3 and job_keys.count('B') == 6
+
+    def test_deadline(self):
+        scheduler = FairShareScheduler()
+        now = time.time()
+        put_calls(scheduler, create_job('A', 2))
+        put_calls(scheduler, create_job('B', 2, deadline=now + 20))
+        put_calls(scheduler, create_job('C', 2, deadline=now + 10))
+        scheduler.put((None, None))
+
+        # The sentinels go first, then the earliest deadline
+        assert scheduler.get() == (None, None)
+        assert get_job_keys(scheduler, 6) == ['C', 'C', 'B', 'B', 'A', 'A']
+
+    def test_blocking_get(self):
+        scheduler = FairShareScheduler()
+        with pytest.raises(queue.Empty):
+            scheduler.get(block=False)
+
+        job = create_job('A', 1)
+        threading.Timer(0.1, put_calls, args=(scheduler, job)).start()
+        start = time.time()
+        assert scheduler.get() == (job, range(0, 1))
+        assert time.time() - start >= 0.05
+        assert job.futures[0].stats['host_queue_wait_time'] >= 0
@@ -0,0 +1,142 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import pickle
+from types import SimpleNamespace
+
+from lithops.job import serialize
+from lithops.job.serialize import DataWriter, ModuleDataCache, serialize_iterdata
+from lithops.storage import InternalStorage
+from lithops.util.codecs import decompress
+
+
+class TestSerializeIterdata:
+
+    def test_order(self):
+        iterdata = [(x, {'y': x}) for x in range(10)]
+        data_strs = list(serialize_iterdata(iterdata))
+        assert [pickle.loads(data_str) for data_str in data_strs] == iterdata
+
+    def test_codec(self):
+        iterdata = [(x, b'a' * 1000) for x in range(5)]
+        data_strs = list(serialize_iterdata(iterdata, codec='zlib'))
+        assert all(len(data_str) < 1000 for data_str in data_strs)
+        assert [pickle.loads(bytes(decompress(data_str))) for data_str in data_strs] == iterdata
+
+    def test_digest_ignore(self):
+        # The same arguments of two executors, whose shared argument keys
+        # contain the executor ID, have the same digest
+        [(_, digest1)] = serialize_iterdata([('lithops.jobs/a1-0/x', 1)], digest_ignore=b'lithops.jobs/a1-0/')
+        [(_, digest2)] = serialize_iterdata([('lithops.jobs/b2-0/x', 1)], digest_ignore=b'lithops.jobs/b2-0/')
+        [(_, digest3)] = serialize_iterdata([('lithops.jobs/b2-0/x', 2)], digest_ignore=b'lithops.jobs/b2-0/')
+        assert digest1 == digest2 != digest3
+
+
+class TestDataWriter:
+
+    def test_in_memory(self):
+        data_writer = DataWriter()
+        for data_str in (b'abc', b'', b'defgh'):
+            data_writer.write(data_str)
+        assert data_writer.file_name is None
+        assert data_writer.getvalue() == b'abcdefgh'
+        assert data_writer.data_byte_ranges == [(0, 2), (3, 2), (3, 7)]
+        assert data_writer.get_data_strs() == [b'abc', b'', b'defgh']
+        assert data_writer.max_element_size == 5
+        data_writer.close()
+
+    def test_spill(self):
+        data_writer = DataWriter(spool_size=1)
+        elements = [bytes([x]) * 300 * 1024 for x in range(8)]
+        for element in elements:
+            data_writer.write(element)
+        assert data_writer.file_name is not None
+        assert data_writer.size == sum(len(element) for element in elements)
+        assert data_writer.get_data_strs() == elements
+        data_writer.flush()
+        with open(data_writer.file_name, 'rb') as f:
+            assert f.read() == b''.join(elements)
+        data_writer.close()
+        assert not os.path.exists(data_writer.file_name)
+
+
+class TestPutDataFile:
+
+    def test_stream_fallback(self, tmp_path):
+        file_name = tmp_path / 'data.pickle'
+        file_name.write_bytes(b'x' * 1024)
+        bodies = []
+
+        def put_object(bucket, key, body):
+            bodies.append((key, type(body), body.read()))
+
+        storage = SimpleNamespace(upload_file=lambda *args: False, put_object=put_object)
+        internal_storage = SimpleNamespace(storage=storage, bucket='bucket')
+        InternalStorage.put_data_file(internal_storage, 'key', str(file_name))
+
+        # The file is streamed, not read in memory
+        assert len(bodies) == 1
+        key, body_type, data = bodies[0]
+        assert key == 'key' and hasattr(body_type, 'read') and data == b'x' * 1024
+
+
+class TestModuleDataCache:
+
+    def test_file_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(serialize, 'MODULE_DATA_CACHE', ModuleDataCache())
+        module = tmp_path / 'module.py'
+        module.write_text('X = 1\n')
+        mod_str = serialize._read_module_file(str(module))
+        assert serialize.MODULE_DATA_CACHE.get(str(module), os.stat(module)) == mod_str
+
+        # Same size, newer modification time
+        module.write_text('X = 2\n')
+        st = os.stat(module)
+        os.utime(module, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert serialize.MODULE_DATA_CACHE.get(str(module), os.stat(module)) is None
+        assert serialize._read_module_file(str(module)) != mod_str
+        mod_str = serialize._read_module_file(str(module))
+
+        # Same modification time, different size
+        st = os.stat(module)
+        module.write_text('X = 22\n')
+        os.utime(module, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert serialize.MODULE_DATA_CACHE.get(str(module), os.stat(module)) is None
+        assert serialize._read_module_file(str(module)) != mod_str
+
+    def test_eviction(self, tmp_path):
+        cache = ModuleDataCache(max_size=1)
+        modules = []
+        for i in range(3):
+            module = tmp_path / f'module{i}.py'
+            module.write_text(str(i))
+            modules.append((str(module), os.stat(module)))
+
+        cache.put(*modules[0], 'a' * 400 * 1024)
+        cache.put(*modules[1], 'b' * 400 * 1024)
+        assert cache.get(*modules[0]) is not None
+        cache.put(*modules[2], 'c' * 400 * 1024)
+
+        # The least recently used module is evicted
+        assert cache.get(*modules[1]) is None
+        assert cache.get(*modules[0]) is not None
+        assert cache.get(*modules[2]) is not None
+        assert cache.size == 800 * 1024
+
+        cache.put(*modules[0], 'x' * 2 * 1024**2)
+        assert cache.get(*modules[0]) is None
+        assert cache.size == 400 * 1024
@@ -128,6 +128,19 @@ class TestStorage:
 
         assert non_existent_keys == []
 
+    def test_list_keys_start_after(self):
+        logger.info('Testing Storage.list_keys with start_after')
+        test_keys = [STORAGE_PREFIX + f'/calls/{call_id:05d}/status.json' for call_id in range(5)]
+        for key in test_keys:
+            self.storage.put_object(self.bucket, key, key.encode())
+
+        prefix = STORAGE_PREFIX + '/calls/'
+        all_keys = self.storage.list_keys(self.bucket, prefix)
+        after_keys = self.storage.list_keys(self.bucket, prefix, start_after=prefix + '00002')
+
+        assert sorted(all_keys) == test_keys
+        assert sorted(after_keys) == test_keys[2:]
+
     def test_head_object(self):
         logger.info('Testing Storage.head_object')
         data = b'123456789'
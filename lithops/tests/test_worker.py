@@ -0,0 +1,116 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import pytest
+import multiprocessing as mp
+from types import SimpleNamespace
+from multiprocessing.shared_memory import SharedMemory
+
+from lithops.worker import sampler
+from lithops.worker.handler import SharedWorkQueue, ShutdownSentinel
+from lithops.worker.sampler import Sample, SystemSampler, cpu_percent, rapl_energy
+
+
+def consume(work_queue, results):
+    while True:
+        event = work_queue.get(block=True)
+        if isinstance(event, ShutdownSentinel):
+            break
+        job, call_id, data = event
+        results.put((os.getpid(), job.job_id, call_id, bytes(data)))
+    results.put(None)
+
+
+class TestSharedWorkQueue:
+
+    def test_consumers(self):
+        call_ids = [f'{i:05d}' for i in range(50)]
+        data = [bytes([i]) * (i * 100) for i in range(50)]
+        job = SimpleNamespace(job_id='M000', call_ids=call_ids)
+        work_queue = SharedWorkQueue(job, data)
+
+        results = mp.Queue()
+        processes = [mp.Process(target=consume, args=(work_queue, results)) for _ in range(4)]
+        try:
+            for p in processes:
+                p.start()
+
+            events = []
+            finished = 0
+            while finished < len(processes):
+                event = results.get(timeout=30)
+                if event is None:
+                    finished += 1
+                else:
+                    events.append(event)
+            for p in processes:
+                p.join()
+        finally:
+            work_queue.close()
+
+        # Each call is taken by a single process, with its own data
+        assert sorted(call_id for _, _, call_id, _ in events) == call_ids
+        assert all(job_id == 'M000' for _, job_id, _, _ in events)
+        assert all(call_data == data[int(call_id)] for _, _, call_id, call_data in events)
+        assert all(p.exitcode == 0 for p in processes)
+
+    def test_close(self):
+        work_queue = SharedWorkQueue(SimpleNamespace(call_ids=[]), [])
+        assert isinstance(work_queue.get(), ShutdownSentinel)
+        name = work_queue.shm.name
+        work_queue.close()
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+class TestSystemSampler:
+
+    def test_cpu_percent(self):
+        s0 = Sample(0.0, (10.0, 20.0, 5.0), (100.0, 100.0, 50.0), 0.0, ())
+        s1 = Sample(1.0, (60.0, 20.0, 5.0), (200.0, 200.0, 50.0), 0.0, ())
+        assert cpu_percent(s0, s1) == [50.0, 0.0, 0.0]
+
+    def test_rapl_energy_wraparound(self):
+        rapl_files = ['package-0', 'core-0']
+        s0 = Sample(0.0, (), (), 0.0, (900.0, 100.0))
+        # The package counter wraps around at 1000 between the samples
+        intermediate = [Sample(1.0, (), (), 0.0, (990.0, 200.0)),
+                        Sample(2.0, (), (), 0.0, (30.0, 300.0))]
+        s1 = Sample(3.0, (), (), 0.0, (80.0, 400.0))
+        fake_sampler = SimpleNamespace(rapl_files=rapl_files, rapl_max_ranges={'package-0': 1000},
+                                       samples=lambda start, end: intermediate)
+        assert rapl_energy(fake_sampler, s0, s1) == [180.0, 300.0]
+
+    def test_ring_buffer(self, monkeypatch):
+        tstamps = iter(range(1, 100))
+        monkeypatch.setattr(sampler.time, 'time', lambda: float(next(tstamps)))
+        monkeypatch.setattr(sampler, 'read_cpu_times', lambda: ([1.0, 2.0], [3.0, 4.0]))
+        system_sampler = SystemSampler(interval=3600, buffer_size=4)
+        try:
+            for _ in range(6):
+                system_sampler.sample()
+        finally:
+            system_sampler.stop()
+
+        # The first 2 samples were overwritten
+        assert [s.timestamp for s in system_sampler.samples(0, 100)] == [3.0, 4.0, 5.0, 6.0]
+        assert [s.timestamp for s in system_sampler.samples(4, 5)] == [4.0, 5.0]
+        assert system_sampler.samples(0, 100)[0].busy == (1.0, 2.0)
+        assert system_sampler.find(5.5).timestamp == 5.0
+        assert system_sampler.find(100).timestamp == 6.0
+        # Older than all the buffered samples
+        assert system_sampler.find(1).timestamp == 3.0
@@ -0,0 +1,118 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+CODEC_MAGIC = b'LTHC'
+
+
+class ZlibCodec:
+    name = 'zlib'
+    codec_id = 1
+
+    def compress(self, data):
+        return zlib.compress(data)
+
+    def decompress(self, data):
+        return zlib.decompress(data)
+
+
+class ZstdCodec:
+    name = 'zstd'
+    codec_id = 2
+
+    def __init__(self):
+        try:
+            import zstandard
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError("The 'zstd' payload codec requires the "
+                                      "'zstandard' package: pip install zstandard")
+        self.zstd = zstandard
+
+    def compress(self, data):
+        return self.zstd.ZstdCompressor().compress(data)
+
+    def decompress(self, data):
+        return self.zstd.ZstdDecompressor().decompress(data)
+
+
+class Lz4Codec:
+    name = 'lz4'
+    codec_id = 3
+
+    def __init__(self):
+        try:
+            import lz4.frame
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError("The 'lz4' payload codec requires the "
+                                      "'lz4' package: pip install lz4")
+        self.lz4 = lz4.frame
+
+    def compress(self, data):
+        return self.lz4.compress(data)
+
+    def decompress(self, data):
+        return self.lz4.decompress(data)
+
+
+CODECS = {codec.name: codec for codec in [ZlibCodec, ZstdCodec, Lz4Codec]}
+CODEC_IDS = {codec.codec_id: codec for codec in CODECS.values()}
+_CODEC_INSTANCES = {}
+
+
+def get_codec(name):
+    """
+    Returns the codec instance of a codec name, or None if no codec is set
+    """
+    if name is None or str(name).lower() == 'none':
+        return None
+    if name not in CODECS:
+        raise ValueError(f"Unknown payload codec '{name}'. Use one of: {', '.join(CODECS)}")
+    if name not in _CODEC_INSTANCES:
+        _CODEC_INSTANCES[name] = CODECS[name]()
+    return _CODEC_INSTANCES[name]
+
+
+def compress(data, codec_name):
+    """
+    Compresses a payload with the given codec. The compressed payload is
+    a frame that starts with CODEC_MAGIC and the codec ID, so it can be
+    decompressed without knowing the codec. Returns the data unchanged if
+    no codec is set.
+    """
+    codec = get_codec(codec_name)
+    if codec is None:
+        return data
+    if isinstance(data, str):
+        data = data.encode()
+    return CODEC_MAGIC + bytes([codec.codec_id]) + codec.compress(data)
+
+
+def decompress(data):
+    """
+    Decompresses a payload created by compress(). Payloads that are not
+    compressed are returned unchanged.
+    """
+    if data[:len(CODEC_MAGIC)] != CODEC_MAGIC:
+        return data
+    codec_id = data[len(CODEC_MAGIC)]
+    if codec_id not in CODEC_IDS:
+        raise ValueError(f'Unknown payload codec ID {codec_id}')
+    codec = get_codec(CODEC_IDS[codec_id].name)
+    return codec.decompress(memoryview(data)[len(CODEC_MAGIC) + 1:])
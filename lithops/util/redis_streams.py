@@ -0,0 +1,52 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import copy
+
+
+def create_redis_client(redis_config):
+    """
+    Creates a Redis client from the 'redis' section of the config
+    """
+    try:
+        import redis
+    except ModuleNotFoundError:
+        raise ModuleNotFoundError("The 'redis' monitoring backend requires the "
+                                  "'redis' package: pip install redis")
+
+    redis_config = copy.deepcopy(redis_config)
+    redis_config.pop('storage_bucket', None)
+    redis_config.pop('user_agent', None)
+
+    return redis.Redis(**redis_config)
+
+
+def get_stream_name(executor_id):
+    """
+    Returns the name of the status stream of an executor
+    """
+    return f'lithops-{executor_id}'
+
+
+def get_stream_names(executor_id):
+    """
+    Returns the names of the status streams where the calls of an executor
+    publish their events: the stream of the executor and the streams of the
+    executors that spawned it, as in the RabbitMQ monitoring
+    """
+    executor_keys = executor_id.split('-')
+    return [get_stream_name('-'.join(executor_keys[0:k * 3 + 2]))
+            for k in range(int(len(executor_keys) / 2))]
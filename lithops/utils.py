@@ -24,8 +24,10 @@ import json
 import socket
 import shutil
 import base64
+import pickle
 import inspect
 import struct
+import itertools
 import lithops
 import zipfile
 import platform
@@ -89,6 +91,74 @@ def agg_data(data_strs):
     return b"".join(data_strs), ranges
 
 
+OOB_MAGIC = b'LTHPOOB5'
+OOB_ALIGNMENT = 64
+
+
+def _oob_padding(size):
+    return -size % OOB_ALIGNMENT
+
+
+def oob_dumps(obj, dumps=pickle.dumps):
+    """
+    Serializes an object with pickle protocol 5, keeping the contiguous
+    buffers (NumPy arrays, Arrow buffers, ...) out of the pickle stream.
+    Returns a list of segments, so the buffers are only copied once when
+    they are written to their destination. The pickle stream and each
+    buffer start at a multiple of OOB_ALIGNMENT bytes:
+
+    MAGIC | num_buffers | pickle_size | buffer_sizes... | pickle | buffers...
+
+    If the object does not contain any buffer, a regular pickle is returned.
+    """
+    buffers = []
+    pickle_str = dumps(obj, protocol=5, buffer_callback=buffers.append)
+
+    if not buffers:
+        return [pickle_str]
+
+    buffers = [buf.raw() for buf in buffers]
+    header = OOB_MAGIC + struct.pack(f'<{len(buffers) + 2}Q', len(buffers), len(pickle_str),
+                                     *[buf.nbytes for buf in buffers])
+    segments = [header, bytes(_oob_padding(len(header))), pickle_str]
+    for buf in [None] + buffers:
+        if buf is not None:
+            segments.append(buf)
+        size = len(pickle_str) if buf is None else buf.nbytes
+        if _oob_padding(size):
+            segments.append(bytes(_oob_padding(size)))
+
+    return segments
+
+
+def oob_loads(data):
+    """
+    Deserializes an object serialized with oob_dumps(). The buffers are
+    not copied, the reconstructed arrays point to the memory of data, so
+    they are read-only if data is immutable. Regular pickles are also
+    accepted.
+    """
+    data = memoryview(data)
+    if data[:len(OOB_MAGIC)] != OOB_MAGIC:
+        return pickle.loads(data)
+
+    offset = len(OOB_MAGIC)
+    num_buffers, pickle_size = struct.unpack_from('<2Q', data, offset)
+    buffer_sizes = struct.unpack_from(f'<{num_buffers}Q', data, offset + 16)
+    offset += 16 + 8 * num_buffers
+    offset += _oob_padding(offset)
+
+    pickle_str = data[offset:offset + pickle_size]
+    offset += pickle_size + _oob_padding(pickle_size)
+
+    buffers = []
+    for size in buffer_sizes:
+        buffers.append(data[offset:offset + size])
+        offset += size + _oob_padding(size)
+
+    return pickle.loads(pickle_str, buffers=buffers)
+
+
 def create_futures_list(futures, executor):
     """creates a new FuturesList an initiates its attrs"""
     fl = FuturesList(futures)
@@ -141,6 +211,11 @@ class FuturesList(list):
         fs_tt = self.alt_list if hasattr(self, 'alt_list') else self
         return self.executor.get_result(fs_tt, **kwargs)
 
+    def as_completed(self, **kwargs):
+        self._create_executor()
+        fs_tt = self.alt_list if hasattr(self, 'alt_list') else self
+        return self.executor.as_completed(fs_tt, **kwargs)
+
     def __reduce__(self):
         self.executor = None
         return super().__reduce__()
@@ -521,6 +596,17 @@ def format_data(iterdata, extra_args):
     return data
 
 
+def iter_windows(iterator, window_size):
+    """
+    Consumes an iterator in lists of at most window_size elements
+    """
+    while True:
+        window = list(itertools.islice(iterator, window_size))
+        if not window:
+            return
+        yield window
+
+
 def verify_args(func, iterdata, extra_args):
 
     if isinstance(iterdata, FuturesList):
@@ -22,7 +22,8 @@ import concurrent.futures as cf
 from functools import partial
 from types import SimpleNamespace
 from itertools import chain
-from typing import Optional, List, Union, Tuple, Any
+from collections import deque
+from typing import Optional, List, Union, Tuple, Any, Iterator
 
 from lithops.utils import is_unix_system, timeout_handler, \
     is_notebook, is_lithops_worker, FuturesList
@@ -225,6 +226,132 @@ def get_result(fs: Optional[Union[ResponseFuture, FuturesList, List[ResponseFutu
     return result
 
 
+def as_completed(fs: Union[ResponseFuture, FuturesList, List[ResponseFuture]],
+                 internal_storage: Optional[InternalStorage] = None,
+                 job_monitor: Optional[JobMonitor] = None,
+                 throw_except: Optional[bool] = True,
+                 download_results: Optional[bool] = True,
+                 max_in_flight: Optional[int] = THREADPOOL_SIZE,
+                 max_in_flight_bytes: Optional[int] = None,
+                 timeout: Optional[int] = None,
+                 wait_dur_sec: Optional[int] = None) -> Iterator[Tuple[ResponseFuture, Any]]:
+    """
+    Generator that yields the futures as their function activations complete, driven
+    by the job monitor. The outputs of the completed activations are downloaded
+    concurrently, up to max_in_flight outputs and max_in_flight_bytes bytes, and each
+    output is released from its future after it is yielded, so the results of a job
+    can be processed with bounded memory.
+
+    :param fs: Futures list. Default None
+    :param internal_storage: InternalStorage instance. Default None.
+    :param job_monitor: JobMonitor instance. Default None.
+    :param throw_except: Re-raise exception if call raised. Default True.
+    :param download_results: Download results. Default True. If False, only the statuses
+        are downloaded, and None is yielded as the result
+    :param max_in_flight: Maximum number of outputs being downloaded or waiting to be
+        yielded. Default 64
+    :param max_in_flight_bytes: Maximum size of the outputs being downloaded or waiting
+        to be yielded. Default None (unlimited)
+    :param timeout: Timeout of waiting for results.
+    :param wait_dur_sec: Time interval between each check. Default 1 second
+
+    :return: `(future, result)` tuples
+    """
+    if type(fs) is not list and type(fs) is not FuturesList:
+        fs = [fs]
+
+    if not fs:
+        return
+
+    executors_data = _create_executors_data_from_futures(fs, internal_storage)
+    storages = {executor_data.executor_id: executor_data.internal_storage
+                for executor_data in executors_data}
+
+    if not job_monitor:
+        for executor_data in executors_data:
+            job_monitor = JobMonitor(
+                executor_id=executor_data.executor_id,
+                internal_storage=executor_data.internal_storage)
+            job_monitor.start(fs=executor_data.futures)
+
+    sleep_sec = wait_dur_sec or WAIT_DUR_SEC if job_monitor.type == 'storage' \
+        and job_monitor.storage_backend != 'localhost' else 0.1
+
+    def get_data(f):
+        if f.executor_id not in storages:
+            storages[f.executor_id] = InternalStorage(f._storage_config)
+        internal_storage = storages[f.executor_id]
+        if download_results:
+            return f.result(throw_except=throw_except, internal_storage=internal_storage)
+        f.status(throw_except=throw_except, internal_storage=internal_storage)
+
+    def get_result_size(f):
+        return f._call_status.get('func_result_size', 0) if f._call_status else 0
+
+    logger.info(f'ExecutorID {fs[0].executor_id} - Waiting for {len(fs)} function activations to complete')
+
+    pending = list(fs)
+    completed = deque()
+    in_flight = {}
+    in_flight_bytes = 0
+    last_check = 0
+    start_time = time.time()
+
+    pool = cf.ThreadPoolExecutor(max_workers=max(1, max_in_flight))
+
+    try:
+        while pending or completed or in_flight:
+            if timeout is not None and time.time() - start_time > timeout:
+                raise TimeoutError(f'Timeout of {timeout} seconds exceeded waiting '
+                                   'for function activations to finish')
+
+            if not completed and time.time() - last_check >= sleep_sec:
+                # Only the futures that were still pending are checked again
+                still_pending = []
+                for f in pending:
+                    (completed if f.ready or f.success or f.done else still_pending).append(f)
+                pending = still_pending
+                last_check = time.time()
+
+            while completed and len(in_flight) < max_in_flight:
+                result_size = get_result_size(completed[0])
+                if in_flight and max_in_flight_bytes is not None \
+                   and in_flight_bytes + result_size > max_in_flight_bytes:
+                    break
+                f = completed.popleft()
+                in_flight[pool.submit(get_data, f)] = (f, result_size)
+                in_flight_bytes += result_size
+
+            if not in_flight:
+                time.sleep(max(0, sleep_sec - (time.time() - last_check)))
+                continue
+
+            done, _ = cf.wait(in_flight, timeout=sleep_sec, return_when=cf.FIRST_COMPLETED)
+            for task in done:
+                f, result_size = in_flight.pop(task)
+                in_flight_bytes -= result_size
+                result = task.result()
+
+                if f.futures:
+                    # The function returned new futures to wait for
+                    pending.extend(f._new_futures)
+                    continue
+
+                if download_results and not f._produce_output:
+                    continue
+
+                yield f, result
+
+                if download_results:
+                    f._call_output = None
+                    if f._call_status:
+                        f._call_status.pop('result', None)
+    finally:
+        for task in in_flight:
+            task.cancel()
+        pool.shutdown(wait=False)
+
+
 def _create_executors_data_from_futures(fs, internal_storage):
     """
     Creates a dummy job necessary for the job monitor
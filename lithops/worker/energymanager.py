@@ -143,27 +143,6 @@ class EnergyManager:
         
         return processor_info
     
-    def read_function_name_from_stats(self, stats_file):
-        """Read function name from stats file."""
-        if not os.path.exists(stats_file):
-            return None
-            
-        logger.info(f"Reading stats file for function name: {stats_file}")
-        try:
-            with open(stats_file, 'r') as fid:
-                for line in fid.readlines():
-                    try:
-                        key, value = line.strip().split(" ", 1)
-                        if key == 'function_name':
-                            self.function_name = value
-                            logger.info(f"Found function name in stats file: {self.function_name}")
-                            return self.function_name
-                    except Exception as e:
-                        logger.error(f"Error processing stats file line: {line} - {e}")
-        except Exception as e:
-            logger.error(f"Error reading stats file: {e}")
-        
-        return None
     def process_energy_data(self, task, call_status, cpu_info):
         """Process energy data from all monitors and add to call status."""
         
@@ -367,19 +346,16 @@ class EnergyManager:
         if non_zero_fields:
             logger.debug(f"Non-zero energy values: {non_zero_fields}")
     
-    def update_function_name(self, task, cpu_info, stats_file):
+    def update_function_name(self, task, cpu_info, function_name):
         """Update function name in energy data for all monitors if available."""
         if not any(self.monitor_status.values()):
             return
             
-        if not os.path.exists(stats_file):
-            logger.warning("Stats file not found for updating function name")
-            return
-            
-        function_name = self.read_function_name_from_stats(stats_file)
         if not function_name:
-            logger.warning("Function name not found in stats file for energy monitoring")
+            logger.warning("Function name not found in the JobRunner stats for energy monitoring")
             return
+
+        self.function_name = function_name
             
         logger.info(f"Updating function name in energy data: {function_name}")
         
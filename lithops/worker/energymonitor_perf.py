@@ -24,6 +24,9 @@ from .energymonitor_json_utils import store_energy_data_json, update_function_na
 
 logger = logging.getLogger(__name__)
 
+# Energy events that work with perf in this machine
+_working_energy_events = {}
+
 
 class EnergyMonitor:
     """
@@ -103,8 +106,10 @@ class EnergyMonitor:
         """Start monitoring energy consumption using perf."""
         print("\n==== STARTING ENERGY MONITORING ====")
         try:
-            # Find working energy events
-            self.energy_events_used = self._get_working_energy_events()
+            # Find working energy events, probed once per process
+            if 'events' not in _working_energy_events:
+                _working_energy_events['events'] = self._get_working_energy_events()
+            self.energy_events_used = _working_energy_events['events']
             
             if not self.energy_events_used:
                 print("❌ No working energy events found, cannot start monitoring")
@@ -15,13 +15,29 @@
 # limitations under the License.
 #
 
-import os
 import time
 import logging
 
+from lithops.worker.sampler import get_system_sampler, cpu_percent
+
 logger = logging.getLogger(__name__)
 
 
+_detailed_cpu_info = None
+
+
+def get_detailed_cpu_info():
+    """
+    Returns the CPU info of py-cpuinfo, which is slow to obtain and does not
+    change, so it is read once per process
+    """
+    global _detailed_cpu_info
+    if _detailed_cpu_info is None:
+        import cpuinfo
+        _detailed_cpu_info = cpuinfo.get_cpu_info()
+    return _detailed_cpu_info
+
+
 class EnergyMonitor:
     """
     PSUtil-based system resource monitor.
@@ -36,6 +52,7 @@ class EnergyMonitor:
         self.function_name = None
         self.initial_metrics = {}
         self.final_metrics = {}
+        self.sampler = get_system_sampler()
         
         logger.debug(f"PSUtil system monitor initialized for process {process_id}")
         
@@ -118,16 +135,16 @@ class EnergyMonitor:
                 metrics['cpu_freq_min'] = 0.0
             
             # === SYSTEM-WIDE METRICS ===
+            previous_sample = sample = None
             try:
-                # CPU usage - use non-blocking call first, then blocking call for accurate measurement
-                # First call initializes the measurement, second call gets the actual usage
-                psutil.cpu_percent(interval=None)  # Non-blocking call to initialize
-                time.sleep(0.5)  # Wait a bit for meaningful measurement
-                cpu_percent = psutil.cpu_percent(interval=None)  # Get the actual measurement
-                metrics['system_cpu_percent'] = cpu_percent
-                
-                # Also get per-CPU percentages for more detailed analysis
-                per_cpu_percent = psutil.cpu_percent(interval=None, percpu=True)
+                # CPU usage over the monitored window, or over the last sampling
+                # interval at start, from the samples of the system sampler
+                sample = self.sampler.sample()
+                previous_sample = self.initial_metrics.get('sample') or \
+                    self.sampler.find(sample.timestamp - self.sampler.interval)
+                per_cpu_percent = cpu_percent(previous_sample, sample)
+                metrics['sample'] = sample
+                metrics['system_cpu_percent'] = sum(per_cpu_percent) / len(per_cpu_percent) if per_cpu_percent else 0.0
                 metrics['per_cpu_percent'] = per_cpu_percent
                 metrics['max_cpu_percent'] = max(per_cpu_percent) if per_cpu_percent else 0.0
                 metrics['avg_cpu_percent'] = sum(per_cpu_percent) / len(per_cpu_percent) if per_cpu_percent else 0.0
@@ -192,11 +209,25 @@ class EnergyMonitor:
             try:
                 process = psutil.Process(self.process_id)
                 
-                # Process CPU and memory - use non-blocking for process too
-                process.cpu_percent()  # Initialize measurement
-                time.sleep(0.2)  # Short wait for process measurement
-                process_cpu = process.cpu_percent()
+                # Process CPU usage over the monitored window. At start, the
+                # usage over the same sampling interval as the system CPU
+                # usage, from the CPU times of the sampler process
+                process_cpu_time = sum(process.cpu_times()[:2])
+                timestamp = time.time()
+                if self.initial_metrics:
+                    start_cpu_time = self.initial_metrics.get('process_cpu_time', 0.0)
+                    start_tstamp = self.initial_metrics.get('process_tstamp', timestamp)
+                    elapsed = timestamp - start_tstamp
+                    process_cpu = 100 * (process_cpu_time - start_cpu_time) / elapsed if elapsed > 0 else 0.0
+                elif previous_sample and self.process_id == self.sampler.pid:
+                    elapsed = sample.timestamp - previous_sample.timestamp
+                    process_cpu = 100 * (sample.process - previous_sample.process) / elapsed if elapsed > 0 else 0.0
+                else:
+                    # The CPU times of other processes are not sampled
+                    process_cpu = 0.0
                 metrics['process_cpu_percent'] = process_cpu
+                metrics['process_cpu_time'] = process_cpu_time
+                metrics['process_tstamp'] = timestamp
                 
                 process_memory = process.memory_info()
                 metrics['process_memory_rss_mb'] = process_memory.rss / (1024 * 1024)
@@ -246,8 +277,7 @@ class EnergyMonitor:
             
             # === DETAILED CPU INFO (if py-cpuinfo available) ===
             try:
-                import cpuinfo
-                cpu_info = cpuinfo.get_cpu_info()
+                cpu_info = get_detailed_cpu_info()
                 metrics['cpu_brand'] = cpu_info.get('brand_raw', 'Unknown')
                 metrics['cpu_model'] = cpu_info.get('cpu_info_ver_info', {}).get('model_name', 'Unknown')
                 metrics['cpu_arch'] = cpu_info.get('arch', 'Unknown')
@@ -434,25 +464,3 @@ class EnergyMonitor:
         """Update the function name."""
         self.function_name = function_name
         logger.debug(f"PSUtil monitor function name updated to: {function_name}")
-        
-    def read_function_name_from_stats(self, stats_file):
-        """Read function name from stats file."""
-        if not os.path.exists(stats_file):
-            logger.warning(f"Stats file not found: {stats_file}")
-            return False
-        
-        try:
-            with open(stats_file, 'r') as fid:
-                for line in fid.readlines():
-                    try:
-                        key, value = line.strip().split(" ", 1)
-                        if key == 'function_name':
-                            self.function_name = value
-                            logger.info(f"PSUtil monitor found function name: {self.function_name}")
-                            return True
-                    except Exception as e:
-                        logger.debug(f"Error processing stats file line: {line} - {e}")
-        except Exception as e:
-            logger.error(f"Error reading stats file: {e}")
-            
-        return False
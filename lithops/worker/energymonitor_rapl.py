@@ -15,11 +15,9 @@
 # limitations under the License.
 #
 
-import os
-import time
-import glob
 import logging
 from .energymonitor_json_utils import store_energy_data_json, update_function_name
+from .sampler import get_system_sampler, rapl_energy
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +38,8 @@ class EnergyMonitor:
         self.function_name = None
         self.rapl_pkg_files = []
         self.rapl_cores_files = []
+        self.start_sample = None
+        self.sampler = get_system_sampler()
         
         # Print directly to terminal for debugging
         print(f"\n==== RAPL ENERGY MONITOR INITIALIZED FOR PROCESS {process_id} ====")
@@ -48,52 +48,15 @@ class EnergyMonitor:
         self._find_rapl_files()
         
     def _find_rapl_files(self):
-        """Find available RAPL energy files."""
+        """Get the RAPL energy files read by the system sampler."""
         print("\n==== FINDING RAPL ENERGY FILES ====")
-        
-        # Look for package energy files (main CPU energy)
-        pkg_patterns = [
-            '/sys/class/powercap/intel-rapl:*/energy_uj',
-            '/sys/class/powercap/intel-rapl:*:*/energy_uj'
-        ]
-        
-        for pattern in pkg_patterns:
-            files = glob.glob(pattern)
-            for file in files:
-                try:
-                    # Test if we can read the file
-                    with open(file, 'r') as f:
-                        value = f.read().strip()
-                        int(value)  # Verify it's a valid number
-                    
-                    # Determine if it's a package or core file
-                    if ':0:' in file or file.endswith(':0/energy_uj'):
-                        # This is likely a core/uncore file
-                        self.rapl_cores_files.append(file)
-                        print(f"✅ Found RAPL cores file: {file}")
-                    else:
-                        # This is likely a package file
-                        self.rapl_pkg_files.append(file)
-                        print(f"✅ Found RAPL package file: {file}")
-                        
-                except Exception as e:
-                    print(f"❌ Cannot read RAPL file {file}: {e}")
-        
+
+        self.rapl_pkg_files = self.sampler.rapl_pkg_files
+        self.rapl_cores_files = self.sampler.rapl_cores_files
+
         print(f"Total RAPL package files: {len(self.rapl_pkg_files)}")
         print(f"Total RAPL cores files: {len(self.rapl_cores_files)}")
-        
-    def _read_rapl_energy(self, files):
-        """Read energy from RAPL files and return total in microjoules."""
-        total_energy = 0
-        for file in files:
-            try:
-                with open(file, 'r') as f:
-                    value = int(f.read().strip())
-                    total_energy += value
-            except Exception as e:
-                print(f"❌ Error reading {file}: {e}")
-        return total_energy
-        
+
     def start(self):
         """Start monitoring energy consumption using RAPL."""
         print("\n==== STARTING RAPL ENERGY MONITORING ====")
@@ -103,13 +66,10 @@ class EnergyMonitor:
             return False
         
         try:
-            self.start_time = time.time()
-            self.start_energy_pkg = self._read_rapl_energy(self.rapl_pkg_files)
-            self.start_energy_cores = self._read_rapl_energy(self.rapl_cores_files)
+            self.start_sample = self.sampler.sample()
+            self.start_time = self.start_sample.timestamp
             
             print(f"✅ RAPL monitoring started at: {self.start_time}")
-            print(f"Initial package energy: {self.start_energy_pkg} microjoules")
-            print(f"Initial cores energy: {self.start_energy_cores} microjoules")
             return True
             
         except Exception as e:
@@ -125,20 +85,20 @@ class EnergyMonitor:
             return
             
         try:
-            self.end_time = time.time()
-            self.end_energy_pkg = self._read_rapl_energy(self.rapl_pkg_files)
-            self.end_energy_cores = self._read_rapl_energy(self.rapl_cores_files)
+            end_sample = self.sampler.sample()
+            self.end_time = end_sample.timestamp
+
+            # Energy consumed by each RAPL file, accounting for the counter
+            # wraparounds seen by the sampler
+            energy = dict(zip(self.sampler.rapl_files, rapl_energy(self.sampler, self.start_sample, end_sample)))
+            pkg_diff = sum(energy[file] for file in self.rapl_pkg_files)
+            cores_diff = sum(energy[file] for file in self.rapl_cores_files)
+            self.start_energy_pkg, self.start_energy_cores = 0, 0
+            self.end_energy_pkg, self.end_energy_cores = pkg_diff, cores_diff
             
             duration = self.end_time - self.start_time
             print(f"RAPL monitoring stopped at: {self.end_time}")
             print(f"Monitoring duration: {duration:.2f} seconds")
-            print(f"Final package energy: {self.end_energy_pkg} microjoules")
-            print(f"Final cores energy: {self.end_energy_cores} microjoules")
-            
-            # Calculate energy differences
-            pkg_diff = self.end_energy_pkg - self.start_energy_pkg
-            cores_diff = self.end_energy_cores - self.start_energy_cores
-            
             print(f"Package energy consumed: {pkg_diff} microjoules ({pkg_diff / 1000000:.6f} Joules)")
             print(f"Cores energy consumed: {cores_diff} microjoules ({cores_diff / 1000000:.6f} Joules)")
             
@@ -24,26 +24,32 @@ import uuid
 import base64
 import pickle
 import logging
+import tempfile
 import traceback
 import multiprocessing as mp
 from queue import Queue, Empty
 from threading import Thread
+from itertools import accumulate
 from multiprocessing import Process, Pipe
+from multiprocessing.shared_memory import SharedMemory
 from tblib import pickling_support
 from types import SimpleNamespace
-from multiprocessing.managers import SyncManager
 
 from lithops.version import __version__
 from lithops.config import extract_storage_config
 from lithops.storage import InternalStorage
-from lithops.worker.jobrunner import JobRunner
-from lithops.worker.utils import LogStream, custom_redirection, \
-    get_function_and_modules, get_function_data
-from lithops.constants import JOBS_PREFIX, LITHOPS_TEMP_DIR, MODULES_DIR
-from lithops.utils import setup_lithops_logger, is_unix_system
-from lithops.worker.status import create_call_status
+from lithops.storage.utils import create_logs_key
+from lithops.worker.jobrunner import JobRunner, JobRunnerProcess, JobStats, receive_stats
+from lithops.worker.utils import LogStream, LogCapture, custom_redirection, \
+    get_function_and_modules, get_function_data, read_logs
+from lithops.constants import JOBS_PREFIX, LITHOPS_TEMP_DIR, JOBRUNNER_MAX_TASKS, PREFETCH_MAX_SIZE, \
+    LOG_HEAD_SIZE, LOG_TAIL_SIZE, SAMPLING_INTERVAL, SAMPLING_BUFFER_SIZE
+from lithops.utils import setup_lithops_logger, is_unix_system, bytes_to_b64str
+from lithops.worker.status import create_call_status, status_manifest
 from lithops.worker.utils import SystemMonitor
+from lithops.worker.sampler import get_system_sampler
 from lithops.worker.energymanager import EnergyManager
+from lithops.worker.prefetch import ObjectPrefetcher
 from lithops.worker.processor_info import add_processor_info_to_task
 
 pickling_support.install()
@@ -58,6 +64,64 @@ class ShutdownSentinel:
     pass
 
 
+class SharedWorkQueue:
+    """
+    Work queue of the calls of a job, shared by the worker processes. The job
+    is published once to each process, the data of the calls is stored in a
+    shared memory segment, and the processes take the next call by
+    incrementing a shared index. It exposes the get() method of a Queue, so
+    python_queue_consumer can consume it.
+    """
+
+    def __init__(self, job, data):
+        self.job = job
+        self.call_ids = job.call_ids
+        self.offsets = list(accumulate([len(d) for d in data], initial=0))
+        self.shm = SharedMemory(create=True, size=max(self.offsets[-1], 1))
+        for i, call_data in enumerate(data):
+            self.shm.buf[self.offsets[i]:self.offsets[i + 1]] = call_data
+        self.next_call = mp.Value('q', 0)
+
+    def get(self, block=True):
+        with self.next_call.get_lock():
+            index = self.next_call.value
+            self.next_call.value += 1
+
+        if index >= len(self.call_ids):
+            return ShutdownSentinel()
+
+        data = bytearray(self.shm.buf[self.offsets[index]:self.offsets[index + 1]])
+        return self.job, self.call_ids[index], data
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Persistent JobRunner process of this worker process, in case of jobrunner_pool
+jobrunner_process = None
+
+
+def get_jobrunner_process(task):
+    """
+    Returns the persistent JobRunner process for the function of a task,
+    recycling the current one if it runs another function or is exhausted
+    """
+    global jobrunner_process
+
+    if jobrunner_process is not None and \
+       (jobrunner_process.func_key != task.func_key or jobrunner_process.exhausted):
+        logger.debug('Recycling JobRunner process')
+        jobrunner_process.terminate()
+        jobrunner_process = None
+
+    if jobrunner_process is None:
+        max_tasks = task.config['lithops'].get('jobrunner_max_tasks', JOBRUNNER_MAX_TASKS)
+        jobrunner_process = JobRunnerProcess(task.func_key, max_tasks)
+
+    return jobrunner_process
+
+
 def create_job(payload: dict) -> SimpleNamespace:
     job = SimpleNamespace(**payload)
     storage_config = extract_storage_config(job.config)
@@ -79,41 +143,83 @@ def function_handler(payload):
     logger.info(f'Tasks received: {len(job.call_ids)} - Worker processes: {worker_processes}')
 
     if worker_processes == 1:
+        prefetcher = None
+        prefetch_depth = job.config['lithops'].get('prefetch_depth', 0)
+        if getattr(job, 'object_processing', False) and prefetch_depth > 0:
+            max_size = job.config['lithops'].get('prefetch_max_size', PREFETCH_MAX_SIZE)
+            prefetcher = ObjectPrefetcher(job, prefetch_depth, max_size)
+
         work_queue = Queue()
         for call_id in job.call_ids:
             data = job.data.pop(0)
             work_queue.put((job, call_id, data))
         work_queue.put(ShutdownSentinel())
-        python_queue_consumer(0, work_queue, )
+
+        if prefetcher is not None:
+            python_queue_consumer(0, work_queue, prefetcher.prepare_task, prefetcher.release_task)
+            prefetcher.stop()
+        else:
+            python_queue_consumer(0, work_queue, )
     else:
-        manager = SyncManager()
-        manager.start()
-        work_queue = manager.Queue()
+        data, job.data = job.data, None
+        work_queue = SharedWorkQueue(job, data)
+        del data
         job_runners = []
 
-        for call_id in job.call_ids:
-            data = job.data.pop(0)
-            work_queue.put((job, call_id, data))
-
-        for pid in range(worker_processes):
-            work_queue.put(ShutdownSentinel())
-            p = mp.Process(target=python_queue_consumer, args=(pid, work_queue,))
-            job_runners.append(p)
-            p.start()
-
-        for runner in job_runners:
-            runner.join()
+        try:
+            for pid in range(worker_processes):
+                p = mp.Process(target=python_queue_consumer, args=(pid, work_queue,))
+                job_runners.append(p)
+                p.start()
 
-        manager.shutdown()
+            for runner in job_runners:
+                runner.join()
+        finally:
+            # Unlink the shared memory segment even if a process fails to start
+            work_queue.close()
 
     # Delete modules path from syspath
-    module_path = os.path.join(MODULES_DIR, job.job_key)
-    if module_path in sys.path:
-        sys.path.remove(module_path)
+    if job.module_path in sys.path:
+        sys.path.remove(job.module_path)
 
     os.environ.pop('__LITHOPS_TOTAL_EXECUTORS', None)
 
 
+def add_logs_to_call_status(task, call_status, internal_storage):
+    """
+    Adds the head and the tail of the execution log to the call status. The
+    full log is uploaded as a separate object if requested, or if the call
+    failed and its log was truncated
+    """
+    head_size = task.config['lithops'].get('log_head_size', LOG_HEAD_SIZE) * 1024
+    tail_size = task.config['lithops'].get('log_tail_size', LOG_TAIL_SIZE) * 1024
+    upload_logs = task.config['lithops'].get('upload_logs', False)
+
+    with tempfile.TemporaryFile(dir=task.task_dir) as log_file:
+        upload = upload_logs or call_status.status['exception']
+        head, tail, total_size = read_logs(task.task_dir, head_size, tail_size, log_file if upload else None)
+        truncated_size = total_size - len(head) - len(tail)
+        upload = upload_logs or (upload and truncated_size > 0)
+
+        if upload:
+            logs_key = create_logs_key(task.executor_id, task.job_id, task.call_id)
+            log_file.seek(0)
+            internal_storage.storage.put_object(internal_storage.bucket, logs_key, log_file)
+            call_status.add('logs_key', logs_key)
+
+    logs = head
+    if truncated_size > 0:
+        msg = f'\n[... {truncated_size} bytes of logs truncated'
+        if upload:
+            msg += f', run "lithops logs get {task.job_key} --full" to get them'
+        logs += (msg + ' ...]\n').encode()
+    logs += tail
+
+    if logs:
+        call_status.add('logs', base64.b64encode(zlib.compress(logs)).decode())
+    call_status.add('worker_logs_size', total_size)
+
+
 def python_queue_consumer(pid, work_queue, initializer=None, callback=None):
     """
     Listens to the job_queue and executes the individual job tasks
@@ -140,6 +246,8 @@ def python_queue_consumer(pid, work_queue, initializer=None, callback=None):
 
         callback(pid, task) if callback is not None else None
 
+    status_manifest.flush()
+
     logger.info(f'Worker process {pid} finished')
 
 
@@ -157,12 +265,11 @@ def prepare_and_run_task(task):
     storage_backend = task.config['lithops']['storage']
     bucket = task.config[storage_backend]['storage_bucket']
     task.task_dir = os.path.join(LITHOPS_TEMP_DIR, bucket, JOBS_PREFIX, task.job_key, task.call_id)
-    task.log_file = os.path.join(task.task_dir, 'execution.log')
-    task.stats_file = os.path.join(task.task_dir, 'job_stats.txt')
     os.makedirs(task.task_dir, exist_ok=True)
 
-    with open(task.log_file, 'a') as log_strem:
-        task.log_stream = LogStream(log_strem)
+    with LogCapture(task.task_dir) as log_capture:
+        task.log_capture = log_capture
+        task.log_stream = LogStream(log_capture)
         with custom_redirection(task.log_stream):
             run_task(task)
 
@@ -209,29 +316,50 @@ def run_task(task):
         # send init status event
         call_status.send_init_event()
 
-        handler_conn, jobrunner_conn = Pipe()
-        jobrunner = JobRunner(task, jobrunner_conn, internal_storage)
-        logger.debug('Starting JobRunner process')
-        jrp = Process(target=jobrunner.run) if is_unix_system() else Thread(target=jobrunner.run)
+        jobrunner_pool = task.config['lithops'].get('jobrunner_pool', False) and is_unix_system()
+        if jobrunner_pool:
+            logger.debug('Using the persistent JobRunner process')
+            jrp = get_jobrunner_process(task)
+        else:
+            handler_conn, jobrunner_conn = Pipe()
+            jobrunner = JobRunner(task, jobrunner_conn, internal_storage)
+            logger.debug('Starting JobRunner process')
+            jrp = Process(target=jobrunner.run) if is_unix_system() else Thread(target=jobrunner.run)
+
+        # The JobRunner process logs to the next segment of the log, and the
+        # handler moves past it once the JobRunner process finishes
+        task.log_capture.next_segment()
+        task.log_sequence = task.log_capture.sequence
 
         process_id = os.getpid() if is_unix_system() else mp.current_process().pid
+        get_system_sampler(task.config['lithops'].get('sampling_interval', SAMPLING_INTERVAL),
+                           task.config['lithops'].get('sampling_buffer_size', SAMPLING_BUFFER_SIZE))
         sys_monitor = SystemMonitor(process_id)
         
         ##~~ENERGY~~##
         # Initialize energy manager
         energy_manager = EnergyManager(process_id)
         
-        # Read function name from stats file if it exists
-        energy_manager.read_function_name_from_stats(task.stats_file)
-        
         # Start monitoring
         sys_monitor.start()
         energy_manager.start()
         
         # Start and wait for the job
-        jrp.start()
-        jrp.join(task.execution_timeout)
-        
+        if jobrunner_pool:
+            stats = jrp.run(task, task.execution_timeout)
+            timed_out = stats is None and jrp.is_alive()
+        else:
+            start_tstamp = time.time()
+            jrp.start()
+            if is_unix_system():
+                # Close the handler copy, so the pipe breaks if the JobRunner process dies
+                jobrunner_conn.close()
+            stats = receive_stats(handler_conn, task.execution_timeout)
+            jrp.join(max(0, task.execution_timeout - (time.time() - start_tstamp)))
+            timed_out = jrp.is_alive()
+
+        task.log_capture.next_segment()
+
         # Stop monitoring
         sys_monitor.stop()
         energy_manager.stop()
@@ -258,7 +386,7 @@ def run_task(task):
         energy_manager.process_energy_data(task, call_status, cpu_info)
         #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-        if jrp.is_alive():
+        if timed_out:
             # If process is still alive after jr.join(job_max_runtime), kill it
             try:
                 jrp.terminate()
@@ -269,7 +397,7 @@ def run_task(task):
                    'killed'.format(task.execution_timeout))
             raise TimeoutError('HANDLER', msg)
 
-        if not handler_conn.poll():
+        if stats is None:
             logger.error('No completion message received from JobRunner process')
             logger.debug('Assuming memory overflow...')
             # Only 1 message is returned by jobrunner when it finishes.
@@ -278,22 +406,17 @@ def run_task(task):
             msg = 'Function exceeded maximum memory and was killed'
             raise MemoryError('HANDLER', msg)
 
-        ##~~ENERGY~~##
-        # # Process stats file
-        if os.path.exists(task.stats_file):
-            with open(task.stats_file, 'r') as fid:
-                for line in fid.readlines():
-                    key, value = line.strip().split(" ", 1)
-                    try:
-                        call_status.add(key, float(value))
-                    except Exception:
-                        call_status.add(key, value)
-                    if key in ['exception', 'exc_pickle_fail']:
-                        call_status.add(key, eval(value))
+        # Process the stats of the JobRunner. The pickled results, futures
+        # and exceptions are carried as raw bytes
+        stats = JobStats.loads(stats)
+        for key, value in stats.items():
+            if isinstance(value, bytes):
+                value = bytes_to_b64str(value)
+            call_status.add(key, value)
 
         ##~~ENERGY~~##
         # Update function name in energy data if available
-        energy_manager.update_function_name(task, cpu_info, task.stats_file)
+        energy_manager.update_function_name(task, cpu_info, stats.get('function_name'))
 
     except KeyboardInterrupt:
         job_interruped = True
@@ -308,18 +431,15 @@ def run_task(task):
 
         pickled_exc = pickle.dumps(sys.exc_info())
         pickle.loads(pickled_exc)  # this is just to make sure they can be unpickled
-        call_status.add('exc_info', str(pickled_exc))
+        call_status.add('exc_info', bytes_to_b64str(pickled_exc))
 
     finally:
         if not job_interruped:
             call_status.add('worker_end_tstamp', time.time())
 
-            # Flush log stream and save it to the call status
+            # Flush log stream and save its head and tail to the call status
             task.log_stream.flush()
-            if os.path.isfile(task.log_file):
-                with open(task.log_file, 'rb') as lf:
-                    log_str = base64.b64encode(zlib.compress(lf.read())).decode()
-                    call_status.add('logs', log_str)
+            add_logs_to_call_status(task, call_status, internal_storage)
 
             call_status.send_finish_event()
 
@@ -34,6 +34,8 @@ def function_invoker(job_payload):
     """
     config = job_payload['config']
     job = SimpleNamespace(**job_payload['job'])
+    # Start times of the remote invokers from the root of the invocation tree
+    job.remote_invoker_tstamps = getattr(job, 'remote_invoker_tstamps', []) + [time.time()]
 
     env = {'LITHOPS_WORKER': 'True', 'PYTHONUNBUFFERED': 'True',
            '__LITHOPS_SESSION_ID': job.job_key}
@@ -81,6 +83,15 @@ class FaaSRemoteInvoker(FaaSInvoker):
         """
         Run a job
         """
+        if len(self._split_call_ids_range(job)) > 1:
+            # Inner node of the invocation tree
+            start = time.time()
+            self._invoke_job_remote(job)
+            logger.info(f'Remote Invoker Finished - Level {len(job.remote_invoker_tstamps)} - '
+                        f'Calls {job.call_ids_range[0]}-{job.call_ids_range[1] - 1} - '
+                        f'Children invoked in {round(time.time() - start, 3)}s')
+            return
+
         futures = self._run_job(job)
         self.job_monitor.start(
             fs=futures,
@@ -19,16 +19,20 @@ import os
 import io
 import sys
 import ast
+import json
 import pika
 import time
+import struct
 import pickle
 import logging
 import inspect
 import requests
 import traceback
 from pydoc import locate
+from types import SimpleNamespace
+from multiprocessing import Process, Pipe
 
-from lithops.worker.utils import peak_memory
+from lithops.worker.utils import peak_memory, get_shared_arg, LogStream, LogCapture, custom_redirection
 
 try:
     import numpy as np
@@ -36,50 +40,140 @@ try:
 except ModuleNotFoundError:
     pass
 
-from lithops.storage import Storage
+from lithops.storage import Storage, InternalStorage
+from lithops.config import extract_storage_config
 from lithops.wait import wait
 from lithops.future import ResponseFuture
-from lithops.utils import WrappedStreamingBody, sizeof_fmt, \
-    is_object_processing_function, FuturesList, verify_args
+from lithops.utils import WrappedStreamingBody, sizeof_fmt, setup_lithops_logger, \
+    is_object_processing_function, FuturesList, verify_args, oob_dumps, oob_loads
 from lithops.utils import WrappedStreamingBodyPartition
 from lithops.util.metrics import PrometheusExporter
-from lithops.storage.utils import create_output_key
+from lithops.util.codecs import compress
+from lithops.storage.utils import create_output_key, create_result_cache_key, SharedArgument
 
 logger = logging.getLogger(__name__)
 
 
 class JobStats:
+    """
+    Stats of a call, sent to the handler as a single typed, length-prefixed
+    binary message through the JobRunner pipe. Each stat is encoded as the
+    key length, the value type, the key and the value. Strings, bytes and
+    other objects are prefixed with their length, and bytes are carried raw.
+    """
+    NONE, BOOL, INT, FLOAT, STR, BYTES, PICKLE = range(7)
 
-    def __init__(self, stats_filename):
-        self.stats_filename = stats_filename
-        self.stats_fid = open(stats_filename, 'w')
+    def __init__(self):
+        self.stats = {}
 
     def write(self, key, value):
-        self.stats_fid.write("{} {}\n".format(key, value))
-        self.stats_fid.flush()
+        self.stats[key] = value
+
+    def dumps(self):
+        """
+        Encodes the stats
+        :return: binary stats message
+        """
+        message = bytearray()
+        for key, value in self.stats.items():
+            key = key.encode()
+            if value is None:
+                vtype, value = JobStats.NONE, b''
+            elif isinstance(value, bool):
+                vtype, value = JobStats.BOOL, struct.pack('<?', value)
+            elif isinstance(value, int) and -2**63 <= value < 2**63:
+                vtype, value = JobStats.INT, struct.pack('<q', value)
+            elif isinstance(value, float):
+                vtype, value = JobStats.FLOAT, struct.pack('<d', value)
+            elif isinstance(value, str):
+                vtype, value = JobStats.STR, value.encode()
+            elif isinstance(value, (bytes, bytearray, memoryview)):
+                vtype = JobStats.BYTES
+            else:
+                vtype, value = JobStats.PICKLE, pickle.dumps(value)
+            message += struct.pack('<HBI', len(key), vtype, len(value))
+            message += key
+            message += value
+        return bytes(message)
+
+    @staticmethod
+    def loads(message):
+        """
+        Decodes a binary stats message
+        :return: dict of stats
+        """
+        stats = {}
+        message = memoryview(message)
+        offset = 0
+        header_size = struct.calcsize('<HBI')
+        while offset < len(message):
+            key_size, vtype, value_size = struct.unpack_from('<HBI', message, offset)
+            offset += header_size
+            key = bytes(message[offset:offset + key_size]).decode()
+            offset += key_size
+            value = message[offset:offset + value_size]
+            offset += value_size
+            if vtype == JobStats.NONE:
+                stats[key] = None
+            elif vtype == JobStats.BOOL:
+                stats[key] = struct.unpack('<?', value)[0]
+            elif vtype == JobStats.INT:
+                stats[key] = struct.unpack('<q', value)[0]
+            elif vtype == JobStats.FLOAT:
+                stats[key] = struct.unpack('<d', value)[0]
+            elif vtype == JobStats.STR:
+                stats[key] = bytes(value).decode()
+            elif vtype == JobStats.BYTES:
+                stats[key] = bytes(value)
+            else:
+                stats[key] = pickle.loads(value)
+        return stats
 
-    def __del__(self):
-        self.stats_fid.close()
+
+def receive_stats(handler_conn, timeout):
+    """
+    Waits for the stats message of a JobRunner
+    :return: binary stats message, or None if the JobRunner timed out or died
+    """
+    if not handler_conn.poll(timeout):
+        return None
+    try:
+        return handler_conn.recv_bytes()
+    except EOFError:
+        return None
 
 
 class JobRunner:
 
-    def __init__(self, job, jobrunner_conn, internal_storage):
+    def __init__(self, job, jobrunner_conn, internal_storage, func=None):
         self.job = job
         self.jobrunner_conn = jobrunner_conn
         self.internal_storage = internal_storage
         self.lithops_config = job.config
+        self.func = func
 
         self.output_key = create_output_key(job.executor_id, job.job_id, job.call_id)
 
+        self.result_cache_arg_hash = None
+        if getattr(job, 'result_cache_arg_hashes', None):
+            self.result_cache_arg_hash = job.result_cache_arg_hashes[job.call_id]
+
         # Setup stats class
-        self.stats = JobStats(self.job.stats_file)
+        self.stats = JobStats()
 
         # Setup prometheus for live metrics
         prom_enabled = self.lithops_config['lithops'].get('telemetry')
         prom_config = self.lithops_config.get('prometheus', {})
         self.prometheus = PrometheusExporter(prom_enabled, prom_config)
 
+    def _load_shared_args(self, data):
+        """
+        Replaces the shared argument references with their values
+        """
+        for key, value in data.items():
+            if isinstance(value, SharedArgument):
+                data[key] = get_shared_arg(value, self.internal_storage)
+
     def _fill_optional_args(self, function, data):
         """
         Fills in those reserved, optional parameters that might be write to the function signature
@@ -130,8 +224,14 @@ class JobRunner:
         """
         extra_get_args = {}
         obj = data['obj']
+        prefetch_file = getattr(self.job, 'prefetch_file', None)
+
+        if prefetch_file:
+            logger.info(f'Getting dataset from the prefetched partition {prefetch_file}')
+            stream = open(prefetch_file, 'rb')
+            stream_body = stream
 
-        if hasattr(obj, 'bucket') and not hasattr(obj, 'path'):
+        elif hasattr(obj, 'bucket') and not hasattr(obj, 'path'):
             logger.info(f'Getting dataset from {obj.backend}://{obj.bucket}/{obj.key}')
             if obj.backend == self.internal_storage.backend:
                 storage = self.internal_storage.storage
@@ -203,12 +303,17 @@ class JobRunner:
         self.stats.write('worker_peak_memory_start', peak_memory())
         logger.debug("Process started")
         result = None
+        pickled_output = b''
+        new_futures = False
         exception = False
         fn_name = None
 
         try:
-            func = pickle.loads(self.job.func)
-            data = pickle.loads(self.job.data)
+            if self.func is None:
+                self.func = pickle.loads(self.job.func)
+            func = self.func
+            data = oob_loads(self.job.data)
+            self._load_shared_args(data)
 
             if ast.literal_eval(os.environ.get('__LITHOPS_REDUCE_JOB', 'False')):
                 self._wait_futures(data)
@@ -252,10 +357,15 @@ class JobRunner:
                 if isinstance(result, ResponseFuture) or isinstance(result, FuturesList) \
                    or (type(result) is list and len(result) > 0 and isinstance(result[0], ResponseFuture)):
                     self.stats.write('new_futures', pickle.dumps(result))
+                    new_futures = True
                     result = None
                 else:
                     logger.debug("Pickling result")
-                    pickled_output = pickle.dumps(result)
+                    if self.job.config['lithops'].get('oob_serialization', False):
+                        pickled_output = b''.join(oob_dumps(result))
+                    else:
+                        pickled_output = pickle.dumps(result)
+                    pickled_output = compress(pickled_output, self.job.payload_codec)
                     pickled_output_size = len(pickled_output)
                     self.stats.write('func_result_size', pickled_output_size)
                     if pickled_output_size < 8 * 1024:  # 8KB
@@ -275,7 +385,7 @@ class JobRunner:
                 logger.debug("Pickling exception")
                 pickled_exc = pickle.dumps((exc_type, exc_value, exc_traceback))
                 pickle.loads(pickled_exc)  # this is just to make sure they can be unpickled
-                self.stats.write("exc_info", str(pickled_exc))
+                self.stats.write("exc_info", pickled_exc)
 
             except Exception as pickle_exception:
                 # Shockingly often, modules like subprocess don't properly
@@ -289,7 +399,7 @@ class JobRunner:
                                             'exc_traceback': exc_traceback,
                                             'pickle_exception': pickle_exception})
                 pickle.loads(pickled_exc)  # this is just to make sure it can be unpickled
-                self.stats.write("exc_info", str(pickled_exc))
+                self.stats.write("exc_info", pickled_exc)
 
         finally:
             # self.stats.write('worker_jobrunner_end_tstamp', time.time())
@@ -311,5 +421,88 @@ class JobRunner:
                 self.internal_storage.put_data(self.output_key, pickled_output)
                 output_upload_end_tstamp = time.time()
                 self.stats.write("worker_result_upload_time", round(output_upload_end_tstamp - output_upload_start_tstamp, 8))
-            self.jobrunner_conn.send("Finished")
+            if self.result_cache_arg_hash and not exception and not new_futures:
+                # An empty output means that the function returned None
+                cache_key = create_result_cache_key(self.job.result_cache_func_hash,
+                                                    self.result_cache_arg_hash, time.time())
+                self.internal_storage.put_data(cache_key, pickled_output)
+            # Logged before the stats are sent, so the handler finds it in the log
             logger.info("Process finished")
+            self.jobrunner_conn.send_bytes(self.stats.dumps())
+
+
+class JobRunnerProcess:
+    """
+    Persistent process that runs the tasks of a function one after the
+    other, so that the function is unpickled and its modules are imported
+    only once. The process is recycled after max_tasks tasks, and when a
+    task times out or kills it
+    """
+
+    def __init__(self, func_key, max_tasks):
+        self.func_key = func_key
+        self.max_tasks = max_tasks
+        self.total_tasks = 0
+        self.handler_conn, jobrunner_conn = Pipe()
+        self.process = Process(target=run_jobrunner_process, args=(jobrunner_conn,), daemon=True)
+        self.process.start()
+        jobrunner_conn.close()
+
+    @property
+    def exhausted(self):
+        return self.total_tasks >= self.max_tasks or not self.process.is_alive()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def run(self, task, timeout):
+        """
+        Sends a task to the process and waits for it to finish
+
+        :return: binary stats message, or None if the task timed out or the process died
+        """
+        job_data = {key: value for key, value in vars(task).items() if key not in ('log_stream', 'log_capture')}
+        self.total_tasks += 1
+        self.handler_conn.send((SimpleNamespace(**job_data), dict(os.environ), list(sys.path)))
+
+        return receive_stats(self.handler_conn, timeout)
+
+    def terminate(self):
+        self.handler_conn.close()
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+
+def run_jobrunner_process(jobrunner_conn):
+    """
+    Main loop of a persistent JobRunner process. The environment, the
+    python path and the log redirection of the handler are replayed for
+    each task
+    """
+    sys.stdout = sys.__stdout__
+    sys.stderr = sys.__stderr__
+    func = None
+    storages = {}
+
+    while True:
+        try:
+            job, env, path = jobrunner_conn.recv()
+        except EOFError:
+            break
+
+        os.environ.clear()
+        os.environ.update(env)
+        sys.path[:] = path
+
+        storage_config = extract_storage_config(job.config)
+        storage_key = json.dumps(storage_config, sort_keys=True)
+        if storage_key not in storages:
+            storages[storage_key] = InternalStorage(storage_config)
+
+        with LogCapture(job.task_dir, job.log_sequence) as log_capture:
+            with custom_redirection(LogStream(log_capture)):
+                setup_lithops_logger(job.log_level)
+                jobrunner = JobRunner(job, jobrunner_conn, storages[storage_key], func)
+                jobrunner.run()
+                func = jobrunner.func
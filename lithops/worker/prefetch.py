@@ -0,0 +1,156 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import shutil
+import logging
+import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from lithops.storage import Storage
+from lithops.utils import oob_loads
+from lithops.constants import PREFETCH_DIR, PREFETCH_MAX_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectPrefetcher:
+    """
+    Downloads the partitions of the next calls of a chunk while the current
+    call runs, so that the network time of the calls overlaps with their
+    CPU time. The partitions are spilled to local files, which the JobRunner
+    opens instead of streaming the objects from storage.
+    """
+
+    def __init__(self, job, depth, max_size=PREFETCH_MAX_SIZE):
+        """
+        :param job: job of the worker, with the data of all its calls
+        :param depth: number of calls prefetched ahead of the running one
+        :param max_size: maximum size (in MiB) of the prefetched partitions
+        """
+        self.config = job.config
+        self.job_key = job.job_key
+        self.depth = depth
+        os.makedirs(PREFETCH_DIR, exist_ok=True)
+        self.max_size = min(max_size * 1024**2, shutil.disk_usage(PREFETCH_DIR).free // 2)
+
+        self.objects = {}
+        for call_id, data in zip(job.call_ids, job.data):
+            obj = oob_loads(data).get('obj')
+            if obj is not None and not hasattr(obj, 'path'):
+                self.objects[call_id] = obj
+        self.pending = [call_id for call_id in job.call_ids if call_id in self.objects]
+
+        self.storages = {}
+        self.downloads = {}
+        self.size = 0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=depth)
+
+    def _get_storage(self, backend):
+        with self.lock:
+            if backend not in self.storages:
+                self.storages[backend] = Storage(config=self.config, backend=backend)
+            return self.storages[backend]
+
+    def _get_size(self, obj):
+        if obj.data_byte_range is not None:
+            first_byte, last_byte = obj.data_byte_range
+            return last_byte - first_byte + 1
+        return obj.chunk_size
+
+    def _download(self, call_id, obj):
+        """
+        Downloads the partition of a call to a spill file
+        """
+        extra_get_args = {}
+        if obj.data_byte_range is not None:
+            extra_get_args['Range'] = 'bytes={}-{}'.format(*obj.data_byte_range)
+
+        if hasattr(obj, 'url'):
+            stream = requests.get(obj.url, headers=extra_get_args, stream=True).raw
+        else:
+            storage = self._get_storage(obj.backend)
+            stream = storage.get_object(obj.bucket, obj.key, stream=True, extra_get_args=extra_get_args)
+
+        prefetch_file = os.path.join(PREFETCH_DIR, f'{self.job_key}-{call_id}.data')
+        tmp_file = f'{prefetch_file}.tmp'
+        with open(tmp_file, 'wb') as f:
+            shutil.copyfileobj(stream, f)
+        os.replace(tmp_file, prefetch_file)
+        logger.debug(f'Prefetched the partition of call {call_id}')
+
+        return prefetch_file
+
+    def _schedule(self):
+        """
+        Starts the downloads of the next calls, up to the prefetch depth and
+        the maximum size
+        """
+        while self.pending and len(self.downloads) < self.depth:
+            call_id = self.pending[0]
+            size = self._get_size(self.objects[call_id])
+            if size > self.max_size:
+                # Too large to be prefetched; the JobRunner streams it
+                self.pending.pop(0)
+                continue
+            if self.size + size > self.max_size:
+                break
+            self.pending.pop(0)
+            self.size += size
+            self.downloads[call_id] = self.executor.submit(self._download, call_id, self.objects[call_id])
+
+    def prepare_task(self, pid, task):
+        """
+        Waits for the partition of a task, and starts prefetching the next
+        ones. Used as the initializer of the python_queue_consumer
+        """
+        if task.call_id in self.pending:
+            # Not prefetched yet, so it is not worth waiting for the previous ones
+            self.pending.remove(task.call_id)
+        self._schedule()
+
+        task.prefetch_file = None
+        if task.call_id in self.downloads:
+            try:
+                task.prefetch_file = self.downloads[task.call_id].result()
+            except Exception as e:
+                logger.warning(f'Failed to prefetch the partition of call {task.call_id}: {e}')
+                self._release(task.call_id)
+
+    def _release(self, call_id):
+        if call_id in self.downloads:
+            del self.downloads[call_id]
+            self.size -= self._get_size(self.objects[call_id])
+
+    def release_task(self, pid, task):
+        """
+        Deletes the spill file of a finished task, and starts prefetching the
+        next partitions. Used as the callback of the python_queue_consumer
+        """
+        if task.prefetch_file and os.path.exists(task.prefetch_file):
+            os.remove(task.prefetch_file)
+        self._release(task.call_id)
+        self._schedule()
+
+    def stop(self):
+        self.executor.shutdown(wait=True)
+        for future in self.downloads.values():
+            try:
+                os.remove(future.result())
+            except Exception:
+                pass
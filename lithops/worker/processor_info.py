@@ -241,8 +241,8 @@ def get_processor_info_json():
 
 def add_processor_info_to_task(task, call_status):
     """
-    Get processor information and add it to the task's call status and stats file.
-    This function handles all the logging, call status updates, and stats file writing.
+    Get processor information and add it to the task's call status.
+    This function handles all the logging and call status updates.
     
     Args:
         task: The task object
@@ -271,17 +271,6 @@ def add_processor_info_to_task(task, call_status):
             call_status.add('worker_cloud_instance_type', processor_info['cloud_instance_type'])
             logger.info(f"Cloud instance type: {processor_info['cloud_instance_type']}")
         
-        # Add to stats file for future reference
-        with open(task.stats_file, 'a') as f:
-            f.write(f"processor_name {processor_info['processor_name']}\n")
-            f.write(f"processor_brand {processor_info['processor_brand']}\n")
-            f.write(f"processor_cores {processor_info['cores']}\n")
-            f.write(f"processor_threads {processor_info['threads']}\n")
-            if processor_info['frequency']:
-                f.write(f"processor_frequency {processor_info['frequency']}\n")
-            if processor_info['cloud_instance_type']:
-                f.write(f"cloud_instance_type {processor_info['cloud_instance_type']}\n")
-        
         return processor_info
     except Exception as e:
         logger.warning(f"Error getting processor information: {e}")
@@ -0,0 +1,260 @@
+#
+# (C) Copyright Cloudlab URV 2024
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import glob
+import time
+import logging
+import threading
+from array import array
+from collections import namedtuple
+
+from lithops.constants import SAMPLING_INTERVAL, SAMPLING_BUFFER_SIZE
+
+try:
+    import psutil
+    psutil_found = True
+except ModuleNotFoundError:
+    psutil_found = False
+
+logger = logging.getLogger(__name__)
+
+PROC_STAT = '/proc/stat'
+RAPL_PATTERNS = ['/sys/class/powercap/intel-rapl:*/energy_uj',
+                 '/sys/class/powercap/intel-rapl:*:*/energy_uj']
+
+# busy and total are the per-core CPU times, process the CPU time of the
+# sampler process, and rapl the RAPL energy counters (in microjoules) of the
+# sampler files
+Sample = namedtuple('Sample', ['timestamp', 'busy', 'total', 'process', 'rapl'])
+
+
+def read_process_cpu_time():
+    """
+    Returns the user and system CPU time of this process
+    """
+    times = os.times()
+    return times.user + times.system
+
+
+def read_cpu_times():
+    """
+    Returns the busy and total CPU times of each core
+    """
+    busy, total = [], []
+    if os.path.exists(PROC_STAT):
+        with open(PROC_STAT, 'rb') as f:
+            for line in f:
+                if not line.startswith(b'cpu'):
+                    break
+                fields = line.split()
+                if fields[0] == b'cpu':
+                    continue
+                times = [float(value) for value in fields[1:]]
+                # idle and iowait
+                busy.append(sum(times) - sum(times[3:5]))
+                total.append(sum(times))
+    elif psutil_found:
+        for times in psutil.cpu_times(percpu=True):
+            busy.append(sum(times) - times.idle)
+            total.append(sum(times))
+    return busy, total
+
+
+def find_rapl_files():
+    """
+    Returns the readable RAPL energy files, split in package and cores files,
+    with the maximum value of their counters
+    """
+    pkg_files, cores_files, max_ranges = [], [], {}
+    for pattern in RAPL_PATTERNS:
+        for file in sorted(glob.glob(pattern)):
+            try:
+                with open(file, 'r') as f:
+                    int(f.read().strip())
+            except Exception:
+                continue
+            try:
+                with open(os.path.join(os.path.dirname(file), 'max_energy_range_uj'), 'r') as f:
+                    max_ranges[file] = int(f.read().strip())
+            except Exception:
+                pass
+            if ':0:' in file or file.endswith(':0/energy_uj'):
+                cores_files.append(file)
+            else:
+                pkg_files.append(file)
+    return pkg_files, cores_files, max_ranges
+
+
+class SystemSampler:
+    """
+    Samples the CPU times of the cores and the RAPL energy counters of the
+    container at a fixed interval, in a single daemon thread, into
+    preallocated ring buffers. The monitors of the calls take a sample when
+    they start and stop, and compute their windows from the samples between
+    them, without sleeping or starting threads of their own.
+    """
+
+    def __init__(self, interval=SAMPLING_INTERVAL, buffer_size=SAMPLING_BUFFER_SIZE):
+        """
+        :param interval: seconds between samples
+        :param buffer_size: number of samples kept in the ring buffers
+        """
+        self.interval = interval
+        self.buffer_size = buffer_size
+        self.pid = os.getpid()
+
+        self.num_cores = len(read_cpu_times()[0])
+        self.rapl_pkg_files, self.rapl_cores_files, self.rapl_max_ranges = find_rapl_files()
+        self.rapl_files = self.rapl_pkg_files + self.rapl_cores_files
+
+        self._timestamps = array('d', [0.0]) * buffer_size
+        self._process = array('d', [0.0]) * buffer_size
+        self._busy = array('d', [0.0]) * (buffer_size * self.num_cores)
+        self._total = array('d', [0.0]) * (buffer_size * self.num_cores)
+        self._rapl = array('d', [0.0]) * (buffer_size * len(self.rapl_files))
+        self._count = 0
+        self._lock = threading.Lock()
+
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _read_rapl(self):
+        values = []
+        for file in self.rapl_files:
+            try:
+                with open(file, 'r') as f:
+                    values.append(float(f.read().strip()))
+            except Exception:
+                values.append(0.0)
+        return values
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.debug(f'Error sampling the system: {e}')
+
+    def _get(self, index):
+        slot = index % self.buffer_size
+        cores = slice(slot * self.num_cores, (slot + 1) * self.num_cores)
+        rapl = slice(slot * len(self.rapl_files), (slot + 1) * len(self.rapl_files))
+        return Sample(self._timestamps[slot], tuple(self._busy[cores]), tuple(self._total[cores]),
+                      self._process[slot], tuple(self._rapl[rapl]))
+
+    def sample(self):
+        """
+        Takes a sample now and stores it in the ring buffers
+        """
+        timestamp = time.time()
+        busy, total = read_cpu_times()
+        process = read_process_cpu_time()
+        rapl = self._read_rapl()
+
+        with self._lock:
+            slot = self._count % self.buffer_size
+            self._timestamps[slot] = timestamp
+            self._process[slot] = process
+            cores = slice(slot * self.num_cores, (slot + 1) * self.num_cores)
+            if len(busy) == self.num_cores:
+                self._busy[cores] = array('d', busy)
+                self._total[cores] = array('d', total)
+            self._rapl[slot * len(rapl):(slot + 1) * len(rapl)] = array('d', rapl)
+            self._count += 1
+
+        return Sample(timestamp, tuple(busy), tuple(total), process, tuple(rapl))
+
+    def samples(self, start_tstamp, end_tstamp):
+        """
+        Returns the buffered samples taken between two timestamps, in order
+        """
+        with self._lock:
+            first = max(0, self._count - self.buffer_size)
+            samples = [self._get(index) for index in range(first, self._count)]
+        return [s for s in samples if start_tstamp <= s.timestamp <= end_tstamp]
+
+    def find(self, timestamp):
+        """
+        Returns the last buffered sample taken before a timestamp, or the
+        oldest one if all of them are newer
+        """
+        with self._lock:
+            first = max(0, self._count - self.buffer_size)
+            for index in range(self._count - 1, first - 1, -1):
+                if self._timestamps[index % self.buffer_size] <= timestamp:
+                    return self._get(index)
+            return self._get(first) if self._count > first else None
+
+    def stop(self):
+        self._stopped.set()
+
+
+def cpu_percent(start_sample, end_sample):
+    """
+    Returns the usage (%) of each core between two samples
+    """
+    usage = []
+    for busy0, total0, busy1, total1 in zip(start_sample.busy, start_sample.total,
+                                            end_sample.busy, end_sample.total):
+        elapsed = total1 - total0
+        usage.append(round(100 * (busy1 - busy0) / elapsed, 1) if elapsed > 0 else 0.0)
+    return usage
+
+
+def rapl_energy(sampler, start_sample, end_sample):
+    """
+    Returns the energy (in microjoules) consumed in each RAPL file between two
+    samples. The intermediate samples of the sampler are used to account for
+    the wraparounds of the counters
+    """
+    samples = [start_sample] + sampler.samples(start_sample.timestamp, end_sample.timestamp) + [end_sample]
+    energy = [0.0] * len(sampler.rapl_files)
+    for previous, current in zip(samples, samples[1:]):
+        if current.timestamp < previous.timestamp:
+            continue
+        for i, file in enumerate(sampler.rapl_files):
+            delta = current.rapl[i] - previous.rapl[i]
+            if delta < 0:
+                delta += sampler.rapl_max_ranges.get(file, 0)
+            energy[i] += max(0.0, delta)
+    return energy
+
+
+_system_sampler = None
+
+
+def get_system_sampler(interval=None, buffer_size=None):
+    """
+    Returns the sampler of this process, starting it if needed. Forked
+    processes start their own sampler, since threads do not survive a fork
+    """
+    global _system_sampler
+
+    interval = interval or (_system_sampler.interval if _system_sampler else SAMPLING_INTERVAL)
+    buffer_size = buffer_size or (_system_sampler.buffer_size if _system_sampler else SAMPLING_BUFFER_SIZE)
+
+    if _system_sampler is not None and (_system_sampler.pid != os.getpid()
+                                        or _system_sampler.interval != interval
+                                        or _system_sampler.buffer_size != buffer_size):
+        _system_sampler.stop()
+        _system_sampler = None
+
+    if _system_sampler is None:
+        _system_sampler = SystemSampler(interval, buffer_size)
+
+    return _system_sampler
@@ -4,13 +4,16 @@ import pika
 import json
 import time
 import logging
+import threading
 from tblib import pickling_support
 from contextlib import contextmanager
 
 import lithops.worker
 from lithops.utils import sizeof_fmt
+from lithops.util.codecs import compress
+from lithops.util.redis_streams import create_redis_client, get_stream_names
 from lithops.storage.utils import create_status_key, \
-    create_init_key
+    create_init_key, create_manifest_key
 
 
 pickling_support.install()
@@ -26,6 +29,61 @@ def create_call_status(job, internal_storage):
     return Status(job, internal_storage)
 
 
+class StatusManifest:
+    """
+    Collects the final status of the calls that a worker process runs, and
+    stores them in a single manifest object, indexed by call ID, when the
+    worker finishes its calls or 'status_manifest_interval' seconds after
+    the first pending status
+    """
+
+    def __init__(self):
+        self.job = None
+        self.internal_storage = None
+        self.statuses = {}
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def add(self, job, internal_storage, status):
+        """ Adds the final status of a call to the manifest"""
+        with self.lock:
+            if self.statuses and self.job.job_key != job.job_key:
+                self._flush()
+            self.job = job
+            self.internal_storage = internal_storage
+            self.statuses[status['call_id']] = dict(status)
+            if self.timer is None:
+                interval = job.config['lithops'].get('status_manifest_interval', 5)
+                self.timer = threading.Timer(interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        """ Stores the pending statuses in a manifest object"""
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        if not self.statuses:
+            return
+
+        call_ids = sorted(self.statuses)
+        statuses = [self.statuses[call_id] for call_id in call_ids]
+        act_id = statuses[0]['activation_id']
+        manifest_key = create_manifest_key(self.job.executor_id, self.job.job_id, call_ids[0], act_id)
+        manifest = compress(json.dumps({'call_ids': call_ids, 'statuses': statuses}), self.job.payload_codec)
+        logger.info(f"Storing execution stats of {len(call_ids)} calls - Size: {sizeof_fmt(len(manifest))}")
+        self.internal_storage.put_data(manifest_key, manifest)
+        self.statuses = {}
+
+
+status_manifest = StatusManifest()
+
+
 class CallStatus:
 
     def __init__(self, job, internal_storage):
@@ -45,6 +103,9 @@ class CallStatus:
             'chunksize': job.chunksize
         }
 
+        if getattr(job, 'remote_invoker_tstamps', None):
+            self.status['host_remote_invoker_tstamps'] = job.remote_invoker_tstamps
+
         if ast.literal_eval(os.environ.get('WARM_CONTAINER', 'False')):
             self.status['worker_cold_start'] = False
         else:
@@ -81,9 +142,12 @@ class StorageCallStatus(CallStatus):
             init_key = create_init_key(executor_id, job_id, call_id, act_id)
             self.internal_storage.put_data(init_key, '')
 
+        elif self.status['type'] == '__end__' and self.config['lithops'].get('status_manifest', False):
+            status_manifest.add(self.job, self.internal_storage, self.status)
+
         elif self.status['type'] == '__end__':
             status_key = create_status_key(executor_id, job_id, call_id)
-            dmpd_response_status = json.dumps(self.status)
+            dmpd_response_status = compress(json.dumps(self.status), self.job.payload_codec)
             drs = sizeof_fmt(len(dmpd_response_status))
             logger.info("Storing execution stats - Size: {}".format(drs))
             self.internal_storage.put_data(status_key, dmpd_response_status)
@@ -139,3 +203,36 @@ class RabbitmqCallStatus(StorageCallStatus):
 
         if self.status['type'] == '__end__':
             super()._send()
+
+
+class RedisCallStatus(StorageCallStatus):
+
+    def __init__(self, job, internal_storage):
+        super().__init__(job, internal_storage)
+
+        self.redis_client = create_redis_client(self.config['redis'])
+
+    def _send(self):
+        """
+        Send the status event to the Redis streams of the executor
+        """
+        dmpd_response_status = json.dumps(self.status)
+        drs = sizeof_fmt(len(dmpd_response_status))
+
+        status_sent = False
+        output_query_count = 0
+
+        while not status_sent and output_query_count < 5:
+            output_query_count = output_query_count + 1
+            try:
+                pipeline = self.redis_client.pipeline(transaction=False)
+                for stream in get_stream_names(self.job.executor_id):
+                    pipeline.xadd(stream, {'status': dmpd_response_status})
+                pipeline.execute()
+                logger.info("Execution status sent to Redis - Size: {}".format(drs))
+                status_sent = True
+            except Exception:
+                time.sleep(0.2)
+
+        if self.status['type'] == '__end__':
+            super()._send()
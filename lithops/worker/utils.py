@@ -16,6 +16,8 @@
 
 import os
 import sys
+import zlib
+import shutil
 import pkgutil
 import logging
 import pickle
@@ -23,11 +25,16 @@ import platform
 import subprocess
 import time
 import threading
+from collections import OrderedDict
 from contextlib import contextmanager
+from multiprocessing import util as mp_util
 
 from lithops.version import __version__ as lithops_ver
-from lithops.utils import sizeof_fmt, is_unix_system, b64str_to_bytes
-from lithops.constants import MODULES_DIR, SA_INSTALL_DIR, LITHOPS_TEMP_DIR
+from lithops.utils import sizeof_fmt, is_unix_system, b64str_to_bytes, oob_loads
+from lithops.util.codecs import decompress
+from lithops.worker.sampler import get_system_sampler, cpu_percent
+from lithops.constants import MODULES_DIR, SA_INSTALL_DIR, \
+    SHARED_ARGS_DIR, WORKER_FUNCTION_CACHE_SIZE
 
 try:
     import psutil
@@ -45,53 +52,124 @@ if is_unix_system():
     import ps_mem
 
 
-def get_function_and_modules(job, internal_storage):
+class FunctionCache:
     """
-    Gets the function and modules from storage
+    Process-level LRU cache of the functions loaded by a worker, keyed by
+    func_key and evicted by size, so that a warm container downloads and
+    deserializes each function only once
     """
-    logger.info("Getting function and modules")
-    backend = job.config['lithops']['backend']
-    func_path = '/'.join([LITHOPS_TEMP_DIR, job.func_key])
-    func_obj = None
-
-    if job.config[backend].get('runtime_include_function'):
-        logger.info("Runtime include function feature activated. Loading "
-                    "function/mods from local runtime")
-        func_path = '/'.join([SA_INSTALL_DIR, job.func_key])
-        with open(func_path, "rb") as f:
-            func_obj = f.read()
-    else:
-        logger.info(f"Loading {job.func_key} from storage")
-        func_obj = internal_storage.get_func(job.func_key)
 
-    loaded_func_all = pickle.loads(func_obj)
+    def __init__(self, max_size=WORKER_FUNCTION_CACHE_SIZE):
+        self.max_size = max_size * 1024**2
+        self.size = 0
+        self.functions = OrderedDict()
+        self.lock = threading.Lock()
 
-    if loaded_func_all.get('module_data'):
-        module_path = os.path.join(MODULES_DIR, job.job_key)
-        logger.info(f"Writing function dependencies to {module_path}")
-        os.makedirs(module_path, exist_ok=True)
-        sys.path.append(module_path)
+    def get(self, func_key):
+        """
+        :return: (function, modules path) tuple, or None if not cached
+        """
+        with self.lock:
+            if func_key not in self.functions:
+                return None
+            self.functions.move_to_end(func_key)
+            func, module_path = self.functions[func_key]
+            return func, module_path
+
+    def put(self, func_key, func, module_path):
+        with self.lock:
+            if func_key in self.functions or len(func) > self.max_size:
+                return
+            self.functions[func_key] = (func, module_path)
+            self.size += len(func)
+            while self.size > self.max_size:
+                _, (evicted_func, _) = self.functions.popitem(last=False)
+                self.size -= len(evicted_func)
+
+
+function_cache = FunctionCache()
+
+
+def get_modules_path(func_key):
+    """
+    Returns the content-addressed directory of the modules of a function,
+    shared by all the jobs that run the same function bundle
+    """
+    function_hash = os.path.basename(func_key).split('.')[0]
+    return os.path.join(MODULES_DIR, function_hash)
+
+
+def extract_modules(func_key, module_data):
+    """
+    Writes the modules of a function to its modules directory, unless
+    they were already written by a previous job
+    """
+    module_path = get_modules_path(func_key)
+    if os.path.isdir(module_path):
+        logger.info(f"Function dependencies found in {module_path}")
+        return module_path
 
-        for m_filename, m_data in loaded_func_all['module_data'].items():
-            m_path = os.path.dirname(m_filename)
+    logger.info(f"Writing function dependencies to {module_path}")
+    tmp_path = f'{module_path}.{os.getpid()}.tmp'
 
-            if len(m_path) > 0 and m_path[0] == "/":
-                m_path = m_path[1:]
-            to_make = os.path.join(module_path, m_path)
-            try:
-                os.makedirs(to_make)
-            except OSError as e:
-                if e.errno == 17:
-                    pass
-                else:
-                    raise e
-            full_filename = os.path.join(to_make, os.path.basename(m_filename))
-            # logger.debug('Writing {}'.format(full_filename))
+    for m_filename, m_data in module_data.items():
+        m_path = os.path.dirname(m_filename)
 
-            with open(full_filename, 'wb') as fid:
-                fid.write(b64str_to_bytes(m_data))
+        if len(m_path) > 0 and m_path[0] == "/":
+            m_path = m_path[1:]
+        to_make = os.path.join(tmp_path, m_path)
+        os.makedirs(to_make, exist_ok=True)
+        full_filename = os.path.join(to_make, os.path.basename(m_filename))
 
-    return loaded_func_all['func']
+        with open(full_filename, 'wb') as fid:
+            fid.write(b64str_to_bytes(m_data))
+
+    try:
+        os.rename(tmp_path, module_path)
+    except OSError:
+        # Another worker process already wrote the same modules
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return module_path
+
+
+def get_function_and_modules(job, internal_storage):
+    """
+    Gets the function and modules from storage, or from the function cache
+    of the worker process
+    """
+    logger.info("Getting function and modules")
+    max_size = job.config['lithops'].get('worker_function_cache_size', WORKER_FUNCTION_CACHE_SIZE)
+    function_cache.max_size = max_size * 1024**2
+
+    cached_func = function_cache.get(job.func_key)
+    if cached_func is not None:
+        logger.info(f"Loading {job.func_key} from the worker function cache")
+        func, module_path = cached_func
+    else:
+        backend = job.config['lithops']['backend']
+        if job.config[backend].get('runtime_include_function'):
+            logger.info("Runtime include function feature activated. Loading "
+                        "function/mods from local runtime")
+            func_path = '/'.join([SA_INSTALL_DIR, job.func_key])
+            with open(func_path, "rb") as f:
+                func_obj = f.read()
+        else:
+            logger.info(f"Loading {job.func_key} from storage")
+            func_obj = internal_storage.get_func(job.func_key)
+
+        loaded_func_all = pickle.loads(decompress(func_obj))
+        func = loaded_func_all['func']
+        module_path = None
+        if loaded_func_all.get('module_data'):
+            module_path = extract_modules(job.func_key, loaded_func_all['module_data'])
+        function_cache.put(job.func_key, func, module_path)
+
+    job.module_path = module_path
+    if module_path and module_path not in sys.path:
+        sys.path.append(module_path)
+
+    return func
 
 
 def get_function_data(job, internal_storage):
@@ -112,18 +190,44 @@ def get_function_data(job, internal_storage):
         loaded_data = []
         offset = 0
         if job.data_byte_ranges is not None:
+            # bytearrays keep the out-of-band buffers writable once unpickled
+            data_view = memoryview(data_obj)
             for dbr in job.data_byte_ranges:
                 length = dbr[1] - dbr[0] + 1
-                loaded_data.append(data_obj[offset:offset + length])
+                loaded_data.append(bytearray(decompress(data_view[offset:offset + length])))
                 offset += length
         else:
-            loaded_data.append(data_obj)
+            loaded_data.append(decompress(data_obj))
     else:
-        loaded_data = [eval(byte_str) for byte_str in job.data_byte_strs]
+        loaded_data = [decompress(eval(byte_str)) for byte_str in job.data_byte_strs]
 
     return loaded_data
 
 
+def get_shared_arg(shared_arg, internal_storage):
+    """
+    Gets a shared argument from storage. The serialized argument is cached
+    in the local disk, so it is downloaded only once per container
+    """
+    cache_path = os.path.join(SHARED_ARGS_DIR, os.path.basename(shared_arg.key))
+
+    if os.path.isfile(cache_path):
+        logger.info(f"Loading shared argument {shared_arg.key} from local cache")
+        with open(cache_path, 'rb') as f:
+            return oob_loads(bytearray(decompress(f.read())))
+
+    logger.info(f"Loading shared argument {shared_arg.key} from storage")
+    obj_str = internal_storage.get_data(shared_arg.key)
+
+    os.makedirs(SHARED_ARGS_DIR, exist_ok=True)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(obj_str)
+    os.replace(tmp_path, cache_path)
+
+    return oob_loads(bytearray(decompress(obj_str)))
+
+
 def get_memory_usage(formatted=True):
     """
     Gets the current memory usage of the runtime.
@@ -262,7 +366,8 @@ class LogStream:
         self._stdout.write(log)
         try:
             self._stream.write(log)
-            self.flush()
+            # The log capture flushes itself periodically
+            self._stdout.flush()
         except ValueError:
             pass
 
@@ -277,12 +382,134 @@ class LogStream:
         return self._stdout.fileno()
 
 
+class LogCapture:
+    """
+    Sink of the execution log of a call, compressed incrementally while it is
+    written. Each writer process writes its own gzip segment to the log
+    directory, so the handler and the JobRunner process never interleave
+    their compressed streams. Segments are numbered with a sequence number
+    that a forked writer inherits, and read_logs() reads them back in the
+    order of their sequence numbers.
+    """
+    flush_interval = 1  # seconds
+
+    def __init__(self, log_dir, sequence=0):
+        self.log_dir = log_dir
+        self.sequence = sequence
+        self._owner_pid = os.getpid()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._file = None
+        if self._pid != self._owner_pid:
+            # A forked writer exits without returning, so its segment is
+            # closed by the finalizers of the process
+            mp_util.Finalize(self, self.close, exitpriority=10)
+
+    def _open_segment(self):
+        segment = f'log.{self.sequence:06d}.{time.time_ns():020d}.{self._pid}.gz'
+        self._file = open(os.path.join(self.log_dir, segment), 'wb')
+        self._compressor = zlib.compressobj(wbits=31)
+        self._flush_tstamp = time.time()
+
+    def _sync(self):
+        self._file.write(self._compressor.flush(zlib.Z_SYNC_FLUSH))
+        self._file.flush()
+        self._flush_tstamp = time.time()
+
+    def write(self, log):
+        if self._pid != os.getpid():
+            self._reset()
+        with self._lock:
+            if self._file is None:
+                self._open_segment()
+            self._file.write(self._compressor.compress(log.encode('utf-8', 'replace')))
+            if time.time() - self._flush_tstamp > self.flush_interval:
+                self._sync()
+
+    def flush(self):
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+
+    def close(self):
+        """
+        Closes the current segment. Later writes open a new one
+        """
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            if self._file is not None:
+                self._file.write(self._compressor.flush())
+                self._file.close()
+                self._file = None
+
+    def next_segment(self):
+        """
+        Closes the current segment. Later writes open a new one, placed
+        after the segments of the current sequence number
+        """
+        self.close()
+        self.sequence += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_logs(log_dir, head_size, tail_size, out=None):
+    """
+    Reads the log segments written by LogCapture in order, keeping only the
+    first head_size and the last tail_size bytes of the log
+    :param out: binary file where the full log is written as a single gzip stream
+    :return: head, tail and total size of the log
+    """
+    head = bytearray()
+    tail = bytearray()
+    total_size = 0
+    compressor = zlib.compressobj(wbits=31) if out is not None else None
+
+    segments = sorted(f for f in os.listdir(log_dir) if f.startswith('log.') and f.endswith('.gz'))
+    for segment in segments:
+        decompressor = zlib.decompressobj(wbits=31)
+        with open(os.path.join(log_dir, segment), 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                try:
+                    data = decompressor.decompress(chunk)
+                except zlib.error:
+                    # Segment of a writer killed in the middle of a write
+                    break
+                total_size += len(data)
+                if compressor is not None:
+                    out.write(compressor.compress(data))
+                if len(head) < head_size:
+                    missing = head_size - len(head)
+                    head += data[:missing]
+                    data = data[missing:]
+                tail += data
+                if len(tail) > 2 * tail_size:
+                    del tail[:len(tail) - tail_size]
+
+    if compressor is not None:
+        out.write(compressor.flush())
+    del tail[:max(0, len(tail) - tail_size)]
+
+    return bytes(head), bytes(tail), total_size
+
+
 class SystemMonitor:
 
     def __init__(self, process_id=None):
         """
         Initialize the SystemMonitor.
         If process_id is None, monitor the current process.
+        The CPU activity is computed from the samples of the system sampler
         """
         self.process_id = process_id
         self.cpu_usage = []
@@ -290,52 +517,27 @@ class SystemMonitor:
         self.cpu_times = None
         self.current_net_io = None
         self.mem_info = None
-        
-        # New attributes for continuous CPU monitoring
-        self.monitoring = False
-        self.monitor_thread = None
-        self.cpu_activity = []  # List to store CPU activity data
+
+        self.sampler = get_system_sampler()
         self.cpu_threshold = 5.0  # CPU usage threshold (%) to consider a core active
+        self.start_sample = None
         self.start_timestamp = None
         self.end_timestamps = None  # Will be a list of timestamps when each core stops being active
 
-    def _monitor_cpu_activity(self):
+    def _compute_cpu_activity(self, end_sample):
         """
-        Background thread function to continuously monitor CPU activity.
-        Records the last time each CPU core was active above the threshold.
+        Records the last time each CPU core was active above the threshold,
+        from the samples taken while the monitor ran
         """
-        if not psutil_found:
-            return
-            
-        logger.debug("Starting continuous CPU activity monitoring")
-        
-        # Initialize end timestamps with None values
-        num_cores = len(psutil.cpu_percent(interval=None, percpu=True))
-        self.end_timestamps = [None] * num_cores
-        
-        while self.monitoring:
-            try:
-                # Get current CPU usage for each core
-                current_usage = psutil.cpu_percent(interval=0.5, percpu=True)
-                current_time = time.time()
-                
-                # Update end timestamps for cores that are active
-                for i, usage in enumerate(current_usage):
-                    if usage >= self.cpu_threshold:
-                        # Core is active, update its end timestamp
-                        self.end_timestamps[i] = current_time
-                
-                # Store the CPU activity data
-                self.cpu_activity.append({
-                    'timestamp': current_time,
-                    'usage': current_usage
-                })
-                
-            except Exception as e:
-                logger.error(f"Error in CPU activity monitoring: {e}")
-                break
-                
-        logger.debug("Stopped continuous CPU activity monitoring")
+        samples = self.sampler.samples(self.start_timestamp, end_sample.timestamp)
+        samples = [self.start_sample] + samples + [end_sample]
+        self.end_timestamps = [self.start_timestamp] * len(end_sample.busy)
+        for previous, current in zip(samples, samples[1:]):
+            if current.timestamp <= previous.timestamp:
+                continue
+            for i, usage in enumerate(cpu_percent(previous, current)):
+                if usage >= self.cpu_threshold:
+                    self.end_timestamps[i] = current.timestamp
 
     def start(self):
         """
@@ -345,20 +547,12 @@ class SystemMonitor:
             return
 
         self.process = psutil.Process(self.process_id)
-        self.start_timestamp = time.time()
-
-        # Record the initial CPU usage (to be ignored).
-        psutil.cpu_percent(interval=None, percpu=True)
+        self.start_sample = self.sampler.sample()
+        self.start_timestamp = self.start_sample.timestamp
 
         # Reset the network IO counters cache and baseline.
         psutil.net_io_counters.cache_clear()
         self.start_net_io = psutil.net_io_counters()
-        
-        # Start continuous CPU monitoring in a background thread
-        self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_cpu_activity)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
 
     def stop(self):
         """
@@ -366,24 +560,14 @@ class SystemMonitor:
         """
         if not psutil_found:
             return
-            
-        # Stop the continuous monitoring thread
-        self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=2.0)  # Wait for the thread to finish
-
-        # Record the CPU usage since the last call (start).
-        self.cpu_usage = psutil.cpu_percent(interval=None, percpu=True)
+
+        # Record the CPU usage since the start.
+        end_sample = self.sampler.sample()
+        self.cpu_usage = cpu_percent(self.start_sample, end_sample)
+        self._compute_cpu_activity(end_sample)
         self.cpu_times = psutil.cpu_times()
         self.current_net_io = psutil.net_io_counters()
         self.mem_info = self.process.memory_full_info()
-        
-        # Ensure all end timestamps are set
-        # If a core was never active, set its end timestamp to the start timestamp
-        if self.end_timestamps:
-            for i in range(len(self.end_timestamps)):
-                if self.end_timestamps[i] is None:
-                    self.end_timestamps[i] = self.start_timestamp
 
     def get_cpu_info(self):
         """